@@ -1,19 +1,36 @@
 import os
+import click
 from flask import Flask
 from flask_bcrypt import Bcrypt
-from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-from flask_migrate import Migrate
-from dotenv import load_dotenv
 from app.config import DevelopmentConfig, ProductionConfig, TestingConfig
+from app.database import db, configure_database
+from app.services.project_cache import ProjectCache
+from app.services.user_cache import UserCache
+from app.services.audit import AuditLog
+from app.services.change_feed import ChangeFeed
+from app.services.hashing import PasswordHasher
+from app.services.rate_limit import RateLimiter
+from app.services.image_service import ImageDerivatives
+from app.services.metrics import Metrics
+from app.services.profiler import RequestProfiler
+from app.services.prerender import Prerenderer
+from app.services.upload_service import UploadRequest
 
-load_dotenv()
 # Instancias que se inicializan más adelante
-db = SQLAlchemy()
 bcrypt = Bcrypt()
 jwt = JWTManager()
-migrate = Migrate()
+project_cache = ProjectCache()
+user_cache = UserCache()
+audit = AuditLog()
+feed = ChangeFeed()
+hasher = PasswordHasher(bcrypt)
+limiter = RateLimiter()
+image_derivatives = ImageDerivatives()
+metrics = Metrics()
+profiler = RequestProfiler()
+prerender = Prerenderer()
 
 def create_app():
     
@@ -22,6 +39,8 @@ def create_app():
     """
     static_file_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'front/build')
     app = Flask(__name__, static_folder=static_file_dir)
+    # Las subidas de imágenes se escriben y se limitan mientras se reciben (ver upload_service.streamed_uploads)
+    app.request_class = UploadRequest
 
     # Configuración básica
     enviroment = os.getenv("FLASK_ENV", "production")
@@ -34,11 +53,51 @@ def create_app():
         
 
     # Extensiones
-    CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
+    # Las métricas van primero para que su before_request mida todo lo demás
+    metrics.init_app(app)
+    profiler.init_app(app)
+    CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True, expose_headers=["X-Next-Cursor", "Link"])
+    configure_database(app)
     db.init_app(app)
     bcrypt.init_app(app)
+    hasher.init_app(app, metrics=metrics)
+    limiter.init_app(app)
+    audit.init_app(app, client_ip=limiter.client_ip)
     jwt.init_app(app)
-    migrate.init_app(app, db, compare_type=True)
+    if not app.config['FAST_BOOT']:
+        # Flask-Migrate importa Alembic (y con él Mako y Pygments): solo hace falta para los comandos 'flask db'
+        from flask_migrate import Migrate
+        from app.services.search import include_name
+        Migrate(app, db, compare_type=True, include_name=include_name)
+    project_cache.init_app(app)
+    user_cache.init_app(app)
+    feed.init_app(app, cache=project_cache)
+
+    def refresh_project_documents(filename):
+        # Las variantes de imagen van dentro de los documentos de proyecto: solo se regeneran los de los
+        # proyectos que usan esta imagen (normalmente ninguno: la imagen se sube antes de crear el proyecto)
+        from app.services.project_documents import refresh_documents, ids_using_upload
+        with app.app_context():
+            ids = ids_using_upload(filename)
+            if not ids:
+                return
+            refresh_documents(ids)
+            feed.updated(ids)
+            db.session.commit()
+            # bump() lee la nueva versión (el id del evento) de la base: dentro del contexto de la app
+            project_cache.bump()
+
+    image_derivatives.init_app(app, on_complete=refresh_project_documents)
+    # Snapshots HTML de las rutas públicas, regenerados tras cada cambio en los proyectos
+    prerender.init_app(app, cache=project_cache)
+
+    # Revocación de tokens (logout)
+    from app.blacklist import BLACKLIST
+    BLACKLIST.init_app(app)
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return BLACKLIST.is_revoked(jwt_payload['jti'])
 
     # Registramos blueprints
     from app.routes.admin_bp import admin_bp
@@ -50,11 +109,83 @@ def create_app():
     app.register_blueprint(user_bp, url_prefix='/user')
 
     # Ruta para servir archivos estáticos subidos
-    from flask import send_from_directory
-    
+    from flask import abort
+    from app.services.static_files import StaticFiles
+    uploads = StaticFiles(app.config['UPLOAD_FOLDER'], stat_misses=True)
+    app.extensions['uploads'] = uploads
+
     @app.route('/static/uploads/<filename>')
     def uploaded_file(filename):
-        uploads_dir = os.path.join(os.path.dirname(__file__), 'static', 'uploads')
-        return send_from_directory(uploads_dir, filename)
+        info = uploads.get(filename)
+        response = info and uploads.send(info)
+        if response is None:
+            abort(404)
+        return response
+
+    @app.cli.command('generate-image-variants')
+    def generate_image_variants():
+        """Genera miniaturas y WebP de las imágenes subidas antes de existir el pipeline."""
+        from app.services.image_service import generate_derivatives, SKIPPED_EXTENSIONS
+        folder = app.config['UPLOAD_FOLDER']
+        for filename in sorted(os.listdir(folder)):
+            ext = os.path.splitext(filename)[1].lower()
+            if filename.startswith('.') or ext == '.webp' or ext in SKIPPED_EXTENSIONS:
+                continue
+            written = generate_derivatives(os.path.join(folder, filename), image_derivatives.widths, image_derivatives.quality)
+            print(f"{filename}: {len(written)} variantes")
+
+    @app.cli.command('project-documents')
+    def project_documents():
+        """Genera los documentos JSON de los proyectos que no lo tienen o que se generaron con otra BASE_URL."""
+        from app.services.project_documents import refresh_documents, stale_ids
+        ids = stale_ids()
+        written = refresh_documents(ids)
+        feed.updated(ids)
+        db.session.commit()
+        if written:
+            project_cache.bump()
+        print(f"{written} documentos de proyecto regenerados")
+
+    @app.cli.command('prerender')
+    def prerender_snapshots():
+        """Genera los snapshots HTML de la home y de los proyectos (requiere el build del front)."""
+        if not prerender.enabled:
+            print("Prerender desactivado o sin build del front en", app.static_folder)
+            return
+        version = prerender.render()
+        print(f"Snapshots generados en {prerender.directory} (versión {version})")
+
+    if not app.config['FAST_BOOT']:
+        @app.cli.command('boot')
+        @click.pass_context
+        def boot(ctx):
+            """Arranque del contenedor en un solo proceso: migraciones (solo si faltan), documentos de proyecto y snapshots."""
+            from flask_migrate import upgrade
+            from app.database import schema_is_current
+            # Comprobar la revisión es mucho más barato que 'flask db upgrade' sin nada que aplicar
+            if schema_is_current(app.extensions['migrate'].migrate.get_config()):
+                print("Esquema al día, sin migraciones pendientes")
+            else:
+                upgrade()
+            ctx.invoke(project_documents)
+            ctx.invoke(prerender_snapshots)
+
+    @app.cli.command('sync-replica')
+    def sync_replica():
+        """Copia la base SQLite principal sobre la réplica (entorno local con dos archivos SQLite)."""
+        import sqlite3
+        from sqlalchemy.engine import make_url
+        primary = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        replica_url = app.config.get('DATABASE_REPLICA_URL')
+        if not replica_url or primary.get_backend_name() != 'sqlite' or make_url(replica_url).get_backend_name() != 'sqlite':
+            print("sync-replica solo funciona con DATABASE_URL y DATABASE_REPLICA_URL apuntando a archivos SQLite")
+            return
+        source = sqlite3.connect(primary.database)
+        target = sqlite3.connect(make_url(replica_url).database)
+        with target:
+            source.backup(target)
+        source.close()
+        target.close()
+        print(f"Réplica actualizada: {make_url(replica_url).database}")
 
     return app
@@ -0,0 +1,232 @@
+"""
+ASGI entrypoint with an asyncio-native read path for the project endpoints.
+
+    uvicorn app.asgi:app --host 0.0.0.0 --port 5100 --workers 2   (from backend/)
+
+GET /admin/projects and GET /admin/projects/<id> are answered here on SQLAlchemy's
+async engine (asyncpg / aiosqlite, see requirements-async.txt). They use the same
+models, stored project documents, listing query, response cache and conditional-request handling
+as the Flask views. Every other request goes to the Flask app through a2wsgi's
+thread-pool WSGI adapter, so this server can replace gunicorn to compare both stacks.
+"""
+
+import asyncio
+import hashlib
+import io
+import re
+import sys
+
+from a2wsgi import WSGIMiddleware
+from flask import current_app, jsonify, request, url_for
+from sqlalchemy import select
+
+from app import feed, project_cache
+from app.database import create_async_engine_from_config
+from app.exceptions import BadRequestError
+from app.models import Project
+from app.run import app as flask_app
+from app.services.change_feed import last_change_statement, latest_id_statement, to_timestamp
+from app.services.compression import negotiate, set_encoding
+from app.services.conditional import add_validators, not_modified
+from app.services.project_documents import bodies, join_bodies, missing_ids, with_documents
+from app.services.project_query import LISTING_PARAMS, listing_statement, parse_listing_args, serialize_page, split_page
+
+LIST_PATH = re.compile(r'^/admin/projects/?$')
+DETAIL_PATH = re.compile(r'^/admin/projects/(\d+)$')
+
+
+def build_environ(scope):
+    """WSGI environ for an ASGI http scope without a body, so the Flask request helpers can be reused."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope['headers']:
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class AsyncProjectReads:
+    """
+    ASGI app: serves the project reads on the async engine and delegates everything else to Flask.
+
+    Each request pushes a Flask request context built from the ASGI scope and runs the
+    app's before/after request hooks, so metrics, profiling and CORS headers behave as
+    in the Flask views. Those hooks and the response cache are synchronous, so they run
+    in worker threads (asyncio.to_thread), never on the event loop; the database is only
+    read through the async session. The engine is created inside the event loop on first
+    use and disposed on lifespan shutdown.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        self.fallback = WSGIMiddleware(wsgi_app)
+        self.engine = None
+        self.sessionmaker = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            detail = DETAIL_PATH.match(scope['path'])
+            if detail or LIST_PATH.match(scope['path']):
+                return await self.handle(scope, send, int(detail.group(1)) if detail else None)
+        return await self.fallback(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # La versión de la caché de proyectos sale de la base: se carga aquí y no en el bucle de eventos
+                await asyncio.to_thread(feed.poll)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.engine is not None:
+                    await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def get_sessionmaker(self):
+        if self.sessionmaker is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+            self.engine = create_async_engine_from_config(self.wsgi_app.config)
+            self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        return self.sessionmaker
+
+    async def handle(self, scope, send, project_id):
+        with self.wsgi_app.request_context(build_environ(scope)):
+            # Los hooks de Flask son síncronos (y pueden tocar redis o la base): van a un hilo, que hereda el
+            # contexto de la petición (asyncio.to_thread copia los contextvars)
+            response = await asyncio.to_thread(self.wsgi_app.preprocess_request)
+            if response is None:
+                async with self.get_sessionmaker()() as session:
+                    if project_id is None:
+                        response = await get_projects(session)
+                    else:
+                        response = await get_project(session, project_id)
+            response = await asyncio.to_thread(
+                lambda: self.wsgi_app.process_response(self.wsgi_app.make_response(response)))
+            await send({
+                'type': 'http.response.start',
+                'status': response.status_code,
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                            for name, value in response.headers.items()],
+            })
+            await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+async def cache_state(session):
+    """
+    Returns the project data version and last-modified timestamp of this request.
+
+    Both come from the store in one call off the event loop (with redis, blocking round trips);
+    a missing one is loaded with the async session instead of the sync loaders of ProjectCache.
+
+    Returns:
+        tuple -> (version, last modified timestamp | None)
+    """
+
+    version, last_modified = await asyncio.to_thread(project_cache.stored_state)
+    if version is None:
+        latest = await session.scalar(latest_id_statement())
+        version = await asyncio.to_thread(project_cache.seed_version, latest)
+    if last_modified is None:
+        timestamp = to_timestamp(await session.scalar(last_change_statement()))
+        if timestamp is not None:
+            last_modified = await asyncio.to_thread(project_cache.last_modified, lambda: timestamp)
+    return version, last_modified
+
+
+async def document_bodies(session, rows):
+    """Async twin of project_documents.load_bodies."""
+    ids = missing_ids(rows)
+    projects = (await session.scalars(select(Project).where(Project.id.in_(ids)))).all() if ids else ()
+    return bodies(rows, projects)
+
+
+async def get_projects(session):
+    """Async twin of admin_bp.get_projects, with the same parameters, headers and cache."""
+    try:
+        paginated = any(param in request.args for param in LISTING_PARAMS)
+        params = parse_listing_args(request.args) if paginated else None
+
+        version, last_modified = await cache_state(session)
+        etag = f'projects-{version}'
+        if paginated:
+            etag += '-' + hashlib.sha1(request.query_string).hexdigest()[:16]
+        encoding = None if paginated else negotiate()
+        if encoding:
+            etag += f'-{encoding}'
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        if paginated:
+            if params['fields'] is None:
+                rows = (await session.execute(with_documents(listing_statement(**params)))).all()
+                rows, next_cursor = split_page(rows, params['limit'])
+                body = join_bodies(await document_bodies(session, rows))
+                response = current_app.response_class(body, status=200, mimetype='application/json')
+            else:
+                projects = (await session.scalars(listing_statement(**params))).all()
+                projects_list, next_cursor = serialize_page(projects, params['limit'], params['fields'])
+                response = jsonify(projects_list)
+            if next_cursor:
+                next_args = request.args.to_dict(flat=False)
+                next_args['cursor'] = next_cursor
+                next_url = url_for('admin.get_projects', _external=True, **next_args)
+                response.headers['X-Next-Cursor'] = next_cursor
+                response.headers['Link'] = f'<{next_url}>; rel="next"'
+            return add_validators(response, etag, last_modified)
+
+        body = await asyncio.to_thread(project_cache.peek, 'list', encoding, version)
+        if body is None:
+            rows = (await session.execute(with_documents(listing_statement()))).all()
+            plain = join_bodies(await document_bodies(session, rows))
+            # get_or_build guarda el cuerpo (y su versión comprimida) como lo haría la vista síncrona
+            body = await asyncio.to_thread(project_cache.get_or_build, 'list', lambda: plain, encoding, version)
+        response = current_app.response_class(body, status=200, mimetype='application/json')
+        return add_validators(set_encoding(response, encoding), etag, last_modified)
+    except BadRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Error fetching projects: ' + str(e)}), 500
+
+
+async def get_project(session, project_id):
+    """Async twin of admin_bp.get_project."""
+    try:
+        version, last_modified = await cache_state(session)
+        etag = f'project-{project_id}-{version}'
+        cached = None if request.if_none_match.star_tag else not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        row = (await session.execute(with_documents(select(Project).where(Project.id == project_id)))).first()
+        if not row:
+            return jsonify({'ok': False, 'data': None, 'error': 'Project not found.'}), 404
+        body = '{"ok":true,"data":' + (await document_bodies(session, [row]))[0] + '}'
+        response = current_app.response_class(body, status=200, mimetype='application/json')
+        return add_validators(response, etag, last_modified), 200
+    except Exception as e:
+        return jsonify({'ok': False, 'data': None, 'error': 'Error fetching project: ' + str(e)}), 500
+
+
+app = AsyncProjectReads(flask_app)
@@ -1 +1,133 @@
-BLACKLIST = set()
\ No newline at end of file
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+
+from app import db
+from app.models import RevokedToken
+
+# Margen para no perder revocaciones confirmadas por otro worker justo durante una sincronización
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. Never gives false negatives, so a miss
+    proves that a jti was not revoked.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenBlocklist:
+    """
+    Revoked JWTs, stored in the revoked_token table so that every gunicorn worker and
+    every restart sees the same revocations.
+
+    Each worker keeps a Bloom filter of the revoked jtis in front of the table and
+    pulls new revocations from it at most every JWT_BLOCKLIST_SYNC_SECONDS, so the
+    usual "not revoked" answer is given without touching the database. Rows are
+    purged once the token they revoke has expired.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.capacity = app.config.get('JWT_BLOCKLIST_CAPACITY', 10000)
+        self.sync_interval = app.config.get('JWT_BLOCKLIST_SYNC_SECONDS', 2)
+        self.rebuild_interval = app.config.get('JWT_BLOCKLIST_REBUILD_SECONDS', 3600)
+        self.default_ttl = app.config.get('JWT_ACCESS_TOKEN_EXPIRES') or timedelta(days=1)
+        self._bloom = None
+        self._built_at = 0
+        self._next_sync = 0
+        self._synced_at = None
+        self._confirmed = set()
+        app.extensions['token_blocklist'] = self
+
+    def _sync(self):
+        if self._bloom is not None and time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._bloom is not None and now < self._next_sync:
+                return
+            started_at = datetime.utcnow()
+            if self._bloom is None or now - self._built_at >= self.rebuild_interval:
+                # Reconstrucción completa: descarta de paso los jtis ya purgados
+                live = RevokedToken.expires_at > started_at
+                count = db.session.scalar(select(func.count()).select_from(RevokedToken).where(live))
+                bloom = BloomFilter(max(self.capacity, count * 2))
+                jtis = db.session.scalars(select(RevokedToken.jti).where(live))
+                self._built_at = now
+                self._confirmed = set()
+            else:
+                bloom = self._bloom
+                jtis = db.session.scalars(
+                    select(RevokedToken.jti).where(RevokedToken.revoked_at >= self._synced_at - SYNC_OVERLAP))
+            for jti in jtis:
+                bloom.add(jti)
+            self._bloom = bloom
+            self._synced_at = started_at
+            self._next_sync = now + self.sync_interval
+
+    def is_revoked(self, jti):
+        """
+        Returns:
+            bool -> True if the token with this jti was revoked.
+        """
+
+        self._sync()
+        if jti not in self._bloom:
+            return False
+        if jti in self._confirmed:
+            return True
+
+        revoked = db.session.get(RevokedToken, jti) is not None
+        if revoked and len(self._confirmed) < self.capacity:
+            self._confirmed.add(jti)
+        return revoked
+
+    def revoke(self, jti, expires=None):
+        """
+        Revokes a token until it expires, and purges rows of tokens that already expired.
+
+        Receives:
+            jti (str): JWT id.
+            expires (int | None): The token 'exp' claim (unix timestamp).
+        """
+
+        if expires:
+            expires_at = datetime.fromtimestamp(expires, tz=timezone.utc).replace(tzinfo=None)
+        else:
+            expires_at = datetime.utcnow() + self.default_ttl
+        db.session.merge(RevokedToken(jti=jti, expires_at=expires_at, revoked_at=datetime.utcnow()))
+        db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        db.session.commit()
+
+        self._sync()
+        self._bloom.add(jti)
+
+
+BLACKLIST = TokenBlocklist()
@@ -1,25 +1,153 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 
+# Único punto donde se leen los .env: antes de que se evalúen las clases de configuración, también al
+# arrancar con gunicorn o python run.py (solo 'flask' los carga por su cuenta). .env.dev tiene prioridad
+# sobre .env, y ninguno sobrescribe las variables ya definidas en el entorno
 load_dotenv(dotenv_path=".env.dev")
+load_dotenv()
 
 
 class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Pool de conexiones por worker. Con gevent cada worker atiende muchas peticiones a la vez, pero Postgres
+    # limita las conexiones: workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) tiene que quedar bajo max_connections
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = True
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+    # Réplica de solo lectura opcional para get_projects, get_project y show_users
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+    # Cache de respuestas de proyectos: "memory" (por proceso) o "redis" (compartido entre workers)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL = os.getenv("REDIS_URL")
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_DEFAULT_TTL = 3600
+
+    # Caché de usuarios de las rutas de autenticación: segundos por usuario (y lista) y por username inexistente,
+    # y entradas por worker. Con "memory" cada worker tendría su propia versión y podría aceptar una contraseña ya
+    # cambiada en otro: los usuarios existentes solo se cachean con redis (o un único proceso, como en desarrollo)
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 60 if CACHE_BACKEND == "redis" else 0))
+    USER_CACHE_NEGATIVE_TTL = 10
+    USER_CACHE_MAX_ENTRIES = 10000
+
+    # Auditoría de acciones de admin: cola en memoria volcada en lotes por un hilo en segundo plano
+    AUDIT_ENABLED = True
+    AUDIT_BATCH_SIZE = 100
+    AUDIT_FLUSH_SECONDS = 1
+    AUDIT_MAX_QUEUE = 10000
+
+    # Feed SSE de cambios en proyectos: cada worker consulta la tabla project_event cada FEED_POLL_SECONDS
+    # (también para ponerse en la versión de la caché de proyectos de los demás workers) y conserva los
+    # últimos FEED_REPLAY_SIZE eventos para reanudar con Last-Event-ID. FEED_ENABLED solo apaga el endpoint
+    FEED_ENABLED = True
+    FEED_POLL_SECONDS = 1
+    FEED_REPLAY_SIZE = 1000
+    FEED_HEARTBEAT_SECONDS = 15
+    FEED_QUEUE_SIZE = 256
+
+    # Revocación de tokens: cada worker sincroniza su filtro Bloom con la tabla revoked_token
+    JWT_BLOCKLIST_CAPACITY = 10000
+    JWT_BLOCKLIST_SYNC_SECONDS = 2
+    JWT_BLOCKLIST_REBUILD_SECONDS = 3600
+
+    # bcrypt se ejecuta en un pool de hilos nativos acotado; si la cola se llena respondemos 503
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+    HASHING_POOL_SIZE = int(os.getenv("HASHING_POOL_SIZE", 2))
+    HASHING_MAX_QUEUE = 16
+    HASHING_TIMEOUT = 10
+    HASHING_RETRY_AFTER = 1
+
+    # Límites de intentos de login por blueprint: (intentos, ventana en segundos)
+    RATELIMIT_ENABLED = True
+    RATELIMIT_LOGIN = {
+        'admin': {'ip': (10, 60), 'username': (5, 60)},
+        'user': {'ip': (20, 60), 'username': (5, 60)},
+    }
+    # Número de proxies delante de la app para leer la IP real de X-Forwarded-For. En Railway hay uno: con 0
+    # todos los clientes llegarían con la IP del proxy y compartirían el mismo contador de intentos
+    ON_RAILWAY = bool(os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("RAILWAY_ENVIRONMENT_NAME"))
+    RATELIMIT_PROXY_COUNT = int(os.getenv("RATELIMIT_PROXY_COUNT", 1 if ON_RAILWAY else 0))
+
+    # Arranque rápido (workers de gunicorn, ver gunicorn.conf.py): no se registra Flask-Migrate, así los workers
+    # no importan Alembic; 'flask db' y 'flask boot' solo existen con FAST_BOOT desactivado
+    FAST_BOOT = os.getenv("FAST_BOOT", "0") == "1"
+
+    # URL pública del backend: prefijo de las URLs absolutas de las imágenes subidas
+    BASE_URL = os.getenv("BASE_URL", "https://web-production-5461c.up.railway.app")
+
+    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'uploads'))
+    # Subidas: tamaño máximo por archivo (se comprueba mientras se lee) y por petición completa
+    UPLOAD_MAX_FILE_SIZE = 10 * 1024 * 1024
+    MAX_CONTENT_LENGTH = 10 * UPLOAD_MAX_FILE_SIZE + 1024 * 1024
+
+    # Importación/exportación masiva de proyectos: filas por executemany y por lote del cursor de exportación
+    PROJECT_BULK_BATCH_SIZE = 500
+    PROJECT_EXPORT_BATCH_SIZE = 500
+
+    # Miniaturas y WebP generados en segundo plano tras cada subida
+    IMAGE_DERIVATIVES_ENABLED = True
+    IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+    IMAGE_WEBP_QUALITY = 80
+    IMAGE_POOL_SIZE = 1
+
+    # Snapshots HTML prerenderizados de la home y los proyectos, servidos por la ruta catch-all
+    PRERENDER_ENABLED = True
+    PRERENDER_DIR = os.getenv("PRERENDER_DIR", os.path.join(tempfile.gettempdir(), "portfolio-prerender"))
+
+    # Compresión gzip/brotli de los assets del front y de los JSON cacheados
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024
+
+    # Métricas Prometheus en /metrics; cada worker de gunicorn vuelca las suyas en METRICS_DIR
+    METRICS_ENABLED = True
+    METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "portfolio-metrics"))
+    METRICS_FLUSH_SECONDS = 1
+    # Fuera de debug /metrics responde 404 si no hay token
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    # Peticiones con más consultas SQL que esto se registran como posible N+1
+    METRICS_QUERY_WARNING = 20
+    METRICS_SERVER_TIMING = False
+
+    # Perfilado bajo demanda (cabecera X-Profile con un token de admin); se guardan los últimos N perfiles
+    PROFILER_ENABLED = True
+    PROFILER_DIR = os.getenv("PROFILER_DIR", os.path.join(tempfile.gettempdir(), "portfolio-profiles"))
+    PROFILER_MAX_FILES = 50
+    PROFILER_SAMPLE_INTERVAL = 0.005
     
     
 class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     DEBUG = True
+    METRICS_SERVER_TIMING = True
+    BASE_URL = os.getenv("BASE_URL", "http://localhost:5100")
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 60))
         
 class TestingConfig(Config):
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    # Los benchmarks usan un SQLite en archivo para compartirlo con gunicorn
+    SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:")
     WTF_CSRF_ENABLED = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = "testing-secret"
+    BASE_URL = os.getenv("BASE_URL", "http://localhost:5100")
+    CACHE_BACKEND = "memory"
+    USER_CACHE_TTL = 60
+    JWT_BLOCKLIST_SYNC_SECONDS = 0
+    # Un SQLite en memoria es una sola conexión: sin hilo de sondeo que la comparta con las peticiones
+    FEED_POLL_SECONDS = 0 if SQLALCHEMY_DATABASE_URI == "sqlite:///:memory:" else 1
+    BCRYPT_LOG_ROUNDS = 4
+    RATELIMIT_ENABLED = False
+    METRICS_DIR = None
+    PROFILER_DIR = os.path.join(tempfile.gettempdir(), "portfolio-profiles-testing")
+    PRERENDER_DIR = os.path.join(tempfile.gettempdir(), "portfolio-prerender-testing")
     
 class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
@@ -1,3 +1,152 @@
+from functools import wraps
+
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import make_url
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """
+    Session that sends the queries of read-only views to the read replica.
+
+    Views decorated with `read_only` run every statement on the 'replica' bind when
+    DATABASE_REPLICA_URL is configured; flushes and everything else use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('db_read_replica'):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_only(view):
+    """
+    Marks a view as read-only so its queries can be served by the replica.
+
+    Apply it below @jwt_required so token checks (revocations) still read the primary.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_replica = True
+        try:
+            return view(*args, **kwargs)
+        finally:
+            g.db_read_replica = False
+    return wrapper
+
+
+def engine_options(url, config):
+    """
+    Builds the create_engine() options for a database URL from the DB_* settings.
+
+    Receives:
+        url (str): Database URL.
+        config (Config): The app config.
+
+    Returns:
+        dict -> Pool sizing, recycle, pre-ping and, on Postgres, a statement timeout.
+    """
+
+    url = make_url(url)
+    backend = url.get_backend_name()
+    # SQLite en memoria usa un StaticPool (una sola conexión): no admite opciones de pool
+    if backend == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+    if backend == 'postgresql' and config['DB_STATEMENT_TIMEOUT_MS']:
+        options['connect_args'] = {'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"}
+    return options
+
+
+def configure_database(app):
+    """Fills SQLALCHEMY_ENGINE_OPTIONS and the replica bind; must run before db.init_app()."""
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI')
+    if uri:
+        # Las opciones definidas explícitamente en la config tienen prioridad
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            **engine_options(uri, app.config), **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+
+    replica_url = app.config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds[REPLICA_BIND] = {'url': replica_url, **engine_options(replica_url, app.config)}
+        app.config['SQLALCHEMY_BINDS'] = binds
+
+
+# Driver asyncio de cada backend para el camino de lectura ASGI (app/asgi.py)
+ASYNC_DRIVERS = {'postgresql': 'asyncpg', 'sqlite': 'aiosqlite'}
+
+
+def create_async_engine_from_config(config):
+    """
+    Creates the SQLAlchemy async engine of the ASGI read path.
+
+    Uses the read replica when DATABASE_REPLICA_URL is set, since that path only reads,
+    with the same pool settings as the sync engines.
+
+    Returns:
+        AsyncEngine -> Engine on asyncpg (Postgres) or aiosqlite (SQLite).
+    """
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(config.get('DATABASE_REPLICA_URL') or config['SQLALCHEMY_DATABASE_URI'])
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for '{backend}' databases.")
+    async_url = url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}')
+
+    options = engine_options(async_url, config)
+    connect_args = options.pop('connect_args', None)
+    if connect_args and backend == 'postgresql':
+        # asyncpg no entiende el parámetro 'options' de libpq: el timeout va en server_settings
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(config['DB_STATEMENT_TIMEOUT_MS'])}}
+    return create_async_engine(async_url, **options)
+
+
+def schema_is_current(migrate_config):
+    """
+    Checks whether the database is already at the head revision of the migration scripts,
+    so the boot path can skip 'flask db upgrade' (and Alembic's environment) when it is.
+
+    Receives:
+        migrate_config: Alembic Config of Flask-Migrate (app.extensions['migrate'].migrate.get_config()).
+
+    Returns:
+        bool -> True if the revisions in alembic_version are exactly the script heads.
+    """
+
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(migrate_config).get_heads())
+    with db.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return current == heads
+
+
+def dispose_engines():
+    """
+    Drops the pooled connections inherited from a parent process (gunicorn preload_app)
+    without closing them, so the parent and every worker open their own.
+    Must run inside an app context.
+    """
+
+    for engine in db.engines.values():
+        engine.dispose(close=False)
+
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy(session_options={'class_': RoutingSession})
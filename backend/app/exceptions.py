@@ -9,3 +9,16 @@ class UnauthorizedError(Exception):
 
 class ConflictError(Exception):
     pass
+
+class ServiceUnavailableError(Exception):
+    pass
+
+class PayloadTooLargeError(Exception):
+    pass
+
+class ValidationError(BadRequestError):
+    """Invalid payload; `errors` maps each field to its message."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(' '.join(errors.values()))
@@ -1,5 +1,7 @@
-from app import db
-from sqlalchemy import String, Boolean, ForeignKey, DateTime, Integer, Float
+import json
+from app import db, image_derivatives
+from flask import current_app
+from sqlalchemy import String, Boolean, ForeignKey, DateTime, Integer, Float, Text, delete, event, insert
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, timezone
 from typing import Optional
@@ -16,48 +18,267 @@ class User(db.Model):
             'username': self.username
         }
     
+# Columnas que necesita cada campo serializado, para poder proyectar a nivel SQL
+PROJECT_FIELD_COLUMNS = {
+    'id': ('id',),
+    'title': ('title',),
+    'description': ('description',),
+    'title_en': ('title_en',),
+    'description_en': ('description_en',),
+    'techs': ('project_techs',),
+    'repo_url': ('repo_url',),
+    'live_url': ('live_url',),
+    'image_url': ('image_url', 'project_images', 'main_image_index'),
+    'images': ('project_images',),
+    'image_variants': ('image_url', 'project_images', 'main_image_index'),
+    'main_image_index': ('main_image_index',),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+}
+
+
 class Project(db.Model):
+    __table_args__ = (
+        db.Index('ix_project_created_at_id', 'created_at', 'id'),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(String(2000), nullable=False)
     title_en: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     description_en: Mapped[Optional[str]] = mapped_column(String(2000), nullable=True)
-    techs: Mapped[list[str]] = mapped_column(String(300), nullable=False) 
     repo_url: Mapped[str] = mapped_column(String(300), nullable=False)
     live_url: Mapped[Optional[str]] = mapped_column(String(300), nullable=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(300), nullable=True)
-    images: Mapped[list[str]] = mapped_column(String(1000), nullable=True)
     main_image_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    def serialize(self):
-        
-        images_list = [img for img in self.images.split(",") if img] if self.images else []
+    project_techs: Mapped[list['ProjectTech']] = relationship(
+        order_by='ProjectTech.position', cascade='all, delete-orphan', lazy='selectin')
+    project_images: Mapped[list['ProjectImage']] = relationship(
+        order_by='ProjectImage.position', cascade='all, delete-orphan', lazy='selectin')
+
+    @property
+    def techs(self):
+        return [tech.name for tech in self.project_techs]
+
+    @property
+    def images(self):
+        return [image.url for image in self.project_images]
+
+    def replace_relations(self, techs=None, images=None, touch=True):
+        """
+        Replaces the techs and/or images of a flushed project.
+
+        Each child table is written with at most one DELETE and one executemany INSERT,
+        instead of one statement per row. Lists equal to the current ones are left untouched.
+
+        Receives:
+            techs (list | None): New tech names, or None to keep the current ones.
+            images (list | None): New image URLs, or None to keep the current ones.
+            touch (bool): Whether to set updated_at when a list changes. False for a project
+                inserted in the same transaction, which already has it.
+        """
+
+        changes = []
+        for model, column, relation, values, current in (
+            (ProjectTech, 'name', 'project_techs', techs, lambda: self.techs),
+            (ProjectImage, 'url', 'project_images', images, lambda: self.images),
+        ):
+            if values is None:
+                continue
+            values = [value for value in values if value]
+            current_values = current()
+            if values != current_values:
+                changes.append((model, column, relation, values, bool(current_values)))
+        if not changes:
+            return
+        if touch:
+            # Cambiar solo las relaciones no dispara el onupdate de updated_at; se asigna antes de las
+            # sentencias para que salga en el mismo UPDATE que los demás cambios de columnas
+            self.updated_at = datetime.utcnow()
+        for model, column, relation, values, had_rows in changes:
+            if had_rows:
+                db.session.execute(delete(model).where(model.project_id == self.id))
+            if values:
+                db.session.execute(insert(model), [
+                    {'project_id': self.id, column: value, 'position': i} for i, value in enumerate(values)
+                ])
+            db.session.expire(self, [relation])
+
+    def serialize(self, fields=None):
+        """
+        Returns the project as a dict.
+
+        Receives:
+            fields (iterable | None): Keys of PROJECT_FIELD_COLUMNS to include. All of them when None;
+                only the columns those fields need are read, so it is safe with load_only().
+        """
+
+        fields = PROJECT_FIELD_COLUMNS.keys() if fields is None else fields
+
+        base_url = current_app.config['BASE_URL']
 
         def make_full_url(url):
             if url and url.startswith('/static/uploads/'):
-                return f'http://localhost:5100{url}'
+                return f'{base_url}{url}'
             return url
 
-        full_images_list = [make_full_url(img) for img in images_list]
+        full_images_list = []
+        if 'images' in fields or 'image_url' in fields or 'image_variants' in fields:
+            full_images_list = [make_full_url(img) for img in self.images]
+
+        data = {}
+        for field in fields:
+            if field == 'image_url':
+                main_image = None
+                if full_images_list and self.main_image_index is not None and 0 <= self.main_image_index < len(full_images_list):
+                    main_image = full_images_list[self.main_image_index]
+                elif self.image_url:
+                    main_image = make_full_url(self.image_url)
+                data['image_url'] = main_image
+            elif field == 'images':
+                data['images'] = full_images_list
+            elif field == 'image_variants':
+                # Miniaturas y WebP generados en segundo plano, por URL de imagen
+                urls = list(full_images_list)
+                if self.image_url:
+                    urls.append(make_full_url(self.image_url))
+                variants = {url: image_derivatives.variants(url) for url in urls}
+                data['image_variants'] = {url: found for url, found in variants.items() if found}
+            elif field == 'techs':
+                data['techs'] = self.techs
+            elif field in ('created_at', 'updated_at'):
+                value = getattr(self, field)
+                data[field] = value.isoformat() if value else None
+            else:
+                data[field] = getattr(self, field)
+        return data
+
+
+class ProjectTech(db.Model):
+    __tablename__ = 'project_tech'
+    __table_args__ = (
+        db.Index('ix_project_tech_project_id_position', 'project_id', 'position'),
+        # Búsqueda tecnología -> proyectos sin recorrer la tabla completa
+        db.Index('ix_project_tech_name_project_id', 'name', 'project_id'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ProjectImage(db.Model):
+    __tablename__ = 'project_image'
+    __table_args__ = (
+        db.Index('ix_project_image_project_id_position', 'project_id', 'position'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey('project.id', ondelete='CASCADE'), nullable=False)
+    url: Mapped[str] = mapped_column(String(300), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
 
-        main_image = None
-        if full_images_list and self.main_image_index is not None and 0 <= self.main_image_index < len(full_images_list):
-            main_image = full_images_list[self.main_image_index]
-        elif self.image_url:
-            main_image = make_full_url(self.image_url)
+class ProjectDocument(db.Model):
+    """
+    The serialized project (Project.serialize() as JSON), built when the project is written.
 
+    The read endpoints join these bodies into their responses instead of serializing
+    every row. base_url records the BASE_URL the absolute image URLs were built with.
+    """
+
+    __tablename__ = 'project_document'
+
+    project_id: Mapped[int] = mapped_column(ForeignKey('project.id', ondelete='CASCADE'), primary_key=True)
+    base_url: Mapped[str] = mapped_column(String(300), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_token'
+
+    jti: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Las filas se purgan cuando el token habría expirado de todas formas
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class AuditEvent(db.Model):
+    """
+    One admin action: who (the JWT identity), what, on which object and from where.
+
+    Rows are only ever inserted, in batches, by AuditLog (services/audit.py); triggers
+    reject UPDATE and DELETE on the table.
+    """
+
+    __tablename__ = 'audit_event'
+    __table_args__ = (
+        # Historial de un admin, del más reciente al más antiguo, con paginación por (created_at, id)
+        db.Index('ix_audit_event_actor_created_at_id', 'actor', 'created_at', 'id'),
+        db.Index('ix_audit_event_created_at_id', 'created_at', 'id'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    actor: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    action: Mapped[str] = mapped_column(String(50), nullable=False)
+    target: Mapped[Optional[str]] = mapped_column(String(300), nullable=True)
+    details: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    ip: Mapped[Optional[str]] = mapped_column(String(45), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def serialize(self):
         return {
             'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'title_en': self.title_en,
-            'description_en': self.description_en,
-            'techs': [tech for tech in self.techs.split(",") if tech] if self.techs else [],
-            'repo_url': self.repo_url,
-            'live_url': self.live_url,
-            'image_url': main_image,
-            'images': full_images_list,
-            'main_image_index': self.main_image_index,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'actor': self.actor,
+            'action': self.action,
+            'target': self.target,
+            'details': json.loads(self.details) if self.details else None,
+            'ip': self.ip,
+            'created_at': self.created_at.isoformat(),
         }
+
+
+# Triggers que hacen la tabla de auditoría de solo inserción (la migración crea los mismos)
+AUDIT_APPEND_ONLY_DDL = {
+    'sqlite': (
+        "CREATE TRIGGER audit_event_no_update BEFORE UPDATE ON audit_event "
+        "BEGIN SELECT RAISE(ABORT, 'audit_event is append-only'); END",
+        "CREATE TRIGGER audit_event_no_delete BEFORE DELETE ON audit_event "
+        "BEGIN SELECT RAISE(ABORT, 'audit_event is append-only'); END",
+    ),
+    'postgresql': (
+        "CREATE OR REPLACE FUNCTION audit_event_append_only() RETURNS trigger AS $$ "
+        "BEGIN RAISE EXCEPTION 'audit_event is append-only'; END; $$ LANGUAGE plpgsql",
+        "CREATE TRIGGER audit_event_append_only BEFORE UPDATE OR DELETE ON audit_event "
+        "FOR EACH ROW EXECUTE FUNCTION audit_event_append_only()",
+    ),
+}
+
+
+@event.listens_for(AuditEvent.__table__, 'after_create')
+def _audit_event_append_only(table, connection, **kwargs):
+    for statement in AUDIT_APPEND_ONLY_DDL.get(connection.dialect.name, ()):
+        connection.exec_driver_sql(statement)
+
+
+class ProjectEvent(db.Model):
+    """
+    One change to the projects, as pushed to the SSE change feed (services/change_feed.py).
+
+    Rows are written in the same transaction as the change, so every worker sees them
+    once committed; the table only keeps the last FEED_REPLAY_SIZE events. body is the
+    project document for created and updated events.
+    """
+
+    __tablename__ = 'project_event'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Sin clave foránea: el evento de borrado sobrevive al proyecto
+    project_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,18 +1,36 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from app import db, bcrypt
+from flask import Blueprint, request, jsonify, current_app, url_for, send_from_directory, stream_with_context, g
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, get_jwt
+from app import db, hasher, limiter, project_cache, user_cache, audit, feed, image_derivatives, metrics, profiler
 from app.models import User ,Project
+from app.database import read_only
+from app.services.conditional import not_modified, add_validators
+from app.services.compression import negotiate, set_encoding
+from app.services.profiler import is_admin
+from app.services.project_query import LISTING_PARAMS, parse_listing_args, list_projects, list_project_documents
+from app.services import search
+from app.services.project_documents import write_documents, remove_document, with_documents, load_bodies, join_bodies
+from app.services.project_bulk import read_rows, import_projects, export_ndjson
+from app.services.audit import parse_audit_args, list_events
+from app.services.validation import PROJECT_SCHEMA, ADMIN_USER_SCHEMA
+from app.exceptions import BadRequestError, NotFoundError, ServiceUnavailableError, PayloadTooLargeError, ValidationError
+from app.services.upload_service import store_upload, streamed_uploads
 from datetime import timedelta
+from sqlalchemy import select
+import hashlib
 import os
-from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 
-UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'static', 'uploads')
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'JPG'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def projects_last_modified():
+    # Sin el valor en el store, la fecha sale del último project_event: max(updated_at) no cambia al borrar
+    return project_cache.last_modified(feed.last_change)
+
+
 admin_bp = Blueprint('admin', __name__)
 
 # RUTA TEST de http://127.0.0.1:5000/admin_bp que muestra "Hola mundo":
@@ -25,23 +43,24 @@ def show_hello_world():
 @admin_bp.route('/users', methods=['POST'])
 def create_user():
     try:
-        username = request.json.get('username')
-        password = request.json.get('password')
+        data = ADMIN_USER_SCHEMA.validate(request.get_json(silent=True))
+        username = data['username']
+        password = data['password']
 
-        if not username or not password:
-            return jsonify({'error': 'Username and password are required.'}), 400
-
-        existing_user = User.query.filter_by(username=username).first()
+        # La caché también recuerda los username libres, así un username repetido no consulta la base
+        existing_user = user_cache.by_username(username)
         if existing_user:
             return jsonify({'error': 'Username already exists.'}), 409
 
-        password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        password_hash = hasher.generate(password)
 
         new_user = User(username=username, password=password_hash)
 
 
         db.session.add(new_user)
         db.session.commit()
+        user_cache.updated(new_user)
+        audit.record('user.create', target=f'user:{new_user.id}', username=new_user.username)
 
         good_to_share_user = {
             'id': new_user.id,
@@ -50,35 +69,49 @@ def create_user():
 
         return jsonify({'message': 'User created successfully.','user_created':good_to_share_user}), 201
 
+    except ValidationError as e:
+        return jsonify({'error': str(e), 'errors': e.errors}), 400
+
+    except ServiceUnavailableError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(hasher.retry_after)}
+
     except Exception as e:
         return jsonify({'error': 'Error in user creation: ' + str(e)}), 500
 
 
 #RUTA LOG-IN ( CON TOKEN DE RESPUESTA )
 @admin_bp.route('/login', methods=['POST'])
+@limiter.limit_login('admin', 'username')
 def get_token():
     try:
 
-        username = request.json.get('username')
-        password = request.json.get('password')
-
-        if not username or not password:
-            return jsonify({'error': 'Username and password are required.'}), 400
+        data = ADMIN_USER_SCHEMA.validate(request.get_json(silent=True))
+        username = data['username']
+        password = data['password']
 
-        login_user = User.query.filter_by(username=username).one()
+        login_user = user_cache.by_username(username)
+        if login_user is None:
+            raise NotFoundError(f"No user named '{username}'.")
 
         password_from_db = login_user.password
-        true_o_false = bcrypt.check_password_hash(password_from_db, password)
+        true_o_false = hasher.check(password_from_db, password)
         
         if true_o_false:
             expires = timedelta(minutes=60)
 
             user_id = login_user.id
-            access_token = create_access_token(identity=str(user_id), expires_delta=expires)
+            # El rol distingue los tokens de admin de los de /user (p. ej. para el perfilador)
+            access_token = create_access_token(identity=str(user_id), expires_delta=expires, additional_claims={'role': 'admin'})
             return jsonify({ 'access_token':access_token}), 200
 
         else:
             return {"Error":"Contraseña  incorrecta"}
+
+    except ValidationError as e:
+        return jsonify({'error': str(e), 'errors': e.errors}), 400
+
+    except ServiceUnavailableError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(hasher.retry_after)}
     
     except Exception as e:
         return {"Error":"El username proporcionado no corresponde a ninguno registrado: " + str(e)}, 500
@@ -86,18 +119,12 @@ def get_token():
     
 @admin_bp.route('/users')
 @jwt_required()
+@read_only
 def show_users():
     current_user_id = get_jwt_identity()
     if current_user_id:
-        users = User.query.all()
-        user_list = []
-        for user in users:
-            user_dict = {
-                'id': user.id,
-                'username': user.username
-            }
-            user_list.append(user_dict)
-        return jsonify(user_list), 200
+        # Lista ya codificada, compartida con /user/users
+        return current_app.response_class(user_cache.list_body(), status=200, mimetype='application/json')
     else:
         return {"Error": "Token inválido o no proporcionado"}, 401
         
@@ -110,9 +137,15 @@ def create_project():
         if not current_user_id:
             return jsonify({'error': 'Token inválido o no proporcionado'}), 401
 
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
             return jsonify({'error': 'Request body must be JSON.'}), 400
+        try:
+            data = PROJECT_SCHEMA.validate(data)
+        except ValidationError as e:
+            return jsonify({'error': str(e), 'errors': e.errors}), 400
+
+        search.ensure_search_index()
         title = data.get('title')
         description = data.get('description')
         title_en = data.get('title_en')
@@ -124,74 +157,176 @@ def create_project():
         images = data.get('images')
         main_image_index = data.get('main_image_index', 0)
 
-        MAX_TECHS = 10
-        MAX_IMAGES = 10
-
-        if not isinstance(techs, list) or len(techs) > MAX_TECHS:
-            return jsonify({'error': f'Máximo {MAX_TECHS} tecnologías permitidas.'}), 400
-
-        if images and (not isinstance(images, list) or len(images) > MAX_IMAGES):
-            return jsonify({'error': f'Máximo {MAX_IMAGES} imágenes permitidas.'}), 400
-
-        if len(title) > 100:
-            return jsonify({'error': 'El título no puede superar 100 caracteres.'}), 400
-       
-        if len(description) > 2000:
-            return jsonify({'error': 'La descripción no puede superar 2000 caracteres.'}), 400
-        
-        if title_en and len(title_en) > 100:
-            return jsonify({'error': 'El título en inglés no puede superar 100 caracteres.'}), 400
-
-        if description_en and len(description_en) > 2000:
-            return jsonify({'error': 'La descripción en inglés no puede superar 2000 caracteres.'}), 400
-
-
-
-
-        if not title or not description or not techs:
-            return jsonify({'error': 'Title, description, and techs are required.'}), 400
-
         new_project = Project(
             title=title,
             description=description,
             title_en=title_en,
             description_en=description_en,
-            techs=",".join(techs) if isinstance(techs, list) else techs,
             repo_url=repo_url or "",  
             live_url=live_url,
             image_url=image_url,
-            images=",".join(images) if isinstance(images, list) else images,
-            main_image_index=main_image_index
+            main_image_index=main_image_index,
+            # Relaciones vacías ya cargadas: replace_relations no tiene que leerlas ni borrarlas
+            project_techs=[],
+            project_images=[]
         )
 
         db.session.add(new_project)
+        db.session.flush()
+        new_project.replace_relations(techs=techs, images=images or [], touch=False)
+        search.index_project(new_project.id)
+        # El documento JSON que sirven las lecturas se genera aquí, una vez por escritura
+        write_documents([new_project])
+        feed.created([new_project.id])
+        # Antes del commit, que expira el proyecto y obligaría a leerlo de nuevo
+        serialized = new_project.serialize()
         db.session.commit()
+        project_cache.bump()
+        audit.record('project.create', target=f'project:{serialized["id"]}', title=serialized['title'])
 
-        return jsonify({'message': 'Project created successfully.', 'project': new_project.serialize()}), 201
+        return jsonify({'message': 'Project created successfully.', 'project': serialized}), 201
 
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Error in project creation: ' + str(e)}), 500
 
+# RUTA IMPORTAR PROYECTOS EN BLOQUE (NDJSON o array JSON)
+@admin_bp.route('/projects/bulk', methods=['POST'])
+@jwt_required()
+def bulk_import_projects():
+    try:
+        current_user_id = get_jwt_identity()
+        if not current_user_id:
+            return jsonify({'error': 'Token inválido o no proporcionado'}), 401
+
+        rows = read_rows(request)
+        search.ensure_search_index()
+        # Todas las filas válidas se escriben en una sola transacción; las inválidas se devuelven con su número de fila
+        summary = import_projects(rows, current_app.config['PROJECT_BULK_BATCH_SIZE'])
+        if summary['created'] or summary['updated']:
+            # Una importación puede tocar miles de proyectos: los clientes recargan la lista en vez de recibir un delta por fila
+            feed.reset()
+        db.session.commit()
+        if summary['created'] or summary['updated']:
+            project_cache.bump()
+            audit.record('project.bulk_import', created=summary['created'], updated=summary['updated'],
+                         errors=len(summary['errors']))
+
+        return jsonify(summary), 207 if summary['errors'] else 200
+
+    except BadRequestError as e:
+        return jsonify({'error': str(e)}), 400
+
+    except RequestEntityTooLarge as e:
+        db.session.rollback()
+        return jsonify({'error': 'Import too large: ' + str(e)}), 413
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Error importing projects: ' + str(e)}), 500
+
+
+# RUTA EXPORTAR PROYECTOS (NDJSON en streaming)
+@admin_bp.route('/projects/export', methods=['GET'])
+@jwt_required()
+def export_projects():
+    batch_size = current_app.config['PROJECT_EXPORT_BATCH_SIZE']
+
+    def generate():
+        # El generador corre después de que la vista retorne, fuera de @read_only: la réplica se marca aquí
+        g.db_read_replica = True
+        yield from export_ndjson(batch_size)
+
+    response = current_app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = 'attachment; filename=projects.ndjson'
+    return response
+
+# RUTA FEED DE CAMBIOS EN PROYECTOS (Server-Sent Events, reanudable con Last-Event-ID)
+@admin_bp.route('/projects/events', methods=['GET'])
+def project_events():
+    if not feed.enabled:
+        return jsonify({'error': 'Change feed disabled.'}), 404
+    # EventSource manda Last-Event-ID al reconectar; el parámetro sirve para la primera conexión de una pestaña nueva
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    if last_event_id is not None and not last_event_id.isdigit():
+        return jsonify({'error': 'Last-Event-ID must be an event id.'}), 400
+    last_event_id = int(last_event_id) if last_event_id is not None else None
+
+    response = current_app.response_class(stream_with_context(feed.stream(last_event_id)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Sin buffer en nginx / el proxy de Railway: cada evento sale en cuanto se escribe
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 # RUTA OBTENER TODOS LOS PROYECTOS
 @admin_bp.route('/projects', methods=['GET'])
+@read_only
 def get_projects():
     try:
-        projects = Project.query.all()
-        projects_list = [project.serialize() for project in projects]
-        return jsonify(projects_list), 200
+        # Paginación, proyección y filtros son opcionales: sin ellos se sirve el listado completo cacheado
+        paginated = any(param in request.args for param in LISTING_PARAMS)
+        params = parse_listing_args(request.args) if paginated else None
+
+        # Si el cliente ya tiene esta versión respondemos 304 sin tocar la base de datos
+        etag = f'projects-{project_cache.version()}'
+        if paginated:
+            etag += '-' + hashlib.sha1(request.query_string).hexdigest()[:16]
+        # El listado completo se sirve ya comprimido desde la caché; cada codificación lleva su ETag
+        encoding = None if paginated else negotiate()
+        if encoding:
+            etag += f'-{encoding}'
+        last_modified = projects_last_modified()
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        if paginated:
+            # Sin proyección la página se arma con los documentos guardados; con 'fields' se serializa
+            fields = params.pop('fields')
+            if fields is None:
+                body, next_cursor = list_project_documents(**params)
+                response = current_app.response_class(body, status=200, mimetype='application/json')
+            else:
+                projects_list, next_cursor = list_projects(fields=fields, **params)
+                response = jsonify(projects_list)
+            if next_cursor:
+                next_args = request.args.to_dict(flat=False)
+                next_args['cursor'] = next_cursor
+                next_url = url_for('admin.get_projects', _external=True, **next_args)
+                response.headers['X-Next-Cursor'] = next_cursor
+                response.headers['Link'] = f'<{next_url}>; rel="next"'
+            return add_validators(response, etag, last_modified)
+
+        def build_body():
+            statement = with_documents(select(Project).order_by(Project.created_at, Project.id))
+            return join_bodies(load_bodies(db.session.execute(statement).all()))
+
+        # El cuerpo JSON ya serializado se cachea por versión de los datos
+        body = project_cache.get_or_build('list', build_body, encoding)
+        response = current_app.response_class(body, status=200, mimetype='application/json')
+        return add_validators(set_encoding(response, encoding), etag, last_modified)
+    except BadRequestError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Error fetching projects: ' + str(e)}), 500
 # RUTA OBTENER PROYECTO POR ID
 @admin_bp.route('/projects/<int:project_id>', methods=['GET'])
+@read_only
 def get_project(project_id):
     try:
-        print("Buscando proyecto con ID:", project_id)
-        project = Project.query.get(project_id)
-        print("Resultado:", project)
-        if not project:
+        etag = f'project-{project_id}-{project_cache.version()}'
+        last_modified = projects_last_modified()
+        # "If-None-Match: *" solo vale si el proyecto existe, y eso no se sabe sin consultarlo: se ignora
+        cached = None if request.if_none_match.star_tag else not_modified(etag, last_modified)
+        if cached:
+            return cached
+
+        row = db.session.execute(with_documents(select(Project).where(Project.id == project_id))).first()
+        if not row:
             return jsonify({'ok': False, 'data': None, 'error': 'Project not found.'}), 404
-        return jsonify({'ok': True, 'data': project.serialize()}), 200
+        body = '{"ok":true,"data":' + load_bodies([row])[0] + '}'
+        response = current_app.response_class(body, status=200, mimetype='application/json')
+        return add_validators(response, etag, last_modified), 200
     except Exception as e:
         return jsonify({'ok': False, 'data': None, 'error': 'Error fetching project: ' + str(e)}), 500
     
@@ -204,58 +339,51 @@ def update_project(project_id):
         if not current_user_id:
             return jsonify({'error': 'Token inválido o no proporcionado'}), 401
 
-        project = Project.query.get(project_id)
+        search.ensure_search_index()
+        project = db.session.get(Project, project_id)
         if not project:
             return jsonify({'error': 'Project not found.'}), 404
 
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
             return jsonify({'error': 'Request body must be JSON.'}), 400
+        try:
+            data = PROJECT_SCHEMA.validate(data, partial=True)
+        except ValidationError as e:
+            return jsonify({'error': str(e), 'errors': e.errors}), 400
 
         title = data.get('title', project.title)
         description = data.get('description', project.description)
         title_en = data.get('title_en', project.title_en)
         description_en = data.get('description_en', project.description_en)
-        techs = data.get('techs', project.techs.split(",") if project.techs else [])
+        techs = data.get('techs', project.techs)
         repo_url = data.get('repo_url', project.repo_url)
         live_url = data.get('live_url', project.live_url)
         image_url = data.get('image_url', project.image_url)
-        images = data.get('images', project.images.split(",") if project.images else [])
+        images = data.get('images', project.images)
         main_image_index = data.get('main_image_index', project.main_image_index or 0)
 
-        MAX_TECHS = 10
-        MAX_IMAGES = 10
-
-        if not isinstance(techs, list) or len(techs) > MAX_TECHS:
-            return jsonify({'error': f'Máximo {MAX_TECHS} tecnologías permitidas.'}), 400
-
-        if images and (not isinstance(images, list) or len(images) > MAX_IMAGES):
-            return jsonify({'error': f'Máximo {MAX_IMAGES} imágenes permitidas.'}), 400
-
-        if len(title) > 100:
-            return jsonify({'error': 'El título no puede superar 100 caracteres.'}), 400
-        
-        if len(description) > 2000:
-            return jsonify({'error': 'La descripción no puede superar 2000 caracteres.'}), 400
-        if title_en and len(title_en) > 100:
-            return jsonify({'error': 'El título en inglés no puede superar 100 caracteres.'}), 400
-        if description_en and len(description_en) > 2000:
-            return jsonify({'error': 'La descripción en inglés no puede superar 2000 caracteres.'}), 400
-
         project.title = title
         project.description = description
         project.title_en = title_en
         project.description_en = description_en
-        project.techs = ",".join(techs) if isinstance(techs, list) else techs
         project.repo_url = repo_url or ""  
         project.live_url = live_url
         project.image_url = image_url
-        project.images = ",".join(images) if isinstance(images, list) else images
         project.main_image_index = main_image_index
+        project.replace_relations(techs=techs, images=images or [])
+        db.session.flush()
+        search.index_project(project.id)
+        write_documents([project])
+        feed.updated([project.id])
+        serialized = project.serialize()
 
         db.session.commit()
+        project_cache.bump()
+        # Solo los nombres de los campos enviados: los valores ya están en el proyecto
+        audit.record('project.update', target=f'project:{project_id}', fields=sorted(data))
 
-        return jsonify({'message': 'Project updated successfully.', 'project': project.serialize()}), 200
+        return jsonify({'message': 'Project updated successfully.', 'project': serialized}), 200
 
     except Exception as e:
         db.session.rollback()
@@ -270,12 +398,19 @@ def delete_project(project_id):
         if not current_user_id:
             return jsonify({'error': 'Token inválido o no proporcionado'}), 401
 
-        project = Project.query.get(project_id)
+        search.ensure_search_index()
+        project = db.session.get(Project, project_id)
         if not project:
             return jsonify({'error': 'Project not found.'}), 404
 
+        title = project.title
+        search.remove_project(project.id)
+        remove_document(project.id)
         db.session.delete(project)
+        feed.deleted(project_id)
         db.session.commit()
+        project_cache.bump()
+        audit.record('project.delete', target=f'project:{project_id}', title=title)
 
         return jsonify({'message': 'Project deleted successfully.'}), 200
 
@@ -285,6 +420,7 @@ def delete_project(project_id):
 # RUTA SUBIR IMAGEN
 @admin_bp.route('/upload', methods=['POST'])
 @jwt_required()
+@streamed_uploads
 def upload_file():
     try:
         current_user_id = get_jwt_identity()
@@ -299,16 +435,22 @@ def upload_file():
             return jsonify({'error': 'No selected file.'}), 400
 
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(UPLOAD_FOLDER, filename)
-            file.save(file_path)
-            # Usar variable de entorno o detectar el host automáticamente
-            base_url = os.environ.get('BASE_URL', 'https://web-production-5461c.up.railway.app')
+            # Se guarda con el hash del contenido: una imagen repetida reutiliza el archivo existente
+            filename, size = store_upload(file, current_app.config['UPLOAD_FOLDER'], current_app.config['UPLOAD_MAX_FILE_SIZE'])
+            metrics.inc('uploaded_files_total')
+            metrics.inc('upload_bytes_total', size)
+            # Las miniaturas y WebP se generan en segundo plano; respondemos sin esperarlas
+            image_derivatives.schedule(filename)
+            audit.record('upload.create', target=f'upload:{filename}', size=size)
+            base_url = current_app.config['BASE_URL']
             file_url = f'{base_url}/static/uploads/{filename}'
             return jsonify({'message': 'File uploaded successfully.', 'file_url': file_url}), 201
         else:
             return jsonify({'error': 'File type not allowed.'}), 400
 
+    except (PayloadTooLargeError, RequestEntityTooLarge) as e:
+        return jsonify({'error': 'File too large: ' + str(e)}), 413
+
     except Exception as e:
         return jsonify({'error': 'Error uploading file: ' + str(e)}), 500
 
@@ -316,6 +458,7 @@ def upload_file():
 # RUTA SUBIR MÚLTIPLES IMÁGENES
 @admin_bp.route('/upload-multiple', methods=['POST'])
 @jwt_required()
+@streamed_uploads
 def upload_multiple_files():
     try:
         current_user_id = get_jwt_identity()
@@ -333,29 +476,73 @@ def upload_multiple_files():
         if len(files) > MAX_FILES:
             return jsonify({'error': f'Máximo {MAX_FILES} archivos permitidos.'}), 400
 
-        uploaded_files = []
+        # Validamos todos los tipos antes de escribir nada en disco
         for file in files:
-            if file and file.filename != '' and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                # Agregar timestamp para evitar conflictos de nombres
-                import time
-                timestamp = str(int(time.time()))
-                name, ext = os.path.splitext(filename)
-                unique_filename = f"{name}_{timestamp}{ext}"
-                
-                file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-                file.save(file_path)
-                # Usar variable de entorno o detectar el host automáticamente
-                base_url = os.environ.get('BASE_URL', 'https://web-production-5461c.up.railway.app')
-                file_url = f'{base_url}/static/uploads/{unique_filename}'
-                uploaded_files.append(file_url)
-            else:
+            if not file or file.filename == '' or not allowed_file(file.filename):
                 return jsonify({'error': f'File type not allowed: {file.filename}'}), 400
 
+        uploaded_files = []
+        for file in files:
+            filename, size = store_upload(file, current_app.config['UPLOAD_FOLDER'], current_app.config['UPLOAD_MAX_FILE_SIZE'])
+            metrics.inc('uploaded_files_total')
+            metrics.inc('upload_bytes_total', size)
+            image_derivatives.schedule(filename)
+            audit.record('upload.create', target=f'upload:{filename}', size=size)
+            base_url = current_app.config['BASE_URL']
+            file_url = f'{base_url}/static/uploads/{filename}'
+            uploaded_files.append(file_url)
+
         return jsonify({
             'message': f'{len(uploaded_files)} files uploaded successfully.',
             'files': uploaded_files
         }), 201
 
+    except (PayloadTooLargeError, RequestEntityTooLarge) as e:
+        return jsonify({'error': 'File too large: ' + str(e)}), 413
+
     except Exception as e:
-        return jsonify({'error': 'Error uploading files: ' + str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': 'Error uploading files: ' + str(e)}), 500
+
+
+# RUTA CONSULTAR EL REGISTRO DE AUDITORÍA (filtrable por actor y acción, paginado por cursor)
+@admin_bp.route('/audit', methods=['GET'])
+@jwt_required()
+@read_only
+def list_audit_events():
+    if not is_admin(get_jwt()):
+        return jsonify({'error': 'Admin token required.'}), 403
+    try:
+        params = parse_audit_args(request.args)
+        events, next_cursor = list_events(**params)
+        response = jsonify(events)
+        if next_cursor:
+            next_args = request.args.to_dict(flat=False)
+            next_args['cursor'] = next_cursor
+            next_url = url_for('admin.list_audit_events', _external=True, **next_args)
+            response.headers['X-Next-Cursor'] = next_cursor
+            response.headers['Link'] = f'<{next_url}>; rel="next"'
+        return response, 200
+    except BadRequestError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+# RUTA LISTAR PERFILES GUARDADOS
+@admin_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+def list_profiles():
+    if not is_admin(get_jwt()):
+        return jsonify({'error': 'Admin token required.'}), 403
+    if not profiler.enabled or not profiler.directory:
+        return jsonify({'error': 'Profiling is disabled.'}), 404
+    return jsonify(profiler.list_profiles()), 200
+
+
+# RUTA DESCARGAR UN PERFIL (.pstats o .collapsed)
+@admin_bp.route('/profiles/<name>', methods=['GET'])
+@jwt_required()
+def download_profile(name):
+    if not is_admin(get_jwt()):
+        return jsonify({'error': 'Admin token required.'}), 403
+    if not profiler.enabled or not profiler.directory:
+        return jsonify({'error': 'Profiling is disabled.'}), 404
+    return send_from_directory(profiler.directory, name, as_attachment=True)
@@ -1,4 +1,8 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, current_app
+from app.services.search import search_projects
+from app.services.project_documents import join_bodies
+from app.services.compression import compress_once, negotiate, set_encoding
+from app.exceptions import BadRequestError
 
 public_bp = Blueprint('public', __name__)
 
@@ -12,4 +16,24 @@ def demo():
 
 @public_bp.route('/about')
 def about():
-    return jsonify({'msg':'About Page'})
\ No newline at end of file
+    return jsonify({'msg':'About Page'})
+
+# RUTA BUSCAR PROYECTOS (título y descripción en ambos idiomas)
+@public_bp.route('/search')
+def search():
+    try:
+        q = request.args.get('q', '')
+        limit = request.args.get('limit', 20, type=int)
+
+        # Sin caché: cada consulta distinta sería una entrada más en project_cache, y el índice FTS ya es el camino rápido
+        body = join_bodies(search_projects(q, limit))
+        encoding = negotiate() if len(body) >= current_app.config['COMPRESSION_MIN_SIZE'] else None
+        if encoding:
+            body = compress_once(body, encoding)
+        return set_encoding(current_app.response_class(body, status=200, mimetype='application/json'), encoding)
+
+    except BadRequestError as e:
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        return jsonify({'error': 'Error searching projects: ' + str(e)}), 500
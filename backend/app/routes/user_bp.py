@@ -1,10 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from app.models import User
-from app import bcrypt
+from app import hasher, limiter, user_cache
 from app.services.auth_service import create_user_service, login_user_service, edit_user_service
-from app.exceptions import NotFoundError, UnauthorizedError, ConflictError, BadRequestError
+from app.exceptions import NotFoundError, UnauthorizedError, ConflictError, BadRequestError, ServiceUnavailableError
 from app.blacklist import BLACKLIST
+from app.database import read_only
 
 user_bp = Blueprint('user', __name__)
 
@@ -21,12 +22,16 @@ def create_user():
     
     except BadRequestError as e:
         return jsonify({'error': str(e)}), 400
+
+    except ServiceUnavailableError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(hasher.retry_after)}
     
     except Exception as e:
         return jsonify({'error': 'Error creating user: ' + str(e)}), 500
 
 
 @user_bp.route('/login', methods=['POST'])
+@limiter.limit_login('user', 'email')
 def login():
     try:
         email = request.json.get('email')
@@ -44,6 +49,9 @@ def login():
     except NotFoundError as e:
         return jsonify({'error': str(e)}), 404
 
+    except ServiceUnavailableError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(hasher.retry_after)}
+
     except Exception as e:
         return {"error":"Error attempting to log in: " + str(e)}, 500
     
@@ -66,20 +74,20 @@ def edit_user():
     except NotFoundError as e:
         return jsonify({'error': str(e)}), 404
 
+    except ServiceUnavailableError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(hasher.retry_after)}
+
     except Exception as e:
         return {"error":"Error updating your data: " + str(e)}, 500
     
     
 @user_bp.route('/users')
-@jwt_required()  
+@jwt_required()
+@read_only
 def show_users():
     current_user_id = get_jwt_identity()
     if current_user_id:
-        users = User.query.all()
-        user_list = []
-        for user in users:
-            user_list.append(user.serialize())
-        return jsonify(user_list), 200
+        return current_app.response_class(user_cache.list_body(), status=200, mimetype='application/json')
     else:
         return {"error": "Invalid or missing token"}, 401
     
@@ -89,8 +97,8 @@ def show_users():
 def logout():
     
     try:
-        jti = get_jwt()["jti"]
-        BLACKLIST.add(jti)
+        token = get_jwt()
+        BLACKLIST.revoke(token["jti"], token.get("exp"))
         return jsonify({"msg": "Session ended"}), 200
         
     except Exception as e:
@@ -1,9 +1,13 @@
-from app import create_app, db
-from flask import send_from_directory
+from app import create_app, db, prerender
+from app.services.static_files import StaticFiles
+from flask import abort
 import os
 
 app = create_app()
 static_folder = app.static_folder
+# Manifiesto del build de React: se recorre (y se precomprime lo que falte) una sola vez al arrancar
+front_files = StaticFiles(static_folder, precompress=app.config['COMPRESSION_ENABLED'],
+                          min_size=app.config['COMPRESSION_MIN_SIZE'])
 
 # Creating sqlite DB if it doesn't exists yet
 if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
@@ -16,17 +20,25 @@ if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
             db.create_all()
         print(f"[INFO] Base de datos creada en: {sqlite_path}")
 
+def send_index():
+    info = front_files.get('index.html')
+    response = info and front_files.send(info)
+    if response is None:
+        abort(404)
+    return response
+
 @app.route('/')
 def serve_root():
-    return send_from_directory(static_folder, 'index.html')
+    # Snapshot con los datos ya incluidos; sin él, el index.html vacío del SPA
+    return prerender.send('') or send_index()
 
 @app.route('/<path:path>')
 def serve_react_app(path):
-    full_path = os.path.join(static_folder, path)
-    if os.path.exists(full_path):
-        return send_from_directory(static_folder, path)
-    else:
-        return send_from_directory(static_folder, 'index.html')
+    info = front_files.get(path)
+    response = info and front_files.send(info)
+    if response is None:
+        return prerender.send(path) or send_index()
+    return response
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5100)
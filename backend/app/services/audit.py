@@ -0,0 +1,216 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+
+from flask import has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import and_, insert, or_, select
+
+from app.database import db
+from app.exceptions import BadRequestError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def current_actor():
+    """
+    Returns:
+        str | None -> The JWT identity of the request, or None if it has no verified token.
+    """
+
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # Vistas sin @jwt_required (p. ej. el alta de usuarios)
+        return None
+
+
+class AuditLog:
+    """
+    Append-only log of admin actions in the audit_event table.
+
+    record() only appends the event to an in-memory queue and returns, so it adds no
+    database work to the request. A background thread (a greenlet under gevent) writes
+    the queue every AUDIT_FLUSH_SECONDS, or as soon as AUDIT_BATCH_SIZE events are
+    waiting, with one executemany INSERT per batch. If the database is unavailable the
+    events stay queued for the next flush, up to AUDIT_MAX_QUEUE (the oldest are then
+    dropped and logged). Whatever is left is written when the worker exits.
+    """
+
+    def __init__(self, app=None, **kwargs):
+        self.enabled = False
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+        if app is not None:
+            self.init_app(app, **kwargs)
+
+    def init_app(self, app, client_ip=None):
+        self.app = app
+        self.enabled = app.config.get('AUDIT_ENABLED', True)
+        self.batch_size = app.config.get('AUDIT_BATCH_SIZE', 100)
+        self.flush_interval = app.config.get('AUDIT_FLUSH_SECONDS', 1)
+        self.max_queue = app.config.get('AUDIT_MAX_QUEUE', 10000)
+        self.client_ip = client_ip or (lambda: request.remote_addr)
+        app.extensions['audit'] = self
+        if self.enabled:
+            atexit.register(self._flush_at_exit)
+
+    def record(self, action, target=None, actor=None, **details):
+        """
+        Queues an event. Call it once the action it describes has been committed.
+
+        Receives:
+            action (str): What was done, e.g. 'project.update'.
+            target (str | None): The object it was done to, e.g. 'project:12'.
+            actor (str | None): Who did it; by default the JWT identity of the request.
+            **details: Extra JSON-serializable data stored with the event.
+        """
+
+        if not self.enabled:
+            return
+        in_request = has_request_context()
+        event = {
+            'actor': actor if actor is not None else (current_actor() if in_request else None),
+            'action': action,
+            'target': target,
+            'details': json.dumps(details, default=str) if details else None,
+            'ip': self.client_ip() if in_request else None,
+            'created_at': datetime.utcnow(),
+        }
+        with self._lock:
+            self._queue.append(event)
+            overflow = len(self._queue) - self.max_queue
+            for _ in range(max(0, overflow)):
+                dropped = self._queue.popleft()
+                logger.error("Audit queue full, dropping event: %s", dropped)
+            queued = len(self._queue)
+        self._ensure_writer()
+        if queued >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_writer(self):
+        # Con preload_app el master no escribe: cada worker arranca su propio hilo al registrar su primer evento
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='audit-writer', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush failed, events kept for the next attempt")
+
+    def _take(self):
+        with self._lock:
+            return [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+
+    def flush(self):
+        """
+        Writes every queued event, one INSERT per batch of AUDIT_BATCH_SIZE.
+
+        Returns:
+            int -> Events written.
+        """
+
+        written = 0
+        while True:
+            batch = self._take()
+            if not batch:
+                return written
+            try:
+                with self.app.app_context():
+                    from app.models import AuditEvent
+                    db.session.execute(insert(AuditEvent), batch)
+                    db.session.commit()
+            except Exception:
+                # Se devuelven a la cola, delante, en el mismo orden
+                with self._lock:
+                    self._queue.extendleft(reversed(batch))
+                raise
+            written += len(batch)
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Audit events lost at shutdown: %d", self.pending())
+
+    def pending(self):
+        with self._lock:
+            return len(self._queue)
+
+
+def parse_audit_args(args):
+    """
+    Validates the query string of the audit log listing.
+
+    Receives:
+        args (MultiDict): request.args (actor, action, limit, cursor).
+
+    Returns:
+        dict -> actor, action, limit and cursor ((created_at, id) or None).
+
+    Raises:
+        BadRequestError: If a parameter has an invalid value.
+    """
+
+    from app.services.project_query import decode_cursor
+
+    limit = args.get('limit', str(DEFAULT_PAGE_SIZE))
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        raise BadRequestError(f"'limit' must be an integer between 1 and {MAX_PAGE_SIZE}.")
+
+    return {
+        'actor': args.get('actor') or None,
+        'action': args.get('action') or None,
+        'limit': int(limit),
+        'cursor': decode_cursor(args['cursor']) if args.get('cursor') else None,
+    }
+
+
+def list_events(actor=None, action=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Returns a page of audit events, newest first, keyset-paginated over (created_at, id).
+
+    With an actor the query walks ix_audit_event_actor_created_at_id backwards;
+    without one, ix_audit_event_created_at_id.
+
+    Returns:
+        tuple -> (list of serialized events, next cursor or None)
+    """
+
+    from app.models import AuditEvent
+    from app.services.project_query import encode_cursor
+
+    statement = select(AuditEvent)
+    if actor is not None:
+        statement = statement.where(AuditEvent.actor == actor)
+    if action is not None:
+        statement = statement.where(AuditEvent.action == action)
+    if cursor:
+        created_at, event_id = cursor
+        statement = statement.where(or_(
+            AuditEvent.created_at < created_at,
+            and_(AuditEvent.created_at == created_at, AuditEvent.id < event_id),
+        ))
+    statement = statement.order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc()).limit(limit + 1)
+
+    events = db.session.scalars(statement).all()
+    next_cursor = encode_cursor(events[limit - 1]) if len(events) > limit else None
+    return [event.serialize() for event in events[:limit]], next_cursor
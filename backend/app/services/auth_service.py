@@ -1,7 +1,9 @@
-from app import db, bcrypt
+from app import db, hasher, user_cache
 from app.models import User
 from app.exceptions import NotFoundError, UnauthorizedError, BadRequestError, ConflictError
+from app.services.validation import USER_SCHEMA, USER_EDIT_SCHEMA
 from datetime import timedelta
+from sqlalchemy import update
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 
 
@@ -16,29 +18,26 @@ def create_user_service(**kwargs):
         dict -> The serialized newly created user.
 
     Raises:
-        BadRequestError: If required fields are missing.
+        ValidationError: If required fields are missing or are not strings.
         ConflictError: If the email already exists in the database.
+        ServiceUnavailableError: If the password hashing pool is saturated.
     """
     
-    required_fields = ['email', 'password']
-    missing_fields = [field for field in required_fields if kwargs.get(field) in [None, ""]]
-    
-    if missing_fields:
-        raise BadRequestError(f"Missing required fields: {', '.join(missing_fields)}")
-    
-    email = kwargs.get('email')
-    password = kwargs.get('password')
+    data = USER_SCHEMA.validate(kwargs)
+    email = data['email']
+    password = data['password']
     
     existing_user = User.query.filter_by(email=email).first()
     if existing_user:
         raise ConflictError("This email is already in use, please try a different one.")
     
-    password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+    password_hash = hasher.generate(password)
     
     new_user = User(email=email, password=password_hash)
     
     db.session.add(new_user)
     db.session.commit()
+    user_cache.updated()
     
     return new_user.serialize()
 
@@ -55,20 +54,20 @@ def login_user_service(email, password):
         str -> A JWT access token valid for 1 day.
 
     Raises:
-        BadRequestError: If email or password are missing.
+        ValidationError: If email or password are missing.
         NotFoundError: If no user exists with the provided email.
         ConflictError: If the password is incorrect.
+        ServiceUnavailableError: If the password hashing pool is saturated.
     """
     
-    if not email or not password:
-        raise BadRequestError("Email and password are required.")
+    USER_SCHEMA.validate({'email': email, 'password': password})
     
     user = User.query.filter_by(email=email).first()
     if not user:
         raise NotFoundError(f"No user found with email {email}")
 
     password_from_db = user.password
-    true_o_false = bcrypt.check_password_hash(password_from_db, password)
+    true_o_false = hasher.check(password_from_db, password)
         
     if true_o_false:
         expires = timedelta(days=1)
@@ -93,23 +92,21 @@ def edit_user_service(user_id, **kwargs):
 
     Raises:
         NotFoundError: If the user does not exist.
-        BadRequestError: If trying to edit a non-editable field.
+        ValidationError: If trying to edit a non-editable field or the new password is empty.
+        ServiceUnavailableError: If the password hashing pool is saturated.
     """
     
-    user = User.query.filter_by(id=user_id).first()
+    user = user_cache.by_id(user_id)
     if not user:
         raise NotFoundError("User not found.")
     
-    editable_fields = ['password']
-    for key, value in kwargs.items():
-        if key == 'password':
-            password_hash = bcrypt.generate_password_hash(value).decode('utf-8')
-            setattr(user, key, password_hash)
-        elif key in editable_fields and value:
-            setattr(user, key, value)
-        else:
-            raise BadRequestError(f"You cannot edit the field {key}")
-        
-    db.session.commit()
+    data = USER_EDIT_SCHEMA.validate(kwargs, partial=True)
+    if 'password' in data:
+        # UPDATE directo: by_id() ya leyó la fila
+        user = user._replace(password=hasher.generate(data['password']))
+        db.session.execute(update(User).where(User.id == user.id).values(password=user.password))
+        db.session.commit()
+        # Nueva versión en el store compartido: ningún worker sigue aceptando el hash anterior
+        user_cache.updated(user)
     
     return user.serialize()
\ No newline at end of file
@@ -0,0 +1,329 @@
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from sqlalchemy import delete, func, insert, literal, select
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'project.created'
+UPDATED = 'project.updated'
+DELETED = 'project.deleted'
+RESET = 'projects.reset'
+# Con varios workers escribiendo, una transacción puede confirmarse después de otra con un id mayor:
+# cada consulta vuelve a leer estos últimos ids y descarta los que ya tiene
+LATE_COMMIT_WINDOW = 100
+
+
+def latest_id_statement():
+    """
+    Returns:
+        Select -> Id of the newest project_event row (0 if there is none): the project data version.
+    """
+
+    from app.models import ProjectEvent
+
+    return select(func.coalesce(func.max(ProjectEvent.id), 0))
+
+
+def last_change_statement():
+    """
+    Returns:
+        Select -> created_at of the newest project_event row: the time of the last project
+        write, deletes included. Falls back to the newest Project.updated_at while no event
+        was ever recorded (projects from before the feed).
+    """
+
+    from app.models import Project, ProjectEvent
+
+    return select(func.coalesce(
+        select(func.max(ProjectEvent.created_at)).scalar_subquery(),
+        select(func.max(Project.updated_at)).scalar_subquery(),
+    ))
+
+
+def to_timestamp(value):
+    """Unix timestamp of a naive UTC datetime from the database (None stays None)."""
+    return value.replace(tzinfo=timezone.utc).timestamp() if value is not None else None
+
+
+class FeedEvent(NamedTuple):
+    id: int
+    kind: str
+    project_id: int | None
+    message: str
+
+
+def format_event(event_id, kind, project_id=None, body=None):
+    """
+    Returns:
+        str -> The Server-Sent Events message of a change: id, event name and JSON data.
+    """
+
+    if body is not None:
+        data = '{"id":%d,"project":%s}' % (project_id, body)
+    elif project_id is not None:
+        data = '{"id":%d}' % project_id
+    else:
+        data = '{}'
+    return f'id: {event_id}\nevent: {kind}\ndata: {data}\n\n'
+
+
+class Subscription:
+    """The queue of one SSE connection. closed is set when it fell too far behind and was dropped."""
+
+    def __init__(self, size):
+        self.queue = queue.Queue(size)
+        self.closed = False
+
+
+class ChangeFeed:
+    """
+    Project change feed pushed to the clients over Server-Sent Events.
+
+    The write paths add a row to project_event in their own transaction (created(),
+    updated(), deleted(), reset()), so the event exists exactly when the change is
+    committed. That table is the fan-out between workers: each worker reads the new
+    rows every FEED_POLL_SECONDS, from a background thread (a greenlet under gevent)
+    started with its first request, pushes them to the queues of its own connections
+    and moves the ProjectCache version to the newest id (the version is that id, see
+    ProjectCache). A write in this worker is read at once from its ProjectCache bump,
+    so only the other workers see up to FEED_POLL_SECONDS of delay. FEED_ENABLED only
+    turns the SSE endpoint off: the events are always written, the cache needs them.
+
+    The table and the in-memory buffer keep the last FEED_REPLAY_SIZE events, which
+    is what a reconnecting client can resume from with Last-Event-ID. Older ids get a
+    projects.reset event instead: the client reloads the list. A connection whose
+    queue (FEED_QUEUE_SIZE) fills up is closed, and resumes the same way.
+    """
+
+    def __init__(self, app=None, **kwargs):
+        self.enabled = False
+        self._buffer = deque()
+        self._ids = set()
+        self._subscribers = set()
+        self._watermark = 0
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._pid = None
+        if app is not None:
+            self.init_app(app, **kwargs)
+
+    def init_app(self, app, cache=None):
+        self.app = app
+        self.enabled = app.config.get('FEED_ENABLED', True)
+        self.poll_interval = app.config.get('FEED_POLL_SECONDS', 1)
+        self.replay_size = app.config.get('FEED_REPLAY_SIZE', 1000)
+        self.heartbeat = app.config.get('FEED_HEARTBEAT_SECONDS', 15)
+        self.queue_size = app.config.get('FEED_QUEUE_SIZE', 256)
+        self.cache = cache
+        # Una app nueva (p. ej. en los tests) empieza sin eventos vistos
+        with self._lock:
+            self._buffer = deque(maxlen=self.replay_size)
+            self._ids = set()
+            self._subscribers = set()
+            self._watermark = 0
+        app.extensions['change_feed'] = self
+        if cache is not None:
+            cache.version_source = self.latest_id
+            # Cada escritura de proyectos termina con un bump(): los clientes de este worker la reciben sin esperar
+            cache.subscribe(self.poll)
+        if self.poll_interval:
+            app.before_request(self._ensure_poller)
+
+    # Escritura: dentro de la transacción del que llama, que hace el commit
+
+    def _append(self, statement):
+        from app.models import ProjectEvent
+
+        db.session.execute(statement)
+        newest = select(func.max(ProjectEvent.id)).scalar_subquery()
+        db.session.execute(delete(ProjectEvent).where(ProjectEvent.id <= newest - self.replay_size))
+
+    def _documents(self, kind, project_ids):
+        from app.models import ProjectDocument, ProjectEvent
+
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        # El cuerpo del evento es el documento que refresh_documents() acaba de escribir en la misma transacción
+        documents = (
+            select(literal(kind), ProjectDocument.project_id, ProjectDocument.body, literal(datetime.utcnow()))
+            .where(ProjectDocument.project_id.in_(project_ids))
+            .order_by(ProjectDocument.project_id)
+        )
+        self._append(insert(ProjectEvent).from_select(['kind', 'project_id', 'body', 'created_at'], documents))
+
+    def created(self, project_ids):
+        """
+        Records the creation of some projects. Call it after refresh_documents() on the same ids.
+
+        Receives:
+            project_ids (iterable): Ids of the new projects.
+        """
+
+        self._documents(CREATED, project_ids)
+
+    def updated(self, project_ids):
+        """
+        Records the edition of some projects. Call it after refresh_documents() on the same ids.
+
+        Receives:
+            project_ids (iterable): Ids of the changed projects.
+        """
+
+        self._documents(UPDATED, project_ids)
+
+    def deleted(self, project_id):
+        """
+        Receives:
+            project_id (int): Id of the deleted project.
+        """
+
+        from app.models import ProjectEvent
+
+        self._append(insert(ProjectEvent).values(kind=DELETED, project_id=project_id, created_at=datetime.utcnow()))
+
+    def reset(self):
+        """Records a change too large for deltas (bulk import, every document rebuilt): clients reload the list."""
+
+        from app.models import ProjectEvent
+
+        self._append(insert(ProjectEvent).values(kind=RESET, created_at=datetime.utcnow()))
+
+    # Lectura: un hilo por worker que reparte los eventos nuevos entre las conexiones
+
+    def latest_id(self):
+        """
+        Returns:
+            int -> Id of the newest project_event row (0 if there is none): the project data version.
+        """
+
+        return db.session.scalar(latest_id_statement())
+
+    def last_change(self):
+        """
+        Returns:
+            float | None -> Unix timestamp of the last project write (see last_change_statement()).
+        """
+
+        return to_timestamp(db.session.scalar(last_change_statement()))
+
+    def poll(self):
+        """
+        Reads the events committed since the last poll, pushes them to every subscriber and
+        moves the ProjectCache to the newest one.
+
+        Returns:
+            int -> New events.
+        """
+
+        from app.models import ProjectEvent
+
+        with self._poll_lock:
+            statement = (
+                select(ProjectEvent.id, ProjectEvent.kind, ProjectEvent.project_id, ProjectEvent.body,
+                       ProjectEvent.created_at)
+                .where(ProjectEvent.id > self._watermark - LATE_COMMIT_WINDOW)
+                .order_by(ProjectEvent.id)
+            )
+            with self.app.app_context():
+                rows = db.session.execute(statement).all()
+            if rows and self.cache is not None:
+                newest = rows[-1]
+                self.cache.advance(newest.id, to_timestamp(newest.created_at))
+            events = [FeedEvent(id, kind, project_id, format_event(id, kind, project_id, body))
+                      for id, kind, project_id, body, _ in rows if id not in self._ids]
+            if not events:
+                return 0
+            with self._lock:
+                for event in events:
+                    if len(self._buffer) == self._buffer.maxlen:
+                        self._ids.discard(self._buffer[0].id)
+                    self._buffer.append(event)
+                    self._ids.add(event.id)
+                    self._watermark = max(self._watermark, event.id)
+                    for subscription in list(self._subscribers):
+                        try:
+                            subscription.queue.put_nowait(event)
+                        except queue.Full:
+                            subscription.closed = True
+                            self._subscribers.discard(subscription)
+            return len(events)
+
+    def _ensure_poller(self):
+        # Igual que AuditLog: con preload_app cada worker arranca su propio hilo con su primera petición
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='change-feed', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Change feed poll failed")
+
+    def subscribe(self, last_event_id=None):
+        """
+        Registers a connection and returns the events it missed.
+
+        Receives:
+            last_event_id (int | None): The last event the client received (Last-Event-ID), if it is resuming.
+
+        Returns:
+            tuple -> (Subscription, list of FeedEvent to send first)
+        """
+
+        # Con el buffer al día, lo que falte llegará por la cola
+        self.poll()
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            # Bajo el mismo lock que el reparto: ningún evento queda entre la repetición y la cola
+            self._subscribers.add(subscription)
+            if last_event_id is None or not self._buffer:
+                return subscription, []
+            if last_event_id < self._buffer[0].id - 1:
+                newest = self._buffer[-1].id
+                return subscription, [FeedEvent(newest, RESET, None, format_event(newest, RESET))]
+            return subscription, [event for event in self._buffer if event.id > last_event_id]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stream(self, last_event_id=None):
+        """
+        Generator of the text/event-stream body of one connection: the missed events, then the live ones,
+        with a comment every FEED_HEARTBEAT_SECONDS so proxies keep the connection open.
+        """
+
+        subscription, backlog = self.subscribe(last_event_id)
+        try:
+            # Los navegadores reconectan solos (con Last-Event-ID) pasados estos milisegundos
+            yield f'retry: {int(self.poll_interval * 1000) + 2000}\n\n'
+            for event in backlog:
+                yield event.message
+            while True:
+                if subscription.closed and subscription.queue.empty():
+                    return
+                try:
+                    event = subscription.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield event.message
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,160 @@
+import gzip
+import logging
+import mimetypes
+import os
+import tempfile
+
+from flask import current_app, request
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+# Extensión del archivo hermano precomprimido de cada codificación
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+# Tipos que merece la pena comprimir; imágenes y fuentes woff ya vienen comprimidas
+COMPRESSIBLE_TYPES = {
+    'application/javascript', 'application/json', 'application/manifest+json',
+    'application/xml', 'image/svg+xml', 'text/javascript',
+}
+
+
+def available_encodings():
+    """
+    Returns:
+        tuple -> Supported content codings, preferred first.
+    """
+
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def is_compressible(mimetype):
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+
+def negotiate(encodings=None):
+    """
+    Picks the content coding for the current request from its Accept-Encoding header.
+
+    Receives:
+        encodings (iterable | None): Codings available for this resource, defaults to every supported one.
+
+    Returns:
+        str | None -> 'br' or 'gzip', or None to send the identity representation.
+    """
+
+    if not current_app.config.get('COMPRESSION_ENABLED', True):
+        return None
+    offered = [encoding for encoding in available_encodings() if encodings is None or encoding in encodings]
+    if not offered or not request.accept_encodings:
+        return None
+    # Ante empates (p. ej. "gzip, br") gana el orden del servidor: brotli primero
+    best = max(offered, key=lambda encoding: request.accept_encodings[encoding])
+    return best if request.accept_encodings[best] > 0 else None
+
+
+def compress(body, encoding):
+    """
+    Compresses a body at the highest level; meant for content compressed once and reused.
+
+    Returns:
+        bytes -> The encoded body.
+    """
+
+    if encoding == 'br':
+        return brotli.compress(body, quality=11)
+    # mtime=0 hace la salida determinista, así la misma entrada da los mismos bytes en cada worker
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def compress_once(body, encoding):
+    """
+    Compresses a body built for a single response, at a fast level.
+
+    Returns:
+        bytes -> The encoded body.
+    """
+
+    if encoding == 'br':
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def set_encoding(response, encoding):
+    """
+    Marks a response whose body was already compressed with `encoding` (None for identity).
+
+    Returns:
+        Response -> The same response, for chaining.
+    """
+
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.content_encoding = encoding
+    return response
+
+
+def precompress_file(path, min_size=1024):
+    """
+    Writes `.br`/`.gz` siblings of a static file, skipping the ones that already exist.
+
+    Siblings that would not be smaller than the original are not written.
+
+    Returns:
+        dict -> {encoding: sibling path} for every sibling that exists after the call.
+    """
+
+    written = {}
+    if os.path.getsize(path) < min_size:
+        return written
+    body = None
+    for encoding in available_encodings():
+        target = path + SUFFIXES[encoding]
+        if os.path.exists(target):
+            written[encoding] = target
+            continue
+        if body is None:
+            with open(path, 'rb') as file:
+                body = file.read()
+        encoded = compress(body, encoding)
+        if len(encoded) >= len(body):
+            continue
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.compress-')
+        except OSError as e:
+            # Directorio de solo lectura: se sirve sin comprimir
+            logger.warning("Could not write %s: %s", target, e)
+            return written
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(encoded)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        written[encoding] = target
+    return written
+
+
+def precompress_directory(directory, min_size=1024):
+    """
+    Precompresses every compressible file of a directory tree, e.g. the Vite build.
+
+    Returns:
+        int -> Number of files that have at least one compressed sibling.
+    """
+
+    count = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.startswith('.') or name.endswith(tuple(SUFFIXES.values())):
+                continue
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if is_compressible(mimetype) and precompress_file(os.path.join(root, name), min_size):
+                count += 1
+    return count
+
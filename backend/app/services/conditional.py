@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+from flask import current_app, request
+
+
+def not_modified(etag, last_modified=None):
+    """
+    Checks the request validators against the current ones.
+
+    If-None-Match takes precedence over If-Modified-Since, as required by RFC 9110.
+
+    Receives:
+        etag (str): Current strong ETag, without quotes.
+        last_modified (int | None): Current modification time as a unix timestamp.
+
+    Returns:
+        Response | None -> A 304 response when the client copy is fresh, otherwise None.
+    """
+
+    fresh = False
+    if request.if_none_match:
+        fresh = request.if_none_match.contains(etag)
+    elif request.if_modified_since and last_modified is not None:
+        fresh = int(last_modified) <= int(request.if_modified_since.timestamp())
+
+    if not fresh:
+        return None
+    response = current_app.response_class(status=304)
+    return add_validators(response, etag, last_modified)
+
+
+def add_validators(response, etag, last_modified=None):
+    """
+    Sets ETag, Last-Modified and a revalidate-always Cache-Control on a response.
+
+    Returns:
+        Response -> The same response, for chaining.
+    """
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
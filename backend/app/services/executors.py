@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def create_native_executor(max_workers, thread_name_prefix):
+    """
+    Returns an executor whose tasks run on native OS threads.
+
+    Under gevent monkey-patching the stdlib ThreadPoolExecutor would run tasks in
+    greenlets, so CPU-bound work would still block the worker; gevent's executor
+    uses real threads and lets the calling greenlet wait cooperatively. Done
+    callbacks run in the hub (gevent) or in the worker thread (stdlib).
+    """
+
+    try:
+        from gevent import monkey
+        from gevent.threadpool import ThreadPoolExecutor as GeventThreadPoolExecutor
+    except ImportError:
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    if monkey.is_module_patched('threading'):
+        return GeventThreadPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
@@ -0,0 +1,75 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+from app.exceptions import ServiceUnavailableError
+from app.services.executors import create_native_executor
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a bounded pool of native threads.
+
+    bcrypt is CPU bound; called inline under gevent it blocks every other request of
+    the worker. Here the calling greenlet only waits on a future while the hash runs
+    in a real OS thread. When more than HASHING_MAX_QUEUE operations are pending, new
+    ones are rejected with ServiceUnavailableError (503) instead of piling up.
+    """
+
+    def __init__(self, bcrypt, app=None):
+        self.bcrypt = bcrypt
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, metrics=None):
+        self.metrics = metrics
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.pool_size = app.config.get('HASHING_POOL_SIZE', 2)
+        self.max_queue = app.config.get('HASHING_MAX_QUEUE', 16)
+        self.timeout = app.config.get('HASHING_TIMEOUT', 10)
+        self.retry_after = app.config.get('HASHING_RETRY_AFTER', 1)
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self):
+        # Se crea en el primer uso, ya dentro del worker (después del fork de gunicorn)
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = create_native_executor(self.pool_size, 'bcrypt')
+        return self._executor
+
+    def _run(self, operation, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_queue:
+                raise ServiceUnavailableError("Too many authentication requests in progress, please retry.")
+            self._pending += 1
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise ServiceUnavailableError("Password hashing timed out, please retry.")
+        finally:
+            with self._lock:
+                self._pending -= 1
+            if self.metrics:
+                self.metrics.observe('password_hash_seconds', time.perf_counter() - started, operation=operation)
+
+    def generate(self, password):
+        """
+        Returns:
+            str -> The bcrypt hash of `password`, using the configured cost factor.
+        """
+
+        return self._run('generate', self.bcrypt.generate_password_hash, password, self.rounds).decode('utf-8')
+
+    def check(self, pw_hash, password):
+        """
+        Returns:
+            bool -> True if `password` matches `pw_hash`.
+        """
+
+        return self._run('check', self.bcrypt.check_password_hash, pw_hash, password)
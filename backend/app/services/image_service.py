@@ -0,0 +1,173 @@
+import functools
+import logging
+import os
+import tempfile
+from urllib.parse import urlsplit
+
+from app.services.executors import create_native_executor
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_PATH = '/static/uploads/'
+# Los GIF pueden ser animados; reducirlos a un solo fotograma sería una regresión
+SKIPPED_EXTENSIONS = {'.gif'}
+
+
+def variant_filename(filename, width=None):
+    """Name of a WebP derivative: '<stem>_<width>w.webp', or '<stem>.webp' at the original size."""
+    stem = os.path.splitext(filename)[0]
+    return f'{stem}_{width}w.webp' if width else f'{stem}.webp'
+
+
+def generate_derivatives(path, widths, quality):
+    """
+    Writes resized WebP copies of an image next to it. Runs on a pool thread.
+
+    Widths larger than the original are skipped instead of upscaling; a WebP at the
+    original size is always written. Existing derivatives are not regenerated.
+
+    Returns:
+        list -> Filenames written.
+    """
+
+    from PIL import Image, ImageOps
+
+    folder, filename = os.path.split(path)
+    written = []
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        targets = [(width, variant_filename(filename, width)) for width in widths if width < image.width]
+        targets.append((image.width, variant_filename(filename)))
+        for width, name in targets:
+            target = os.path.join(folder, name)
+            if os.path.exists(target):
+                continue
+            resized = image.copy()
+            resized.thumbnail((width, image.height))
+            fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.variant-')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    resized.save(tmp, 'WEBP', quality=quality, method=4)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, target)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            written.append(name)
+    return written
+
+
+class ImageDerivatives:
+    """
+    Generates thumbnails / responsive WebP sizes of uploaded images in the background.
+
+    Jobs run on a small pool of native threads, so the upload request returns as soon
+    as the original is stored. When a job finishes, `on_complete(filename)` is called
+    so the projects that use the image pick up the new variants.
+    """
+
+    def __init__(self, app=None, **kwargs):
+        self._executor = None
+        self._known = set()
+        if app is not None:
+            self.init_app(app, **kwargs)
+
+    def init_app(self, app, on_complete=None):
+        self.enabled = app.config.get('IMAGE_DERIVATIVES_ENABLED', True)
+        self.widths = tuple(sorted(app.config.get('IMAGE_VARIANT_WIDTHS', (320, 640, 1280))))
+        self.quality = app.config.get('IMAGE_WEBP_QUALITY', 80)
+        self.pool_size = app.config.get('IMAGE_POOL_SIZE', 1)
+        self.upload_folder = app.config['UPLOAD_FOLDER']
+        self.on_complete = on_complete
+        app.extensions['image_derivatives'] = self
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = create_native_executor(self.pool_size, 'images')
+        return self._executor
+
+    def schedule(self, filename):
+        """
+        Queues derivative generation for an uploaded file and returns immediately.
+
+        Returns:
+            Future | None -> The job, or None if derivatives are disabled or not applicable.
+        """
+
+        if not self.enabled or os.path.splitext(filename)[1].lower() in SKIPPED_EXTENSIONS:
+            return None
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            logger.warning("Pillow is not installed, image derivatives are disabled.")
+            return None
+
+        path = os.path.join(self.upload_folder, filename)
+        future = self._get_executor().submit(generate_derivatives, path, self.widths, self.quality)
+        future.add_done_callback(functools.partial(self._done, filename))
+        return future
+
+    def shutdown(self):
+        """Waits for the queued jobs, and their on_complete, to finish. E.g. before removing the upload folder."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _done(self, filename, future):
+        error = future.exception()
+        if error:
+            logger.error("Image derivative generation failed: %s", error)
+            return
+        if future.result() and self.on_complete:
+            _spawn(functools.partial(self.on_complete, filename))
+
+    def _exists(self, name):
+        # Las variantes no se borran, así que solo memorizamos las que ya existen
+        if name in self._known:
+            return True
+        if os.path.exists(os.path.join(self.upload_folder, name)):
+            self._known.add(name)
+            return True
+        return False
+
+    def variants(self, url):
+        """
+        Lists the derivatives of an uploaded image generated so far, srcset style.
+
+        Receives:
+            url (str): Image URL, absolute or relative, pointing at /static/uploads/.
+
+        Returns:
+            dict -> {'320w': url, '640w': url, ..., 'webp': full-size WebP url}; empty if there are none yet.
+        """
+
+        if not url:
+            return {}
+        path = urlsplit(url).path
+        if not path.startswith(UPLOADS_PATH):
+            return {}
+        filename = path[len(UPLOADS_PATH):]
+        base = url[:url.rindex(filename)]
+
+        variants = {}
+        for width in self.widths:
+            name = variant_filename(filename, width)
+            if self._exists(name):
+                variants[f'{width}w'] = base + name
+        if self._exists(variant_filename(filename)):
+            variants['webp'] = base + variant_filename(filename)
+        return variants
+
+
+def _spawn(fn):
+    # Bajo gevent el callback corre en el hub, donde no se puede bloquear: lo pasamos a un greenlet
+    try:
+        from gevent import monkey, spawn
+    except ImportError:
+        return fn()
+    if monkey.is_module_patched('threading'):
+        return spawn(fn)
+    return fn()
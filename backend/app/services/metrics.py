@@ -0,0 +1,256 @@
+import atexit
+import bisect
+import glob
+import hmac
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# nombre -> (tipo, ayuda, buckets)
+DEFINITIONS = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by route.', LATENCY_BUCKETS),
+    'http_request_db_queries': ('histogram', 'SQL statements executed per request.', QUERY_BUCKETS),
+    'http_request_db_seconds': ('histogram', 'Time spent in SQL per request.', LATENCY_BUCKETS),
+    'password_hash_seconds': ('histogram', 'bcrypt time by operation, queueing included.', LATENCY_BUCKETS),
+    'uploaded_files_total': ('counter', 'Files received by the upload endpoints.', None),
+    'upload_bytes_total': ('counter', 'Bytes received by the upload endpoints.', None),
+}
+
+
+def _label_key(labels):
+    return json.dumps(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not has_request_context() or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    g.db_queries = g.get('db_queries', 0) + 1
+    g.db_seconds = g.get('db_seconds', 0.0) + elapsed
+
+
+class Metrics:
+    """
+    Request, SQL, bcrypt and upload metrics, exposed in Prometheus text format at /metrics.
+
+    Each worker accumulates its samples in memory and writes them to METRICS_DIR/<pid>.json
+    at most every METRICS_FLUSH_SECONDS; /metrics sums the files of every worker, so the
+    scrape is the same whichever gunicorn worker answers it. SQL statements are counted
+    per request through engine events, and requests above METRICS_QUERY_WARNING queries
+    are logged with their route, which makes N+1 patterns easy to spot.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._next_flush = 0
+        self._exit_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.directory = app.config.get('METRICS_DIR')
+        self.flush_interval = app.config.get('METRICS_FLUSH_SECONDS', 1)
+        self.query_warning = app.config.get('METRICS_QUERY_WARNING', 20)
+        self.server_timing = app.config.get('METRICS_SERVER_TIMING', False)
+        self.token = app.config.get('METRICS_TOKEN')
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            return
+
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._end_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            # Una sola vez aunque init_app se llame con cada create_app
+            if not self._exit_registered:
+                atexit.register(self.flush, force=True)
+                self._exit_registered = True
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        buckets = DEFINITIONS[name][2]
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            sample = series.get(key)
+            if sample is None:
+                # Un contador por bucket más el de +Inf; se acumulan al exportar
+                sample = series[key] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            sample['buckets'][bisect.bisect_left(buckets, value)] += 1
+            sample['sum'] += value
+            sample['count'] += 1
+
+    def _start_request(self):
+        g.request_started = time.perf_counter()
+        g.db_queries = 0
+        g.db_seconds = 0.0
+
+    def _end_request(self, response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        queries = g.get('db_queries', 0)
+        db_seconds = g.get('db_seconds', 0.0)
+
+        self.observe('http_request_duration_seconds', elapsed,
+                     method=request.method, route=route, status=response.status_code)
+        self.observe('http_request_db_queries', queries, method=request.method, route=route)
+        self.observe('http_request_db_seconds', db_seconds, method=request.method, route=route)
+        if queries > self.query_warning:
+            logger.warning("%s %s ran %d SQL queries (%.1f ms)", request.method, route, queries, db_seconds * 1000)
+        if self.server_timing:
+            response.headers.add('Server-Timing', f'db;dur={db_seconds * 1000:.1f};desc="{queries} queries"')
+            response.headers.add('Server-Timing', f'app;dur={elapsed * 1000:.1f}')
+        self.flush()
+        return response
+
+    def flush(self, force=False):
+        """Writes this worker's samples to METRICS_DIR, at most every METRICS_FLUSH_SECONDS unless forced."""
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now < self._next_flush:
+            return
+        self._next_flush = now + self.flush_interval
+        with self._lock:
+            payload = json.dumps(self._values)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.metrics-')
+            try:
+                with os.fdopen(fd, 'w') as tmp:
+                    tmp.write(payload)
+                os.replace(tmp_path, os.path.join(self.directory, f'{os.getpid()}.json'))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            # Las métricas nunca deben tumbar una petición
+            logger.warning("Could not write metrics: %s", e)
+
+    def clear(self):
+        """
+        Removes the samples left in METRICS_DIR by previous runs.
+
+        collect() sums every file in the directory, so the files of workers that no longer
+        exist would be added to the scrape forever; gunicorn calls this once on startup.
+        """
+
+        if not self.directory:
+            return
+        for path in glob.glob(os.path.join(self.directory, '*.json')) + glob.glob(os.path.join(self.directory, '.metrics-*')):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def collect(self):
+        """
+        Returns:
+            dict -> {name: {label key: value}} summed over every worker that wrote samples.
+        """
+
+        if not self.directory:
+            with self._lock:
+                return json.loads(json.dumps(self._values))
+
+        self.flush(force=True)
+        merged = {}
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                with open(path) as file:
+                    values = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for name, series in values.items():
+                target = merged.setdefault(name, {})
+                for key, value in series.items():
+                    if isinstance(value, dict):
+                        current = target.setdefault(key, {'buckets': [0] * len(value['buckets']), 'sum': 0.0, 'count': 0})
+                        current['buckets'] = [a + b for a, b in zip(current['buckets'], value['buckets'])]
+                        current['sum'] += value['sum']
+                        current['count'] += value['count']
+                    else:
+                        target[key] = target.get(key, 0) + value
+        return merged
+
+    def render(self):
+        """
+        Returns:
+            str -> Every metric in Prometheus text exposition format (version 0.0.4).
+        """
+
+        values = self.collect()
+        lines = []
+        for name, (kind, help_text, buckets) in DEFINITIONS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, value in sorted(values.get(name, {}).items()):
+                labels = [tuple(pair) for pair in json.loads(key)]
+                if kind == 'counter':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(buckets) + ['+Inf'], value['buckets']):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels + [("le", bound)])} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value["sum"])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        # El scraper envía METRICS_TOKEN como Bearer; sin token configurado solo se sirve en debug y en los tests,
+        # porque los tiempos por ruta (las de /admin incluidas) no deben quedar públicos en producción
+        if not self.token:
+            if not (current_app.debug or current_app.testing):
+                return Response('Not Found\n', status=404, mimetype='text/plain')
+        elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {self.token}'):
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        # content_type y no mimetype: con mimetype werkzeug añade un segundo charset
+        return Response(self.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from flask import render_template, send_file
+from markupsafe import Markup
+
+from app.services.compression import SUFFIXES, available_encodings, compress, negotiate, set_encoding
+
+logger = logging.getLogger(__name__)
+
+VERSION_FILE = '.version'
+SITE_NAME = 'Juan Manuel Paredes'
+ROOT_DIV = re.compile(r'(<div[^>]*\bid="root"[^>]*>)\s*(</div>)')
+TITLE = re.compile(r'<title>.*?</title>', re.S)
+# Rutas del SPA que tienen snapshot: '' (home), 'projects' y 'projects/<id>'
+SNAPSHOT_PATH = re.compile(r'^(?:projects(?:/(?P<id>\d+))?)?/?$')
+
+
+def snapshot_name(path):
+    """
+    Returns:
+        str | None -> Snapshot file for an SPA path ('' for the home page), or None if it has none.
+    """
+
+    match = SNAPSHOT_PATH.match(path)
+    if not match:
+        return None
+    if match.group('id'):
+        return f"projects/{int(match.group('id'))}.html"
+    return 'projects.html' if path.strip('/') else 'index.html'
+
+
+def preloaded_state(state):
+    # JSON dentro de <script>: se escapan '<', '>' y '&' para que el contenido no pueda cerrar la etiqueta
+    body = json.dumps(state, ensure_ascii=False, separators=(',', ':'))
+    body = body.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+    return Markup(f'<script id="preloaded-state" type="application/json">{body}</script>')
+
+
+def inject(template, title, head, markup, state):
+    """
+    Fills the SPA index.html with a page: title and meta tags, the prerendered markup inside
+    #root and the data the SPA starts from, so it does not fetch it again on load.
+    """
+
+    html = TITLE.sub(lambda _: f'<title>{Markup.escape(title)}</title>', template, count=1)
+    html = html.replace('</head>', f'{head}\n  </head>', 1)
+    html = ROOT_DIV.sub(lambda m: f'{m.group(1)}{markup}{m.group(2)}', html, count=1)
+    return html.replace('</body>', f'  {preloaded_state(state)}\n  </body>', 1)
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.prerender-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class Prerenderer:
+    """
+    Static HTML snapshots of the public SPA routes with the project data already in them.
+
+    The home page, /projects and every /projects/<id> are rendered from the built
+    index.html: the markup of the page goes inside #root (first paint without waiting for
+    the bundle), and the projects go in a JSON script the SPA store reads instead of
+    calling /admin/projects. React then mounts over the snapshot.
+
+    Snapshots are written to PRERENDER_DIR (with .br/.gz copies) together with the project
+    data version they were built from, which every worker shares (the id of the last
+    project_event, see ProjectCache). They are rebuilt in the background after every
+    project_cache.bump(); a worker that finds the snapshots older than its version
+    schedules a rebuild too, unless another worker has already written that version.
+    Meanwhile the old ones are served.
+    """
+
+    def __init__(self, app=None, **kwargs):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        if app is not None:
+            self.init_app(app, **kwargs)
+
+    def init_app(self, app, cache=None):
+        self.app = app
+        self.cache = cache
+        self.directory = app.config.get('PRERENDER_DIR')
+        self.template_path = os.path.join(app.static_folder, 'index.html')
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+        # Sin build del front (desarrollo con Vite, tests) no hay index.html que rellenar
+        self.enabled = bool(app.config.get('PRERENDER_ENABLED', True) and self.directory
+                            and os.path.isfile(self.template_path))
+        app.extensions['prerender'] = self
+        if self.enabled and cache is not None:
+            cache.subscribe(self.schedule)
+
+    def built_version(self):
+        try:
+            with open(os.path.join(self.directory, VERSION_FILE)) as file:
+                return int(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def schedule(self):
+        """
+        Rebuilds the snapshots in the background and returns immediately.
+
+        Requests made while a rebuild runs are folded into one more rebuild after it.
+        The job is a threading.Thread: a greenlet under gevent, so its queries do not
+        block the worker.
+        """
+
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._running:
+                self._pending = True
+                return
+            self._running = True
+        threading.Thread(target=self._run, name='prerender', daemon=True).start()
+
+    def current_version(self):
+        return self.cache.version() if self.cache is not None else 0
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    # Otro worker puede haber escrito ya esta versión (o una posterior) en el directorio compartido
+                    built = self.built_version()
+                    if built is None or built < self.current_version():
+                        self.render()
+            except Exception:
+                logger.exception("Prerendering failed")
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+
+    def render(self):
+        """
+        Writes every snapshot for the current project data and removes the ones of deleted projects.
+        Must run inside an app context.
+
+        Returns:
+            int -> The project data version rendered.
+        """
+
+        from app.models import Project
+
+        # La versión se lee antes que los datos: si cambian mientras tanto, el snapshot queda marcado como viejo
+        version = self.current_version()
+        with open(self.template_path, encoding='utf-8') as file:
+            template = file.read()
+        projects = [project.serialize() for project in Project.query.order_by(Project.created_at, Project.id)]
+
+        pages = {
+            'index.html': ('home.html', {'projects': projects}, SITE_NAME, None, None),
+            'projects.html': ('projects.html', {'projects': projects}, f'Proyectos | {SITE_NAME}', None, None),
+        }
+        for project in projects:
+            pages[f"projects/{project['id']}.html"] = (
+                'project.html', {'project': project}, f"{project['title']} | {SITE_NAME}",
+                project['description'], project['image_url'])
+
+        for name, (page, state, title, description, image) in pages.items():
+            head = render_template('prerender/head.html', title=title, description=description, image=image)
+            markup = render_template(f'prerender/{page}', **state)
+            html = inject(template, title, head, markup, {**state, 'version': version}).encode('utf-8')
+            self._write(name, html)
+
+        project_dir = os.path.join(self.directory, 'projects')
+        keep = {str(project['id']) for project in projects}
+        for name in os.listdir(project_dir) if os.path.isdir(project_dir) else ():
+            if not name.startswith('.') and name.split('.', 1)[0] not in keep:
+                os.unlink(os.path.join(project_dir, name))
+
+        write_atomic(os.path.join(self.directory, VERSION_FILE), str(version).encode())
+        return version
+
+    def _write(self, name, html):
+        path = os.path.join(self.directory, name)
+        write_atomic(path, html)
+        for encoding in available_encodings():
+            target = path + SUFFIXES[encoding]
+            encoded = compress(html, encoding) if len(html) >= self.min_size else None
+            if encoded is not None and len(encoded) < len(html):
+                write_atomic(target, encoded)
+            elif os.path.exists(target):
+                os.unlink(target)
+
+    def send(self, path):
+        """
+        Builds the response with the snapshot of an SPA path.
+
+        Receives:
+            path (str): Request path without the leading slash ('' for the home page).
+
+        Returns:
+            Response | None -> The snapshot, or None if the path has none (yet).
+        """
+
+        if not self.enabled:
+            return None
+        name = snapshot_name(path)
+        if name is None:
+            return None
+        # Un snapshot más viejo se sirve igualmente mientras se regenera; uno más nuevo (este worker aún no
+        # ha visto el último evento) no se regenera
+        built = self.built_version()
+        if built is None or built < self.current_version():
+            self.schedule()
+        file_path = os.path.join(self.directory, name)
+        if not os.path.isfile(file_path):
+            return None
+
+        encoding = negotiate([encoding for encoding in available_encodings()
+                              if os.path.isfile(file_path + SUFFIXES[encoding])])
+        response = send_file(file_path + SUFFIXES[encoding] if encoding else file_path,
+                             mimetype='text/html', conditional=True, etag=True, max_age=None)
+        response.headers['Cache-Control'] = 'no-cache'
+        return set_encoding(response, encoding)
@@ -0,0 +1,209 @@
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_ARG = '_profile'
+MODE_HEADER = 'X-Profile-Mode'
+EXTENSIONS = {'cprofile': '.pstats', 'sample': '.collapsed'}
+PROFILE_NAME = re.compile(r'^[\w.-]+\.(pstats|collapsed)$')
+
+
+def _native(module, name):
+    # Con gevent, threading/time están parcheados: el muestreador necesita el hilo y el sleep reales
+    try:
+        from gevent import monkey
+    except ImportError:
+        return getattr(__import__(module), name)
+    return monkey.get_original(module, name)
+
+
+def is_admin(claims):
+    """
+    Returns:
+        bool -> True if the decoded JWT claims belong to an admin token.
+    """
+
+    return claims.get('role') == 'admin'
+
+
+class StackSampler:
+    """
+    Statistical profiler: a native thread records the stack of the request thread
+    every `interval` seconds and aggregates them as collapsed stacks
+    ('outer;inner;leaf count'), the input format of flamegraph.pl and speedscope.
+
+    Under gevent every greenlet of the worker shares the request thread, so samples
+    taken while the request greenlet waits on I/O show whatever greenlet ran instead.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._running = False
+
+    def start(self):
+        self._target = _native('_thread', 'get_ident')()
+        self._running = True
+        self._done = _native('threading', 'Event')()
+        _native('_thread', 'start_new_thread')(self._run, ())
+
+    def _run(self):
+        sleep = _native('time', 'sleep')
+        try:
+            while self._running:
+                frame = sys._current_frames().get(self._target)
+                if frame is not None:
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                        frame = frame.f_back
+                    self.stacks[';'.join(reversed(stack))] += 1
+                sleep(self.interval)
+        finally:
+            self._done.set()
+
+    def stop(self):
+        self._running = False
+        self._done.wait(1)
+
+    def dump(self, path):
+        with open(path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+
+
+class DeterministicProfiler:
+    """cProfile around a single request; the output is a pstats file (snakeviz, flameprof, gprof2dot)."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def dump(self, path):
+        self.profile.dump_stats(path)
+
+
+class RequestProfiler:
+    """
+    Opt-in profiling of single requests in production, gated by an admin JWT.
+
+    A request carrying an admin access token in the X-Profile header (or the _profile
+    query argument) runs under cProfile, or under the stack sampler when X-Profile-Mode
+    is 'sample'. The result is written to PROFILER_DIR, which keeps only the newest
+    PROFILER_MAX_FILES profiles, and its name is returned in the X-Profile-Id header.
+    Only one request per worker is profiled at a time.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PROFILER_ENABLED', True)
+        self.directory = app.config.get('PROFILER_DIR')
+        self.max_files = app.config.get('PROFILER_MAX_FILES', 50)
+        self.sample_interval = app.config.get('PROFILER_SAMPLE_INTERVAL', 0.005)
+        app.extensions['profiler'] = self
+        if not self.enabled or not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        app.before_request(self._start_request)
+        app.after_request(self._end_request)
+        app.teardown_request(self._teardown_request)
+
+    def _authorized(self, token):
+        from flask_jwt_extended import decode_token
+        from app.blacklist import BLACKLIST
+
+        try:
+            claims = decode_token(token)
+        except Exception:
+            return False
+        return is_admin(claims) and not BLACKLIST.is_revoked(claims['jti'])
+
+    def _start_request(self):
+        token = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_ARG)
+        if not token or not self._authorized(token):
+            return
+        mode = request.headers.get(MODE_HEADER, 'cprofile')
+        if mode not in EXTENSIONS:
+            mode = 'cprofile'
+        # cProfile no admite dos perfiles activos a la vez en el mismo hilo
+        if not self._lock.acquire(blocking=False):
+            return
+        profiler = StackSampler(self.sample_interval) if mode == 'sample' else DeterministicProfiler()
+        g.profiler = (profiler, mode, time.time())
+        profiler.start()
+
+    def _finish(self):
+        active = g.pop('profiler', None)
+        if active is None:
+            return None
+        profiler, mode, started = active
+        try:
+            profiler.stop()
+        finally:
+            self._lock.release()
+
+        route = request.url_rule.rule if request.url_rule else request.path
+        slug = re.sub(r'[^\w]+', '-', route).strip('-') or 'root'
+        name = f'{int(started * 1000)}-{os.getpid()}-{request.method}-{slug}{EXTENSIONS[mode]}'
+        try:
+            profiler.dump(os.path.join(self.directory, name))
+            self._trim()
+        except OSError as e:
+            logger.warning("Could not write profile %s: %s", name, e)
+            return None
+        return name
+
+    def _end_request(self, response):
+        name = self._finish()
+        if name:
+            response.headers['X-Profile-Id'] = name
+        return response
+
+    def _teardown_request(self, exc):
+        # Si after_request no llegó a ejecutarse, el perfil se cierra aquí
+        self._finish()
+
+    def _trim(self):
+        profiles = self.list_profiles()
+        for profile in profiles[self.max_files:]:
+            try:
+                os.unlink(os.path.join(self.directory, profile['name']))
+            except FileNotFoundError:
+                pass
+
+    def list_profiles(self):
+        """
+        Returns:
+            list -> [{'name', 'size', 'created_at'}] of the stored profiles, newest first.
+        """
+
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not PROFILE_NAME.match(name):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            profiles.append({'name': name, 'size': stat.st_size, 'created_at': int(name.split('-', 1)[0]) / 1000})
+        return sorted(profiles, key=lambda profile: profile['name'], reverse=True)
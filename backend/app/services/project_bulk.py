@@ -0,0 +1,194 @@
+import json
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import delete, insert, select, text, update
+
+from app import db
+from app.models import Project, ProjectTech, ProjectImage
+from app.exceptions import BadRequestError
+from app.services import search
+from app.services.project_documents import refresh_documents
+from app.services.validation import PROJECT_IMPORT_SCHEMA
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+# Campos de un proyecto en el formato de importación/exportación (valores en bruto, sin URLs absolutas)
+RECORD_FIELDS = ('id', 'title', 'description', 'title_en', 'description_en', 'techs', 'repo_url',
+                 'live_url', 'image_url', 'images', 'main_image_index', 'created_at')
+
+
+def read_rows(request):
+    """
+    Yields the rows of an import request body: NDJSON (read line by line) or a JSON array.
+
+    Returns:
+        generator -> (row number starting at 1, dict | None, error message | None)
+
+    Raises:
+        BadRequestError: If the body is neither NDJSON nor a JSON array.
+    """
+
+    if request.mimetype in NDJSON_MIMETYPES:
+        return _ndjson_rows(request.stream)
+    if request.mimetype == 'application/json':
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise BadRequestError('Request body must be a JSON array of projects.')
+        return ((number, row, None) for number, row in enumerate(data, start=1))
+    raise BadRequestError(f"Request body must be JSON or NDJSON ({', '.join(NDJSON_MIMETYPES)}).")
+
+
+def _ndjson_rows(stream):
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line), None
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {e}'
+
+
+def _parse_record(data):
+    data = PROJECT_IMPORT_SCHEMA.validate(data)
+    return {
+        'id': data.get('id'),
+        'title': data['title'],
+        'description': data['description'],
+        'title_en': data.get('title_en'),
+        'description_en': data.get('description_en'),
+        'repo_url': data.get('repo_url') or "",
+        'live_url': data.get('live_url'),
+        'image_url': data.get('image_url'),
+        'main_image_index': data['main_image_index'],
+        'created_at': data.get('created_at'),
+        'techs': [tech for tech in data['techs'] if tech],
+        'images': [image for image in data.get('images') or [] if image],
+    }
+
+
+def import_projects(rows, batch_size=500):
+    """
+    Creates or updates projects in batches, inside the session transaction.
+
+    Rows are checked with PROJECT_IMPORT_SCHEMA. Rows with an 'id' that already exists update that project; the rest are inserted
+    (keeping the given id, if any). Every batch is written with one executemany per
+    table and statement kind, and the search index and the stored project documents are
+    refreshed once per batch.
+    Invalid rows are skipped and reported. The caller commits.
+
+    Receives:
+        rows (iterable): (row number, dict | None, error message | None), as yielded by read_rows().
+        batch_size (int): Rows per batch.
+
+    Returns:
+        dict -> {'created': int, 'updated': int, 'errors': [{'row', 'error'}]}
+    """
+
+    summary = {'created': 0, 'updated': 0, 'errors': []}
+    seen_ids = set()
+    batch = []
+    for number, data, error in rows:
+        if error is None:
+            try:
+                record = _parse_record(data)
+                if record['id'] is not None:
+                    if record['id'] in seen_ids:
+                        raise BadRequestError(f"Duplicate id {record['id']} in the import.")
+                    seen_ids.add(record['id'])
+                batch.append(record)
+            except BadRequestError as e:
+                error = str(e)
+        if error is not None:
+            summary['errors'].append({'row': number, 'error': error})
+        if len(batch) >= batch_size:
+            _write_batch(batch, summary)
+            batch = []
+    if batch:
+        _write_batch(batch, summary)
+
+    # En Postgres insertar ids explícitos no avanza la secuencia: se ajusta para los siguientes INSERT
+    if seen_ids and db.engine.dialect.name == 'postgresql':
+        db.session.execute(text(
+            "SELECT setval(pg_get_serial_sequence('project', 'id'), (SELECT max(id) FROM project))"))
+    return summary
+
+
+def _write_batch(batch, summary):
+    now = datetime.utcnow()
+    given_ids = [record['id'] for record in batch if record['id'] is not None]
+    existing = set(db.session.scalars(select(Project.id).where(Project.id.in_(given_ids)))) if given_ids else set()
+
+    def columns(record):
+        values = {key: value for key, value in record.items() if key not in ('techs', 'images', 'created_at')}
+        values['updated_at'] = now
+        return values
+
+    # En las actualizaciones created_at solo se toca si la fila lo trae
+    updates = [{**columns(record), **({'created_at': record['created_at']} if record['created_at'] else {})}
+               for record in batch if record['id'] in existing]
+    inserts_with_id = [{**columns(record), 'created_at': record['created_at'] or now}
+                       for record in batch if record['id'] is not None and record['id'] not in existing]
+    new_records = [record for record in batch if record['id'] is None]
+
+    if updates:
+        db.session.execute(update(Project), updates)
+        db.session.execute(delete(ProjectTech).where(ProjectTech.project_id.in_(list(existing))))
+        db.session.execute(delete(ProjectImage).where(ProjectImage.project_id.in_(list(existing))))
+    if inserts_with_id:
+        db.session.execute(insert(Project), inserts_with_id)
+    if new_records:
+        values = []
+        for record in new_records:
+            row = {**columns(record), 'created_at': record['created_at'] or now}
+            del row['id']
+            values.append(row)
+        new_ids = db.session.scalars(insert(Project).returning(Project.id, sort_by_parameter_order=True), values).all()
+        for record, project_id in zip(new_records, new_ids):
+            record['id'] = project_id
+
+    techs = [{'project_id': record['id'], 'name': name, 'position': i}
+             for record in batch for i, name in enumerate(record['techs'])]
+    images = [{'project_id': record['id'], 'url': url, 'position': i}
+              for record in batch for i, url in enumerate(record['images'])]
+    if techs:
+        db.session.execute(insert(ProjectTech), techs)
+    if images:
+        db.session.execute(insert(ProjectImage), images)
+
+    batch_ids = [record['id'] for record in batch]
+    search.index_projects(batch_ids)
+    refresh_documents(batch_ids)
+    summary['updated'] += len(updates)
+    summary['created'] += len(batch) - len(updates)
+
+
+def export_record(project):
+    """
+    Returns:
+        dict -> The project in the import format, with stored (not absolute) URLs.
+    """
+
+    record = {field: getattr(project, field) for field in RECORD_FIELDS}
+    record['created_at'] = project.created_at.isoformat() if project.created_at else None
+    return record
+
+
+def export_ndjson(batch_size=500):
+    """
+    Yields every project as NDJSON, reading them through a server-side cursor.
+
+    Projects are fetched `batch_size` at a time (yield_per, with their techs and images
+    loaded per batch) and dropped from the session once written, so memory use does not
+    grow with the table.
+
+    Returns:
+        generator -> bytes, one chunk of NDJSON lines per batch.
+    """
+
+    statement = select(Project).order_by(Project.id).execution_options(yield_per=batch_size)
+    for partition in db.session.scalars(statement).partitions():
+        lines = [current_app.json.dumps(export_record(project)) for project in partition]
+        for project in partition:
+            db.session.expunge(project)
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
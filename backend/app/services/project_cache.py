@@ -0,0 +1,182 @@
+import time
+
+from app.services.compression import compress
+from app.services.store import create_store
+
+# La versión es el id del último project_event: otra clave que la de los contadores con marca de tiempo anteriores
+VERSION_KEY = "projects:event_version"
+LAST_MODIFIED_KEY = "projects:last_modified"
+
+
+class ProjectCache:
+    """
+    Caches pre-encoded JSON bodies of the project read endpoints.
+
+    Every entry is keyed by the current project data version, so bumping the
+    version after a write makes every cached body unreachable at once.
+
+    With a version source (ChangeFeed.latest_id, the id of the last project_event
+    row) the version is the same number in every worker whatever the backend: the
+    writing worker reads it in bump(), and the others move to it with advance()
+    when their change feed poller sees the event. Without one, bump() increments a
+    counter in the store, which only a shared backend (redis) makes global.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        self.ttl = None
+        self.version_source = None
+        self._subscribers = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # Si el LRU expulsara la versión o la fecha de la última escritura, las revalidaciones podrían dar 304 obsoletos
+        self.store = create_store(app.config, pinned=(VERSION_KEY, LAST_MODIFIED_KEY))
+        self.ttl = app.config.get("CACHE_DEFAULT_TTL")
+        # Los suscriptores se registran en el init_app de cada extensión: una app nueva empieza sin los de la anterior
+        self.version_source = None
+        self._subscribers = []
+        app.extensions["project_cache"] = self
+
+    def version(self):
+        """
+        Returns the current project data version.
+
+        An empty store is seeded from the version source, or else with a
+        millisecond timestamp instead of 0 so that versions (and the ETags built
+        from them) are never reused after a restart or a flushed store.
+        """
+
+        version = self.store.get(VERSION_KEY)
+        if version is None:
+            seed = self.version_source() if self.version_source is not None else int(time.time() * 1000)
+            return self.seed_version(seed)
+        return int(version)
+
+    def seed_version(self, seed):
+        """
+        Stores `seed` as the version of an empty store, unless another worker stored one first.
+
+        Returns:
+            int -> The version in effect.
+        """
+
+        self.store.add(VERSION_KEY, seed)
+        return int(self.store.get(VERSION_KEY))
+
+    def stored_state(self):
+        """
+        Returns:
+            tuple -> (version, last modified timestamp) as they are in the store, None for
+            a missing one. Unlike version() and last_modified(), never queries the database.
+        """
+
+        version = self.store.get(VERSION_KEY)
+        last_modified = self.store.get(LAST_MODIFIED_KEY)
+        return (int(version) if version is not None else None,
+                int(last_modified) if last_modified is not None else None)
+
+    def advance(self, version, modified_at):
+        """
+        Moves to a newer version committed by another worker. Unlike bump(), runs no subscribers.
+
+        Receives:
+            version (int): The version seen in the database.
+            modified_at (float): Unix timestamp of that change, for Last-Modified.
+
+        Returns:
+            bool -> True if the version was older and has been replaced.
+        """
+
+        current = self.store.get(VERSION_KEY)
+        if current is not None and int(current) >= version:
+            return False
+        self.store.set(LAST_MODIFIED_KEY, int(modified_at))
+        self.store.set(VERSION_KEY, version)
+        return True
+
+    def bump(self):
+        """
+        Invalidates every cached project body.
+
+        Returns:
+            int -> The new project data version.
+        """
+
+        self.store.set(LAST_MODIFIED_KEY, int(time.time()))
+        if self.version_source is not None:
+            # Se lee después del commit: es el id del evento que acaba de escribir esta petición (o uno posterior)
+            version = self.version_source()
+            self.store.set(VERSION_KEY, version)
+        else:
+            self.version()
+            version = self.store.incr(VERSION_KEY)
+        for callback in self._subscribers:
+            callback()
+        return version
+
+    def subscribe(self, callback):
+        """
+        Registers a callable run after every bump() of this process, e.g. to rebuild derived data.
+        It runs in the writing request, so it must only schedule work or run a cheap query.
+        """
+
+        self._subscribers.append(callback)
+
+    def last_modified(self, loader):
+        """
+        Returns the time of the last project write as a unix timestamp.
+
+        Receives:
+            loader (callable): Returns the timestamp from the database, used only when the store has none.
+
+        Returns:
+            int | None -> Seconds since the epoch, or None if there are no projects.
+        """
+
+        value = self.store.get(LAST_MODIFIED_KEY)
+        if value is None:
+            value = loader()
+            if value is None:
+                return None
+            self.store.add(LAST_MODIFIED_KEY, int(value))
+        return int(value)
+
+    def peek(self, name, encoding=None, version=None):
+        """
+        Returns:
+            bytes | None -> The cached body for `name` at the current version (or `version`), without building it.
+        """
+
+        key = f"projects:{self.version() if version is None else version}:{name}"
+        return self.store.get(f"{key}:{encoding}" if encoding else key)
+
+    def _get_or_set(self, key, builder):
+        body = self.store.get(key)
+        if body is None:
+            body = builder()
+            self.store.set(key, body, ttl=self.ttl)
+        return body
+
+    def get_or_build(self, name, builder, encoding=None, version=None):
+        """
+        Returns the cached body for `name` at the current version, building it on a miss.
+
+        Compressed bodies are cached next to the plain one, so each version is
+        compressed once per encoding instead of once per request.
+
+        Receives:
+            name (str): Cache entry name, e.g. 'list' or 'detail:3'.
+            builder (callable): Returns the encoded body as bytes.
+            encoding (str | None): Content coding to return ('br', 'gzip'), or None for the plain body.
+            version (int | None): Version already read for this request; the current one when None.
+
+        Returns:
+            bytes -> The encoded response body.
+        """
+
+        key = f"projects:{self.version() if version is None else version}:{name}"
+        if encoding:
+            return self._get_or_set(f"{key}:{encoding}", lambda: compress(self._get_or_set(key, builder), encoding))
+        return self._get_or_set(key, builder)
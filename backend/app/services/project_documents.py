@@ -0,0 +1,160 @@
+from flask import current_app
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import Project, ProjectDocument, ProjectImage
+
+BATCH_SIZE = 500
+
+
+def build_body(project):
+    """
+    Returns:
+        str -> The JSON document of a project, exactly as the read endpoints send it.
+    """
+
+    return current_app.json.dumps(project.serialize())
+
+
+def write_documents(projects):
+    """
+    Stores the JSON documents of some loaded projects with one upsert statement, inside
+    the session transaction. Must run after their changes are flushed; the caller commits.
+
+    Receives:
+        projects (list): Project objects.
+
+    Returns:
+        int -> Documents written.
+    """
+
+    if not projects:
+        return 0
+    base_url = current_app.config['BASE_URL']
+    rows = [{'project_id': project.id, 'base_url': base_url, 'body': build_body(project)} for project in projects]
+    dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+    statement = dialect.insert(ProjectDocument)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[ProjectDocument.project_id],
+        set_={'base_url': statement.excluded.base_url, 'body': statement.excluded.body},
+    ), rows)
+    return len(rows)
+
+
+def refresh_documents(project_ids=None):
+    """
+    Rebuilds the stored JSON documents of some projects, inside the session transaction.
+
+    Must run after the project changes are flushed; the caller commits. Projects are
+    read and written (write_documents()) in batches of BATCH_SIZE.
+
+    Receives:
+        project_ids (iterable | None): Ids of the projects to rebuild, or None for all of them.
+
+    Returns:
+        int -> Documents written.
+    """
+
+    statement = select(Project).order_by(Project.id)
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return 0
+        statement = statement.where(Project.id.in_(project_ids))
+
+    written = 0
+    for partition in db.session.scalars(statement.execution_options(yield_per=BATCH_SIZE)).partitions():
+        written += write_documents(partition)
+    return written
+
+
+def stale_ids():
+    """
+    Returns:
+        list -> Ids of the projects with no document, or with one built for another BASE_URL.
+    """
+
+    statement = (
+        select(Project.id)
+        .outerjoin(ProjectDocument, ProjectDocument.project_id == Project.id)
+        .where(or_(ProjectDocument.body.is_(None), ProjectDocument.base_url != current_app.config['BASE_URL']))
+    )
+    return list(db.session.scalars(statement))
+
+
+def ids_using_upload(filename):
+    """
+    Returns:
+        list -> Ids of the projects whose image_url or images point at an uploaded file
+        (relative or absolute URL), i.e. whose document lists its variants.
+    """
+
+    suffix = '/static/uploads/' + filename
+    main = select(Project.id).where(Project.image_url.endswith(suffix, autoescape=True))
+    gallery = select(ProjectImage.project_id).where(ProjectImage.url.endswith(suffix, autoescape=True))
+    return sorted(set(db.session.scalars(main)) | set(db.session.scalars(gallery)))
+
+
+def with_documents(statement):
+    """
+    Turns a select over Project (filters, order and limit included) into one that reads
+    only id, created_at and the stored document of each project.
+
+    Returns:
+        Select -> Rows with id, created_at, body and base_url (body is None if the project has no document).
+    """
+
+    return statement.with_only_columns(
+        Project.id, Project.created_at, ProjectDocument.body, ProjectDocument.base_url,
+    ).outerjoin(ProjectDocument, ProjectDocument.project_id == Project.id)
+
+
+def missing_ids(rows):
+    """
+    Returns:
+        list -> Ids of the rows of with_documents() whose document is missing or stale.
+    """
+
+    base_url = current_app.config['BASE_URL']
+    return [row.id for row in rows if row.body is None or row.base_url != base_url]
+
+
+def bodies(rows, projects=()):
+    """
+    Returns the JSON documents of the rows of with_documents(), in order.
+
+    Receives:
+        rows (list): Rows of with_documents().
+        projects (iterable): The Project objects of missing_ids(rows); they are serialized
+            on the fly until their document is rebuilt.
+
+    Returns:
+        list -> JSON strings.
+    """
+
+    built = {project.id: build_body(project) for project in projects}
+    if not built:
+        return [row.body for row in rows]
+    return [built.get(row.id, row.body) for row in rows]
+
+
+def load_bodies(rows):
+    """Sync shortcut of bodies(): loads the projects with a missing or stale document itself."""
+    ids = missing_ids(rows)
+    projects = db.session.scalars(select(Project).where(Project.id.in_(ids))).all() if ids else ()
+    return bodies(rows, projects)
+
+
+def join_bodies(documents):
+    """
+    Returns:
+        bytes -> A JSON array of already serialized documents.
+    """
+
+    return ('[' + ','.join(documents) + ']').encode('utf-8')
+
+
+def remove_document(project_id):
+    # Explícito además del ON DELETE CASCADE: SQLite no aplica claves foráneas por defecto
+    db.session.execute(delete(ProjectDocument).where(ProjectDocument.project_id == project_id))
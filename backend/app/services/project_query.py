@@ -0,0 +1,194 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import load_only, noload
+
+from app import db
+from app.models import Project, ProjectTech, PROJECT_FIELD_COLUMNS
+from app.exceptions import BadRequestError
+from app.services.project_documents import join_bodies, load_bodies, with_documents
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+LISTING_PARAMS = ('limit', 'cursor', 'fields', 'tech', 'from', 'to')
+
+
+def encode_cursor(project):
+    raw = f"{project.created_at.isoformat()}|{project.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, project_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(project_id)
+    except (ValueError, UnicodeError):
+        raise BadRequestError("Invalid cursor.")
+
+
+def parse_date(value, name):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise BadRequestError(f"Invalid date for '{name}', use ISO 8601 (YYYY-MM-DD).")
+    # created_at se guarda como UTC sin zona horaria
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_date_to(value):
+    # 'to' es inclusivo: una fecha sin hora cubre el día completo
+    parsed = parse_date(value, 'to')
+    return parsed + (timedelta(days=1) if len(value) == 10 else timedelta(microseconds=1))
+
+
+def parse_listing_args(args):
+    """
+    Validates the query string of the project listing.
+
+    Receives:
+        args (MultiDict): request.args
+
+    Returns:
+        dict -> limit, cursor, fields, techs, date_from and date_to (None when not given).
+            date_to is an exclusive upper bound.
+
+    Raises:
+        BadRequestError: If a parameter has an invalid value.
+    """
+
+    limit = args.get('limit')
+    if limit is not None:
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+            raise BadRequestError(f"'limit' must be an integer between 1 and {MAX_PAGE_SIZE}.")
+        limit = int(limit)
+    elif args.get('cursor'):
+        limit = DEFAULT_PAGE_SIZE
+
+    fields = None
+    if args.get('fields'):
+        fields = [field.strip() for field in args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in PROJECT_FIELD_COLUMNS]
+        if unknown:
+            raise BadRequestError(f"Unknown fields: {', '.join(unknown)}")
+
+    techs = [tech.strip() for value in args.getlist('tech') for tech in value.split(',') if tech.strip()]
+
+    return {
+        'limit': limit,
+        'cursor': decode_cursor(args['cursor']) if args.get('cursor') else None,
+        'fields': fields,
+        'techs': techs,
+        'date_from': parse_date(args['from'], 'from') if args.get('from') else None,
+        'date_to': parse_date_to(args['to']) if args.get('to') else None,
+    }
+
+
+def project_ids_for_tech(name):
+    """
+    Subquery with the ids of the projects that use a tech, resolved on ix_project_tech_name_project_id.
+    """
+
+    return select(ProjectTech.project_id).where(ProjectTech.name == name)
+
+
+def projects_by_tech(name):
+    """
+    Returns the projects that use a tech, ordered by (created_at, id).
+    """
+
+    return Project.query.filter(Project.id.in_(project_ids_for_tech(name))).order_by(Project.created_at, Project.id).all()
+
+
+def listing_statement(limit=None, cursor=None, fields=None, techs=(), date_from=None, date_to=None):
+    """
+    Builds the keyset-paginated, projected and filtered select over projects ordered by (created_at, id).
+
+    It does not depend on the session, so the sync views and the async read path share it.
+    With a limit, one extra row is selected to know whether there is a next page.
+
+    Returns:
+        Select -> The statement, to run with session.scalars().
+    """
+
+    statement = select(Project)
+    if fields is not None:
+        # created_at e id siempre se leen porque forman el cursor
+        columns = {'id', 'created_at'}
+        for field in fields:
+            columns.update(PROJECT_FIELD_COLUMNS[field])
+        relationships = {'project_techs', 'project_images'}
+        statement = statement.options(
+            load_only(*[getattr(Project, column) for column in columns - relationships]),
+            *[noload(getattr(Project, name)) for name in relationships - columns],
+        )
+
+    for tech in techs:
+        statement = statement.where(Project.id.in_(project_ids_for_tech(tech)))
+    if date_from:
+        statement = statement.where(Project.created_at >= date_from)
+    if date_to:
+        statement = statement.where(Project.created_at < date_to)
+    if cursor:
+        created_at, project_id = cursor
+        statement = statement.where(or_(
+            Project.created_at > created_at,
+            and_(Project.created_at == created_at, Project.id > project_id),
+        ))
+
+    statement = statement.order_by(Project.created_at, Project.id)
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    return statement
+
+
+def serialize_page(projects, limit=None, fields=None):
+    """
+    Returns:
+        tuple -> (list of serialized projects, next cursor or None) for the rows of listing_statement().
+    """
+
+    page, next_cursor = split_page(projects, limit)
+    return [project.serialize(fields) for project in page], next_cursor
+
+
+def list_projects(limit=None, cursor=None, fields=None, techs=(), date_from=None, date_to=None):
+    """
+    Runs a keyset-paginated, projected and filtered query over projects ordered by (created_at, id).
+
+    Returns:
+        tuple -> (list of serialized projects, next cursor or None)
+    """
+
+    statement = listing_statement(limit, cursor, fields, techs, date_from, date_to)
+    projects = db.session.scalars(statement).all()
+    return serialize_page(projects, limit, fields)
+
+
+def split_page(rows, limit=None):
+    """
+    Returns:
+        tuple -> (rows of the page, next cursor or None) for the rows of listing_statement() or of
+            with_documents(listing_statement()), which carry one extra row when there is a next page.
+    """
+
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    return rows[:limit], encode_cursor(rows[limit - 1])
+
+
+def list_project_documents(limit=None, cursor=None, techs=(), date_from=None, date_to=None):
+    """
+    Like list_projects() without projection, but the page is made of the stored project
+    documents (project_documents.py) joined as they are, without serializing each project.
+
+    Returns:
+        tuple -> (JSON array as bytes, next cursor or None)
+    """
+
+    statement = with_documents(listing_statement(limit, cursor, None, techs, date_from, date_to))
+    rows, next_cursor = split_page(db.session.execute(statement).all(), limit)
+    return join_bodies(load_bodies(rows)), next_cursor
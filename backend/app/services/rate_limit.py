@@ -0,0 +1,113 @@
+import logging
+import math
+import time
+from functools import wraps
+
+from flask import request, jsonify
+
+from app.services.store import MemoryStore, create_store
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limiter for the login endpoints.
+
+    Counters live in the shared store (CACHE_BACKEND) so limits apply across every
+    gunicorn worker. If the shared store fails, a per-process MemoryStore takes over
+    so logins keep being limited. The window is approximated with two fixed windows:
+    the previous one is weighted by how much of it still overlaps the sliding window.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RATELIMIT_ENABLED', True)
+        self.limits = app.config.get('RATELIMIT_LOGIN', {})
+        self.proxy_count = app.config.get('RATELIMIT_PROXY_COUNT', 0)
+        self.store = create_store(app.config)
+        self.fallback = MemoryStore(max_entries=app.config.get('RATELIMIT_MAX_KEYS', 10000))
+        app.extensions['rate_limiter'] = self
+
+    def _incr(self, key, ttl):
+        try:
+            return self.store.incr(key, ttl=ttl)
+        except Exception as e:
+            logger.warning("Rate limit store unavailable, using in-memory fallback: %s", e)
+            return self.fallback.incr(key, ttl=ttl)
+
+    def _get(self, key):
+        try:
+            return self.store.get(key)
+        except Exception:
+            return self.fallback.get(key)
+
+    def hit(self, key, limit, window):
+        """
+        Counts one request for `key` and checks it against `limit` requests per `window` seconds.
+
+        Returns:
+            int | None -> Seconds to wait when the limit is exceeded, otherwise None.
+        """
+
+        now = time.time()
+        index = int(now // window)
+        elapsed = now - index * window
+        current = self._incr(f'rl:{key}:{index}', ttl=window * 2)
+        previous = int(self._get(f'rl:{key}:{index - 1}') or 0)
+        estimated = previous * (window - elapsed) / window + current
+        if estimated <= limit:
+            return None
+        return max(1, math.ceil(window - elapsed))
+
+    def client_ip(self):
+        # Detrás de N proxies de confianza la IP real es la N-ésima desde el final de X-Forwarded-For
+        route = request.access_route
+        if self.proxy_count and len(route) >= self.proxy_count:
+            return route[-self.proxy_count]
+        return request.remote_addr
+
+    def limit_login(self, scope, username_field):
+        """
+        Decorator that limits a login view per client IP and per submitted username.
+
+        Runs before the view, so rejected attempts never reach the database or bcrypt.
+
+        Receives:
+            scope (str): Key of RATELIMIT_LOGIN with the limits for this blueprint.
+            username_field (str): JSON field holding the username.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                limits = self.limits.get(scope, {})
+                if not self.enabled or not limits:
+                    return view(*args, **kwargs)
+
+                data = request.get_json(silent=True)
+                # Un cuerpo JSON que no es un objeto (lista, cadena) cuenta como intento sin username
+                data = data if isinstance(data, dict) else {}
+                username = str(data.get(username_field) or '').strip().lower()
+                checks = [('ip', self.client_ip())]
+                if username:
+                    checks.append(('username', username))
+
+                retry_after = None
+                for kind, value in checks:
+                    if kind not in limits:
+                        continue
+                    limit, window = limits[kind]
+                    wait = self.hit(f'{scope}:{kind}:{value}', limit, window)
+                    if wait:
+                        retry_after = max(retry_after or 0, wait)
+
+                if retry_after:
+                    return jsonify({'error': 'Too many login attempts, please try again later.'}), 429, {
+                        'Retry-After': str(retry_after)}
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
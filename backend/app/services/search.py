@@ -0,0 +1,175 @@
+import re
+import weakref
+
+from sqlalchemy import bindparam, inspect, select, text
+
+from app import db
+from app.models import Project
+from app.exceptions import BadRequestError
+from app.services.project_documents import load_bodies, with_documents
+
+# Tablas del índice de búsqueda; se gestionan aquí y no desde los modelos
+SEARCH_TABLES = ('project_search', 'project_fts')
+MAX_RESULTS = 50
+
+# PostgreSQL: tsvector precalculado por proyecto con índice GIN.
+# Títulos pesan más que descripciones; el contenido en inglés se analiza con el diccionario inglés.
+PG_DOCUMENT = """
+    setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('spanish', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(title_en, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description_en, '')), 'B')
+"""
+PG_CREATE = (
+    """CREATE TABLE IF NOT EXISTS project_search (
+        project_id INTEGER PRIMARY KEY REFERENCES project (id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_project_search_document ON project_search USING GIN (document)",
+)
+PG_UPSERT = f"""
+    INSERT INTO project_search (project_id, document)
+    SELECT id, {PG_DOCUMENT} FROM project WHERE {{where}}
+    ON CONFLICT (project_id) DO UPDATE SET document = EXCLUDED.document
+"""
+PG_DELETE = "DELETE FROM project_search WHERE project_id = :id"
+PG_SEARCH = """
+    SELECT project_id, ts_rank(document, query) AS rank
+    FROM project_search,
+         websearch_to_tsquery('spanish', :q) || websearch_to_tsquery('english', :q) AS query
+    WHERE document @@ query
+    ORDER BY rank DESC, project_id
+    LIMIT :limit
+"""
+
+# SQLite: tabla FTS5 cuyo rowid es el id del proyecto; OR REPLACE sustituye la entrada anterior en la misma sentencia
+SQLITE_CREATE = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS project_fts USING fts5(
+        title, description, title_en, description_en,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+)
+SQLITE_UPSERT = """
+    INSERT OR REPLACE INTO project_fts (rowid, title, description, title_en, description_en)
+    SELECT id, title, description, coalesce(title_en, ''), coalesce(description_en, '')
+    FROM project WHERE {where}
+"""
+SQLITE_DELETE = "DELETE FROM project_fts WHERE rowid = :id"
+SQLITE_SEARCH = """
+    SELECT rowid, bm25(project_fts, 10.0, 1.0, 10.0, 1.0) AS rank
+    FROM project_fts
+    WHERE project_fts MATCH :q
+    ORDER BY rank, rowid
+    LIMIT :limit
+"""
+
+_ready_engines = weakref.WeakSet()
+
+
+def include_name(name, type_, parent_names):
+    """Keeps the search index tables out of Alembic autogenerate (Migrate include_name hook)."""
+    if type_ == 'table':
+        return not name.startswith(SEARCH_TABLES)
+    return True
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def ensure_search_index():
+    """
+    Creates and fills the search index if the current database does not have it yet.
+
+    Migrations create it for deployed databases; this covers databases built with
+    db.create_all(), such as TestingConfig or a fresh development SQLite file. It commits,
+    so it must be called before the request makes any change in the session.
+    """
+
+    if db.engine in _ready_engines:
+        return
+    postgres = _dialect() == 'postgresql'
+    if not inspect(db.engine).has_table('project_search' if postgres else 'project_fts'):
+        for statement in PG_CREATE if postgres else SQLITE_CREATE:
+            db.session.execute(text(statement))
+        rebuild_search_index()
+        db.session.commit()
+    _ready_engines.add(db.engine)
+
+
+def rebuild_search_index():
+    if _dialect() == 'postgresql':
+        db.session.execute(text(PG_UPSERT.format(where='true')))
+    else:
+        db.session.execute(text("DELETE FROM project_fts"))
+        db.session.execute(text(SQLITE_UPSERT.format(where='1 = 1')))
+
+
+def index_project(project_id):
+    """
+    Updates the index entry of one project from its current row, in the session transaction,
+    with a single upsert statement.
+
+    Must be called after the project changes were flushed.
+    """
+
+    upsert = PG_UPSERT if _dialect() == 'postgresql' else SQLITE_UPSERT
+    db.session.execute(text(upsert.format(where='id = :id')), {'id': project_id})
+
+
+def index_projects(project_ids):
+    """
+    Bulk version of index_project: refreshes the entries of many projects with one upsert statement.
+    """
+
+    if not project_ids:
+        return
+    upsert = PG_UPSERT if _dialect() == 'postgresql' else SQLITE_UPSERT
+    ids = bindparam('ids', expanding=True)
+    db.session.execute(text(upsert.format(where='id IN :ids')).bindparams(ids), {'ids': list(project_ids)})
+
+
+def remove_project(project_id):
+    statement = PG_DELETE if _dialect() == 'postgresql' else SQLITE_DELETE
+    db.session.execute(text(statement), {'id': project_id})
+
+
+def fts5_query(q):
+    # Cada palabra se cita para que la entrada del usuario no se interprete como sintaxis FTS5
+    words = re.findall(r'\w+', q)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_projects(q, limit=20):
+    """
+    Ranks projects by title, description, title_en and description_en.
+
+    Receives:
+        q (str): Free text query.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list -> JSON documents of the projects (project_documents.py), best match first.
+
+    Raises:
+        BadRequestError: If the query is empty or the limit is out of range.
+    """
+
+    if not q or not q.strip():
+        raise BadRequestError("The 'q' parameter is required.")
+    if not 1 <= limit <= MAX_RESULTS:
+        raise BadRequestError(f"'limit' must be between 1 and {MAX_RESULTS}.")
+
+    ensure_search_index()
+    if _dialect() == 'postgresql':
+        rows = db.session.execute(text(PG_SEARCH), {'q': q, 'limit': limit}).all()
+    else:
+        match = fts5_query(q)
+        if not match:
+            return []
+        rows = db.session.execute(text(SQLITE_SEARCH), {'q': match, 'limit': limit}).all()
+
+    ids = [row[0] for row in rows]
+    found = {row.id: row for row in db.session.execute(with_documents(select(Project).where(Project.id.in_(ids))))}
+    ranked = [found[project_id] for project_id in ids if project_id in found]
+    return load_bodies(ranked)
@@ -0,0 +1,130 @@
+import mimetypes
+import os
+import re
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from flask import current_app, request
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+
+from app.services.compression import SUFFIXES, is_compressible, negotiate, precompress_file, set_encoding
+
+FileInfo = namedtuple('FileInfo', 'path size mtime etag mimetype immutable encodings')
+
+# Subidas direccionadas por contenido (<sha256>.<ext> y sus variantes) y assets de Vite (<nombre>-<hash>.<ext>)
+CONTENT_ADDRESSED = re.compile(r'^(?P<hash>[0-9a-f]{64})(_\d+w)?\.\w+$')
+VITE_ASSET = re.compile(r'^assets/.+-(?P<hash>[A-Za-z0-9_-]{8,})\.\w+$')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+class StaticFiles:
+    """
+    In-memory manifest of a directory of static files, built once at startup.
+
+    Lookups never touch the filesystem for files that were present at startup. Each
+    entry carries a precomputed ETag: the content hash for content-addressed uploads
+    and hashed Vite assets (which are also sent as immutable), and size/mtime for the
+    rest. Responses support conditional GET and Range, and hand the open file to the
+    server's wsgi.file_wrapper so gunicorn can use sendfile().
+
+    With `precompress`, compressible files get `.br`/`.gz` siblings during the scan
+    (unless the build already wrote them) and the best one the client accepts is sent.
+    """
+
+    def __init__(self, directory, stat_misses=False, precompress=False, min_size=1024):
+        self.directory = directory
+        # Las subidas cambian en caliente (otros workers incluidos): en ese caso un fallo se comprueba en disco
+        self.stat_misses = stat_misses
+        self.precompress = precompress
+        self.min_size = min_size
+        self.files = {}
+        self._lock = threading.Lock()
+        self.scan()
+
+    def scan(self):
+        files = {}
+        if os.path.isdir(self.directory):
+            for root, _, names in os.walk(self.directory):
+                for name in names:
+                    if name.startswith('.') or name.endswith(tuple(SUFFIXES.values())):
+                        continue
+                    path = os.path.join(root, name)
+                    relative = os.path.relpath(path, self.directory).replace(os.sep, '/')
+                    files[relative] = self._info(relative, path)
+        self.files = files
+
+    def _info(self, relative, path):
+        stat = os.stat(path)
+        match = CONTENT_ADDRESSED.match(relative) or VITE_ASSET.match(relative)
+        if match:
+            etag = f"{match.group('hash')}{os.path.splitext(relative)[1]}"
+        else:
+            etag = f'{int(stat.st_mtime):x}-{stat.st_size:x}'
+        mimetype = mimetypes.guess_type(relative)[0] or 'application/octet-stream'
+
+        encodings = {}
+        if is_compressible(mimetype):
+            if self.precompress:
+                siblings = precompress_file(path, self.min_size)
+            else:
+                siblings = {encoding: path + suffix for encoding, suffix in SUFFIXES.items()
+                            if os.path.isfile(path + suffix)}
+            for encoding, sibling in siblings.items():
+                # Cada representación necesita su propio ETag fuerte
+                encodings[encoding] = (sibling, os.path.getsize(sibling), f'{etag}-{encoding}')
+        return FileInfo(path, stat.st_size, int(stat.st_mtime), etag, mimetype, bool(match), encodings)
+
+    def get(self, relative):
+        """
+        Returns:
+            FileInfo | None -> The manifest entry for a relative path, if the file exists.
+        """
+
+        info = self.files.get(relative)
+        if info is not None or not self.stat_misses:
+            return info
+        # Lo mismo que omite scan(): temporales ocultos (.upload-*, .metrics-*) y variantes comprimidas
+        if any(part.startswith('.') for part in relative.split('/')) or relative.endswith(tuple(SUFFIXES.values())):
+            return None
+        path = safe_join(self.directory, relative)
+        if path is None or not os.path.isfile(path):
+            return None
+        info = self._info(relative, path)
+        with self._lock:
+            self.files[relative] = info
+        return info
+
+    def send(self, info):
+        """
+        Builds the response for a manifest entry.
+
+        Raises:
+            RequestedRangeNotSatisfiable: If the Range header cannot be satisfied.
+        """
+
+        path, size, etag = info.path, info.size, info.etag
+        encoding = negotiate(info.encodings) if info.encodings else None
+        if encoding:
+            path, size, etag = info.encodings[encoding]
+
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            with self._lock:
+                self.files = {key: value for key, value in self.files.items() if value is not info}
+            return None
+
+        response = current_app.response_class(
+            wrap_file(request.environ, file), mimetype=info.mimetype, direct_passthrough=True)
+        response.content_length = size
+        response.last_modified = datetime.fromtimestamp(info.mtime, tz=timezone.utc)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = IMMUTABLE if info.immutable else REVALIDATE
+        response.headers['Accept-Ranges'] = 'bytes'
+        if info.encodings:
+            set_encoding(response, encoding)
+        return response.make_conditional(request.environ, accept_ranges=True, complete_length=size)
@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryStore:
+    """
+    Per-process key/value store with LRU eviction and optional per-key TTL.
+    Keys in `pinned` (e.g. a data version) are never evicted, only replaced or deleted.
+
+    Only visible to the worker that owns it, so it is meant for development,
+    tests and single-worker deployments. Use RedisStore when several gunicorn
+    workers must share the same state.
+    """
+
+    def __init__(self, max_entries=1024, pinned=()):
+        self.max_entries = max_entries
+        self.pinned = frozenset(pinned)
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _expired(self, key, now):
+        value, expires_at = self._data[key]
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return True
+        return False
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data or self._expired(key, time.monotonic()):
+                return None
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                oldest = next((k for k in self._data if k not in self.pinned), None)
+                if oldest is None:
+                    break
+                del self._data[oldest]
+
+    def add(self, key, value, ttl=None):
+        """Sets `key` only if it is missing. Returns True when the value was stored."""
+        with self._lock:
+            if key in self._data and not self._expired(key, time.monotonic()):
+                return False
+            self.set(key, value, ttl=ttl)
+            return True
+
+    def incr(self, key, amount=1, ttl=None):
+        with self._lock:
+            now = time.monotonic()
+            if key in self._data and not self._expired(key, now):
+                value, expires_at = self._data[key]
+            else:
+                value, expires_at = 0, (now + ttl if ttl else None)
+            value += amount
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisStore:
+    """
+    Key/value store shared by every worker through Redis.
+
+    Values are stored as raw bytes; counters use INCRBY so that concurrent
+    workers never lose an update.
+    """
+
+    def __init__(self, url, prefix="portfolio:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The 'redis' package is required for the redis cache backend.") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def add(self, key, value, ttl=None):
+        return bool(self.client.set(self.prefix + key, value, ex=ttl, nx=True))
+
+    def incr(self, key, amount=1, ttl=None):
+        pipe = self.client.pipeline()
+        if ttl:
+            pipe.set(self.prefix + key, 0, ex=ttl, nx=True)
+        pipe.incrby(self.prefix + key, amount)
+        return pipe.execute()[-1]
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+def create_store(config, pinned=()):
+    """
+    Builds the key/value store selected by the application config.
+
+    Receives:
+        config (dict): Flask config with CACHE_BACKEND, CACHE_REDIS_URL and CACHE_MAX_ENTRIES.
+        pinned (iterable): Keys the memory store must never evict. In Redis they are
+            stored without TTL, so a volatile-* maxmemory policy does not evict them either.
+
+    Returns:
+        MemoryStore | RedisStore -> The configured store.
+
+    Raises:
+        ValueError: If CACHE_BACKEND is unknown or redis is selected without a URL.
+    """
+
+    backend = config.get("CACHE_BACKEND", "memory")
+    if backend == "memory":
+        return MemoryStore(max_entries=config.get("CACHE_MAX_ENTRIES", 1024), pinned=pinned)
+    if backend == "redis":
+        url = config.get("CACHE_REDIS_URL")
+        if not url:
+            raise ValueError("CACHE_REDIS_URL is required when CACHE_BACKEND is 'redis'.")
+        return RedisStore(url)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import tempfile
+from functools import wraps
+
+from flask import Request, current_app, request
+
+from app.exceptions import PayloadTooLargeError
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadSpool:
+    """
+    Temporary file in the upload folder that receives one uploaded file while the
+    multipart body is parsed, computing its SHA-256 and size as the bytes arrive.
+
+    The write that goes over `max_size` removes the file and raises, so an oversized
+    upload is stopped there instead of being spooled whole first. store() moves the
+    file to its content-addressed name; otherwise close() deletes it.
+    """
+
+    def __init__(self, upload_folder, max_size, filename=None):
+        os.makedirs(upload_folder, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=upload_folder, prefix='.upload-')
+        self.file = os.fdopen(fd, 'w+b')
+        self.max_size = max_size
+        self.filename = filename
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_size:
+            self.close()
+            raise PayloadTooLargeError(f"File {self.filename} exceeds the maximum size of {self.max_size} bytes.")
+        self.digest.update(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        # read, seek, readline... (FileStorage y werkzeug los usan sobre el stream)
+        return getattr(self.file, name)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    def store(self, file_path):
+        """
+        Moves the file to `file_path`, unless a file with that name (the same content) already exists.
+        """
+
+        self.file.close()
+        if os.path.exists(file_path):
+            os.unlink(self.path)
+        else:
+            os.chmod(self.path, 0o644)
+            os.replace(self.path, file_path)
+        self.path = None
+
+    def close(self):
+        self.file.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+class UploadRequest(Request):
+    """Request class whose file parts go to an UploadSpool in the views marked with @streamed_uploads."""
+
+    upload_spool = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.upload_spool is None:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        upload_folder, max_size = self.upload_spool
+        if content_length is not None and content_length > max_size:
+            raise PayloadTooLargeError(f"File {filename} exceeds the maximum size of {max_size} bytes.")
+        return UploadSpool(upload_folder, max_size, filename)
+
+
+def streamed_uploads(view):
+    """
+    Makes the files of the request body go straight to UploadSpools in UPLOAD_FOLDER,
+    limited to UPLOAD_MAX_FILE_SIZE each while they are received. Apply it to views
+    that pass the files to store_upload(), before they touch request.files.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        request.upload_spool = (current_app.config['UPLOAD_FOLDER'], current_app.config['UPLOAD_MAX_FILE_SIZE'])
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def store_upload(file, upload_folder, max_size):
+    """
+    Stores an uploaded file under a content-addressed name (sha256 of its bytes).
+
+    In views with @streamed_uploads the file was already hashed, size-checked and
+    written to the upload folder while the body was parsed, so it is only renamed
+    into place (or dropped if an identical image is already stored). Any other
+    stream is copied to an UploadSpool first, also in a single pass.
+
+    Receives:
+        file (FileStorage): The uploaded file.
+        upload_folder (str): Destination directory.
+        max_size (int): Maximum size in bytes.
+
+    Returns:
+        tuple -> (stored filename '<sha256>.<ext>', size in bytes).
+
+    Raises:
+        PayloadTooLargeError: If the file is larger than `max_size`.
+    """
+
+    spool = file.stream
+    if not isinstance(spool, UploadSpool):
+        spool = UploadSpool(upload_folder, max_size, file.filename)
+        try:
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+
+    ext = os.path.splitext(file.filename)[1].lower()
+    filename = f'{spool.digest.hexdigest()}{ext}'
+    spool.store(os.path.join(upload_folder, filename))
+    return filename, spool.size
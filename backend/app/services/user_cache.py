@@ -0,0 +1,143 @@
+import json
+import time
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.database import db
+from app.services.store import MemoryStore, create_store
+
+VERSION_KEY = "users:version"
+# Marca de "no existe" en la caché local (MemoryStore devuelve None para las claves que no tiene)
+NOT_FOUND = False
+
+
+class CachedUser(NamedTuple):
+    """Read-only copy of a User row, safe to keep across requests and sessions."""
+    id: int
+    username: str
+    password: str
+
+    def serialize(self):
+        return {'id': self.id, 'username': self.username}
+
+
+class UserCache:
+    """
+    Identity cache of the auth paths: users by id and by username, plus the encoded user list.
+
+    Users and the list live in the shared store (CACHE_BACKEND) for USER_CACHE_TTL
+    seconds. Every key carries the user data version, kept in the same store: the write
+    paths call updated() after committing, which bumps it (every cached user and list
+    becomes unreachable at once) and writes the new row through. With redis that is seen
+    by every worker at once, so none can accept a replaced password hash. The memory
+    store is per worker, so USER_CACHE_TTL defaults to 0 (no user is cached) with it
+    outside development and tests.
+
+    Unknown ids and usernames are remembered in a per-process MemoryStore (LRU,
+    USER_CACHE_MAX_ENTRIES) for USER_CACHE_NEGATIVE_TTL seconds, so a flood of logins
+    with made-up usernames does not query the database once per attempt.
+    """
+
+    def __init__(self, app=None):
+        self.shared = None
+        self.local = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.shared = create_store(app.config)
+        self.local = MemoryStore(max_entries=app.config.get('USER_CACHE_MAX_ENTRIES', 10000))
+        self.ttl = app.config.get('USER_CACHE_TTL', 0)
+        self.negative_ttl = app.config.get('USER_CACHE_NEGATIVE_TTL', 10)
+        app.extensions['user_cache'] = self
+
+    def version(self):
+        version = self.shared.get(VERSION_KEY)
+        if version is None:
+            # Igual que en ProjectCache: una marca de tiempo evita reutilizar versiones tras reiniciar
+            self.shared.add(VERSION_KEY, int(time.time() * 1000))
+            version = self.shared.get(VERSION_KEY)
+        return int(version)
+
+    def _remember(self, version, user):
+        # JSON y no el objeto: el store compartido puede ser redis
+        value = json.dumps(list(user))
+        self.shared.set(f'users:{version}:id:{user.id}', value, ttl=self.ttl)
+        self.shared.set(f'users:{version}:username:{user.username}', value, ttl=self.ttl)
+
+    def _lookup(self, key, where):
+        from app.models import User
+
+        version = self.version()
+        key = f'users:{version}:{key}'
+        if self.local.get(key) is NOT_FOUND:
+            return None
+        if self.ttl:
+            cached = self.shared.get(key)
+            if cached is not None:
+                return CachedUser(*json.loads(cached))
+        row = db.session.execute(select(User.id, User.username, User.password).where(where)).first()
+        if row is None:
+            self.local.set(key, NOT_FOUND, ttl=self.negative_ttl)
+            return None
+        user = CachedUser(*row)
+        if self.ttl:
+            self._remember(version, user)
+        return user
+
+    def by_id(self, user_id):
+        """
+        Returns:
+            CachedUser | None -> The user with this id (int or the str identity of a JWT).
+        """
+
+        from app.models import User
+
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        return self._lookup(f'id:{user_id}', User.id == user_id)
+
+    def by_username(self, username):
+        """
+        Returns:
+            CachedUser | None -> The user with this username.
+        """
+
+        from app.models import User
+
+        return self._lookup(f'username:{username}', User.username == username)
+
+    def list_body(self):
+        """
+        Returns:
+            bytes -> The JSON list of every user ({'id', 'username'}), encoded once per data version.
+        """
+
+        from app.models import User
+
+        key = f'users:{self.version()}:list'
+        body = self.shared.get(key) if self.ttl else None
+        if body is None:
+            rows = db.session.execute(select(User.id, User.username).order_by(User.id))
+            body = current_app.json.dumps([{'id': id, 'username': username} for id, username in rows]).encode('utf-8')
+            if self.ttl:
+                self.shared.set(key, body, ttl=self.ttl)
+        return body
+
+    def updated(self, user=None):
+        """
+        Invalidates every cached user and list, then caches `user` as it is now.
+        Call it after committing the creation or edition of a user.
+
+        Receives:
+            user (User | CachedUser | None): The committed user.
+        """
+
+        self.version()
+        version = self.shared.incr(VERSION_KEY)
+        if user is not None and self.ttl:
+            self._remember(version, CachedUser(user.id, user.username, user.password))
@@ -0,0 +1,425 @@
+"""
+Benchmark harness for the Flask backend.
+
+Seeds a file-backed SQLite database (TestingConfig + TEST_DATABASE_URL), then drives
+the main endpoints through the in-process test client, a real gunicorn server with
+gevent workers and/or uvicorn serving the async read path (app/asgi.py), and prints p50/p95/p99 latency, throughput and peak RSS per
+scenario as JSON so runs can be compared.
+
+Usage (from backend/):
+    python benchmarks/run_benchmarks.py --mode both --projects 200 --users 20 --requests 200 --output bench.json
+    python benchmarks/run_benchmarks.py --mode gunicorn,asgi --output stacks.json
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ADMIN_USERNAME = 'bench-admin'
+ADMIN_PASSWORD = 'bench-password'
+TECHS = ['python', 'flask', 'react', 'postgres', 'docker', 'redis', 'vite', 'tailwind']
+
+
+def configure_environment(workdir):
+    """Points TestingConfig at a SQLite file and an upload folder inside `workdir`."""
+    os.environ['FLASK_ENV'] = 'testing'
+    os.environ['TEST_DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    os.environ['PROFILER_DIR'] = os.path.join(workdir, 'profiles')
+
+
+def make_image(seed, size=(640, 480)):
+    """A PNG that differs per seed, so uploads are not deduplicated; falls back to random bytes."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return b'\x89PNG\r\n\x1a\n' + os.urandom(32 * 1024)
+    rng = random.Random(seed)
+    image = Image.new('RGB', size, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def project_payload(i):
+    return {
+        'title': f'Benchmark project {i}',
+        'description': f'Seeded project number {i}. ' * 8,
+        'title_en': f'Benchmark project {i}',
+        'description_en': f'Seeded project number {i} (en). ' * 8,
+        'techs': random.sample(TECHS, 3),
+        'images': [f'/static/uploads/bench-{i}-{n}.png' for n in range(3)],
+        'repo_url': f'https://example.com/repo/{i}',
+        'live_url': f'https://example.com/live/{i}',
+    }
+
+
+def seed(app, projects, users):
+    """
+    Creates the schema, `users` admin users (one of them with a known password) and `projects`
+    projects with their stored documents and search index, as `flask boot` leaves a deployed database.
+    """
+    from app import db, hasher
+    from app.models import Project, User
+    from app.services import search
+    from app.services.project_documents import refresh_documents
+
+    with app.app_context():
+        db.create_all()
+        password_hash = hasher.generate(ADMIN_PASSWORD)
+        db.session.add(User(username=ADMIN_USERNAME, password=password_hash))
+        for i in range(users - 1):
+            db.session.add(User(username=f'bench-user-{i}', password=password_hash))
+        db.session.commit()
+
+        for i in range(projects):
+            payload = project_payload(i)
+            techs, images = payload.pop('techs'), payload.pop('images')
+            project = Project(**payload)
+            db.session.add(project)
+            db.session.flush()
+            project.replace_relations(techs=techs, images=images)
+        db.session.commit()
+        # Las lecturas sirven los documentos ya generados, no el serializado al vuelo de los que faltan
+        refresh_documents()
+        db.session.commit()
+        # Crea y llena el índice de búsqueda, que db.create_all() no conoce
+        search.ensure_search_index()
+        return [project_id for (project_id,) in db.session.query(Project.id)]
+
+
+def release(app):
+    """
+    Finishes the background work of the in-process app (derivative jobs, queued audit
+    events) and closes its connections, so nothing writes to the workdir after it is removed.
+    """
+    from app import audit, db, image_derivatives
+
+    image_derivatives.shutdown()
+    audit.flush()
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+    }
+
+
+def multipart(fields):
+    """Encodes [(field, filename, bytes)] as multipart/form-data for http.client."""
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    for field, filename, content in fields:
+        body.write(f'--{boundary}\r\n'.encode())
+        body.write(f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'.encode())
+        body.write(b'Content-Type: image/png\r\n\r\n')
+        body.write(content)
+        body.write(b'\r\n')
+    body.write(f'--{boundary}--\r\n'.encode())
+    return body.getvalue(), f'multipart/form-data; boundary={boundary}'
+
+
+class Scenario:
+    """One endpoint to drive: `build(i, state)` returns (method, path, json_body | (bytes, content_type))."""
+
+    def __init__(self, name, build, expected=(200, 201), after=None):
+        self.name = name
+        self.build = build
+        self.expected = expected
+        self.after = after
+
+
+def scenarios(project_ids, images):
+    created = []
+
+    def remember(response_json):
+        if response_json and 'project' in response_json:
+            created.append(response_json['project']['id'])
+
+    def pick(i):
+        return project_ids[i % len(project_ids)]
+
+    def update(i, state):
+        target = created[i % len(created)] if created else pick(i)
+        return 'PUT', f'/admin/projects/{target}', {'title': f'Updated {i}', 'techs': TECHS[:2]}
+
+    def delete(i, state):
+        # Cada iteración borra un proyecto distinto de los creados en 'create_project'
+        target = created.pop() if created else 0
+        return 'DELETE', f'/admin/projects/{target}', None
+
+    return [
+        Scenario('list_projects', lambda i, s: ('GET', '/admin/projects', None)),
+        Scenario('list_projects_page', lambda i, s: ('GET', '/admin/projects?limit=20', None)),
+        Scenario('get_project', lambda i, s: ('GET', f'/admin/projects/{pick(i)}', None)),
+        Scenario('search_projects', lambda i, s: ('GET', f'/public/search?q=project+{i % 50}', None)),
+        Scenario('login', lambda i, s: ('POST', '/admin/login', {'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD})),
+        Scenario('create_project', lambda i, s: ('POST', '/admin/projects', project_payload(10 ** 6 + i)), after=remember),
+        Scenario('update_project', update),
+        Scenario('delete_project', delete),
+        Scenario('upload', lambda i, s: ('POST', '/admin/upload', multipart([('file', f'u{i}.png', images[i % len(images)])]))),
+        Scenario('upload_multiple', lambda i, s: ('POST', '/admin/upload-multiple', multipart(
+            [('files', f'm{i}-{n}.png', images[(i + n) % len(images)]) for n in range(3)]))),
+    ]
+
+
+def read_only(all_scenarios):
+    return [scenario for scenario in all_scenarios if scenario.build(0, None)[0] == 'GET']
+
+
+def run_in_process(app, token, project_ids, images, requests, warmup):
+    """Sequential run through Flask's test client: measures the app without any server in front."""
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    all_scenarios = scenarios(project_ids, images)
+    # Calentamiento sin medir: cachés, índice de búsqueda y conexiones ya listos
+    for scenario in read_only(all_scenarios):
+        for i in range(warmup):
+            client.open(scenario.build(i, None)[1], headers=headers)
+
+    results = {}
+    for scenario in all_scenarios:
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for i in range(requests):
+            method, path, body = scenario.build(i, None)
+            kwargs = {'headers': headers}
+            if isinstance(body, tuple):
+                kwargs['data'], kwargs['content_type'] = body
+            elif body is not None:
+                kwargs['json'] = body
+            t0 = time.perf_counter()
+            response = client.open(path, method=method, **kwargs)
+            latencies.append(time.perf_counter() - t0)
+            if response.status_code not in scenario.expected:
+                errors += 1
+            elif scenario.after:
+                scenario.after(response.get_json(silent=True))
+        results[scenario.name] = summarize(latencies, errors, time.perf_counter() - started)
+    results['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'The server did not start listening on port {port}')
+
+
+def process_tree_hwm(pid):
+    """Peak RSS (VmHWM, kB) of a process and its children, from /proc; None where unavailable."""
+    def hwm(p):
+        try:
+            with open(f'/proc/{p}/status') as status:
+                for line in status:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1])
+        except OSError:
+            return None
+        return None
+
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as children:
+            child_pids = [int(child) for child in children.read().split()]
+    except OSError:
+        child_pids = []
+    workers = [value for value in (hwm(child) for child in child_pids) if value is not None]
+    return {'master_kb': hwm(pid), 'workers_kb': workers, 'total_kb': (hwm(pid) or 0) + sum(workers) or None}
+
+
+def server_command(server, port, workers):
+    if server == 'asgi':
+        return [sys.executable, '-m', 'uvicorn', 'app.asgi:app', '--host', '127.0.0.1', '--port', str(port),
+                '--workers', str(workers), '--log-level', 'warning']
+    # Misma configuración que en producción (preload_app, FAST_BOOT); los flags de la línea de comandos mandan
+    return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app.run:app', '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers), '--worker-class', 'gevent', '--log-level', 'warning']
+
+
+def run_server(server, token, project_ids, images, requests, concurrency, workers, warmup):
+    """Concurrent run against gunicorn+gevent or uvicorn (`server` = 'gunicorn' | 'asgi') over keep-alive connections."""
+    port = free_port()
+    command = server_command(server, port, workers)
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=os.environ.copy())
+    local = threading.local()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def send(scenario, i):
+        connection = getattr(local, 'connection', None)
+        if connection is None:
+            connection = local.connection = HTTPConnection('127.0.0.1', port, timeout=60)
+        method, path, body = scenario.build(i, None)
+        request_headers = dict(headers)
+        if isinstance(body, tuple):
+            payload, request_headers['Content-Type'] = body
+        elif body is not None:
+            payload, request_headers['Content-Type'] = json.dumps(body).encode(), 'application/json'
+        else:
+            payload = None
+        t0 = time.perf_counter()
+        try:
+            connection.request(method, path, body=payload, headers=request_headers)
+            response = connection.getresponse()
+            data = response.read()
+        except OSError:
+            local.connection = None
+            return time.perf_counter() - t0, False
+        elapsed = time.perf_counter() - t0
+        ok = response.status in scenario.expected
+        if ok and scenario.after:
+            scenario.after(json.loads(data or b'null'))
+        return elapsed, ok
+
+    try:
+        wait_for_server(port)
+        results = {}
+        all_scenarios = scenarios(project_ids, images)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # Calentamiento sin medir, repartido entre los workers
+            for scenario in read_only(all_scenarios):
+                list(pool.map(lambda i: send(scenario, i), range(warmup * workers)))
+            for scenario in all_scenarios:
+                started = time.perf_counter()
+                outcomes = list(pool.map(lambda i: send(scenario, i), range(requests)))
+                elapsed = time.perf_counter() - started
+                results[scenario.name] = summarize(
+                    [latency for latency, _ in outcomes], sum(1 for _, ok in outcomes if not ok), elapsed)
+        results['peak_rss_kb'] = process_tree_hwm(server.pid)
+        return results
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def compare(old_path, new_path):
+    """Prints the p95 and throughput change of every scenario between two result files."""
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old, new = json.load(old_file), json.load(new_file)
+    report = {}
+    for mode in ('in_process', 'gunicorn', 'asgi'):
+        for name, stats in new.get(mode, {}).items():
+            before = old.get(mode, {}).get(name)
+            if not isinstance(stats, dict) or not isinstance(before, dict) or 'p95_ms' not in stats:
+                continue
+            report[f'{mode}.{name}'] = {
+                'p95_ms': [before['p95_ms'], stats['p95_ms']],
+                'p95_change_pct': round((stats['p95_ms'] / before['p95_ms'] - 1) * 100, 1) if before['p95_ms'] else None,
+                'throughput_rps': [before['throughput_rps'], stats['throughput_rps']],
+            }
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', default='in-process',
+                        help="comma separated: in-process, gunicorn, asgi; 'both' = in-process,gunicorn")
+    parser.add_argument('--projects', type=int, default=100, help='projects to seed')
+    parser.add_argument('--users', type=int, default=10, help='admin users to seed')
+    parser.add_argument('--requests', type=int, default=100, help='requests per scenario')
+    parser.add_argument('--warmup', type=int, default=10, help='unmeasured requests per read-only scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads against a real server')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn / uvicorn workers')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two reports and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    random.seed(args.seed)
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    configure_environment(workdir)
+    sys.path.insert(0, BACKEND_DIR)
+    from app import create_app
+    from flask_jwt_extended import create_access_token
+
+    app = None
+    try:
+        app = create_app()
+        project_ids = seed(app, args.projects, args.users)
+        images = [make_image(n) for n in range(8)]
+        with app.app_context():
+            token = create_access_token(identity='1', additional_claims={'role': 'admin'})
+
+        report = {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'args': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+            },
+        }
+        modes = ['in-process', 'gunicorn'] if args.mode == 'both' else args.mode.split(',')
+        if 'in-process' in modes:
+            report['in_process'] = run_in_process(app, token, project_ids, images, args.requests, args.warmup)
+        for server in ('gunicorn', 'asgi'):
+            if server in modes:
+                report[server] = run_server(server, token, project_ids, images, args.requests,
+                                            args.concurrency, args.workers, args.warmup)
+    finally:
+        if app is not None:
+            release(app)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
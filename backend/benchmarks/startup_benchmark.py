@@ -0,0 +1,140 @@
+"""
+Startup timing report for the Flask backend.
+
+Measures, in fresh interpreters:
+  * import time per module (python -X importtime) of `app.run`, with and without
+    FAST_BOOT: the slowest modules by cumulative time and the self time per package;
+  * wall time of the boot phases: importing the app package, create_app() and run.py;
+  * the deploy step on a database already at head: `flask db upgrade`, `flask project-documents`
+    and `flask prerender` as separate processes against the single `flask boot`.
+
+Prints the report as JSON. Usage (from backend/):
+    python benchmarks/startup_benchmark.py --top 25 --repeat 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+import app.run
+done = time.perf_counter()
+print(json.dumps({'import_app_s': imported - started, 'create_app_s': created - imported,
+                  'run_module_s': done - created}))
+"""
+
+
+def environment(workdir, fast_boot, database='startup.db'):
+    env = os.environ.copy()
+    env.update({
+        'FLASK_ENV': 'testing',
+        'TEST_DATABASE_URL': 'sqlite:///' + os.path.join(workdir, database),
+        'UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+        'FAST_BOOT': '1' if fast_boot else '0',
+        'FLASK_APP': 'app/run.py',
+    })
+    return env
+
+
+def parse_importtime(stderr):
+    """
+    Returns:
+        list -> (module, self µs, cumulative µs) for every line of -X importtime output.
+    """
+
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def import_report(env, top):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app.run'],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    modules = parse_importtime(result.stderr)
+    packages = {}
+    for name, self_us, _ in modules:
+        package = name.split('.', 1)[0]
+        packages[package] = packages.get(package, 0) + self_us
+    slowest = sorted(modules, key=lambda module: module[2], reverse=True)[:top]
+    return {
+        'total_ms': round(sum(self_us for _, self_us, _ in modules) / 1000, 1),
+        'modules': len(modules),
+        'slowest_cumulative_ms': {name: round(cumulative / 1000, 1) for name, _, cumulative in slowest},
+        'packages_self_ms': {name: round(us / 1000, 1)
+                             for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]},
+    }
+
+
+def phases_report(env, repeat):
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', PHASES_SCRIPT], cwd=BACKEND_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {phase: round(statistics.median(run[phase] for run in runs) * 1000, 1) for phase in runs[0]}
+
+
+def command_ms(command, env, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, check=True)
+        times.append(time.perf_counter() - started)
+    return round(statistics.median(times) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=20, help='modules / packages listed per report')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per timing; the median is reported')
+    parser.add_argument('--output', help='also write the report to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='startup-bench-') as workdir:
+        os.makedirs(os.path.join(workdir, 'uploads'))
+        report = {'python': sys.version.split()[0]}
+        for label, fast_boot in (('default', False), ('fast_boot', True)):
+            env = environment(workdir, fast_boot)
+            report[label] = {'imports': import_report(env, args.top), 'phases_ms': phases_report(env, args.repeat)}
+
+        # Base de datos ya en la última revisión: el caso de cada redeploy sin migraciones nuevas.
+        # El archivo se crea vacío para que run.py no haga create_all() y lo cree Alembic
+        env = environment(workdir, False, database='deploy.db')
+        open(os.path.join(workdir, 'deploy.db'), 'w').close()
+        subprocess.run([sys.executable, '-m', 'flask', 'db', 'upgrade'], cwd=BACKEND_DIR, env=env,
+                       capture_output=True, check=True)
+        flask = [sys.executable, '-m', 'flask']
+        separate = {' '.join(command): command_ms(flask + command, env, args.repeat)
+                    for command in (['db', 'upgrade'], ['project-documents'], ['prerender'])}
+        report['deploy_ms'] = {
+            'separate_commands': separate,
+            'separate_commands_total': round(sum(separate.values()), 1),
+            'flask_boot': command_ms(flask + ['boot'], env, args.repeat),
+        }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Micro-benchmark of the payload validation layer (app/services/validation.py).
+
+Times PROJECT_SCHEMA / USER_SCHEMA on valid, invalid and partial payloads, the one-off
+cost of compiling a schema, and the hand-written checks create_project used before as a
+baseline. Prints microseconds per validation as JSON.
+
+Usage (from backend/):
+    python benchmarks/validation_benchmark.py --number 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.exceptions import ValidationError  # noqa: E402
+from app.services.validation import PROJECT_SCHEMA, USER_SCHEMA, Schema  # noqa: E402
+
+VALID_PROJECT = {
+    'title': 'Portfolio',
+    'description': 'Personal portfolio built with Flask and React. ' * 10,
+    'title_en': 'Portfolio',
+    'description_en': 'Personal portfolio built with Flask and React (en). ' * 10,
+    'techs': ['python', 'flask', 'react', 'postgres'],
+    'images': ['/static/uploads/a.png', '/static/uploads/b.png'],
+    'repo_url': 'https://example.com/repo',
+    'live_url': 'https://example.com/live',
+    'main_image_index': 1,
+}
+INVALID_PROJECT = {
+    'title': 'x' * 101,
+    'description': None,
+    'techs': ['t'] * 11,
+    'images': 'not-a-list',
+    'main_image_index': -1,
+}
+PARTIAL_PROJECT = {'title': 'Renamed', 'techs': ['go']}
+VALID_USER = {'email': 'someone@example.com', 'password': 'secret'}
+
+
+def legacy_project_checks(data):
+    """The checks create_project ran by hand, stopping at the first error."""
+    title = data.get('title')
+    description = data.get('description')
+    title_en = data.get('title_en')
+    description_en = data.get('description_en')
+    techs = data.get('techs')
+    images = data.get('images')
+    if not isinstance(techs, list) or len(techs) > 10:
+        return 'techs'
+    if images and (not isinstance(images, list) or len(images) > 10):
+        return 'images'
+    if len(title) > 100:
+        return 'title'
+    if len(description) > 2000:
+        return 'description'
+    if title_en and len(title_en) > 100:
+        return 'title_en'
+    if description_en and len(description_en) > 2000:
+        return 'description_en'
+    if not title or not description or not techs:
+        return 'required'
+    return None
+
+
+def expect_error(schema, payload):
+    try:
+        schema.validate(payload)
+    except ValidationError:
+        return
+    raise AssertionError('payload should not validate')
+
+
+def per_call_us(statement, number, repeat):
+    best = min(timeit.repeat(statement, number=number, repeat=repeat))
+    return round(best / number * 1e6, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=50000, help='validations per timing run')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs; the best one is reported')
+    args = parser.parse_args()
+
+    cases = {
+        'project_valid': lambda: PROJECT_SCHEMA.validate(VALID_PROJECT),
+        'project_invalid_all_errors': lambda: expect_error(PROJECT_SCHEMA, INVALID_PROJECT),
+        'project_partial_update': lambda: PROJECT_SCHEMA.validate(PARTIAL_PROJECT, partial=True),
+        'user_valid': lambda: USER_SCHEMA.validate(VALID_USER),
+        'legacy_project_checks_valid': lambda: legacy_project_checks(VALID_PROJECT),
+    }
+    report = {name: {'us_per_call': per_call_us(case, args.number, args.repeat)} for name, case in cases.items()}
+    # Compilar genera y compila código fuente: se paga una vez al importar, no por petición
+    report['compile_project_schema'] = {
+        'us_per_call': per_call_us(lambda: Schema(PROJECT_SCHEMA.fields), max(1, args.number // 1000), args.repeat)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
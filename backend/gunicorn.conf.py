@@ -0,0 +1,53 @@
+"""
+Gunicorn settings for production (Dockerfile):
+
+    gunicorn -c gunicorn.conf.py app.run:app   (from backend/)
+
+The app is imported once in the master (preload_app) and the workers are forked from
+it, so the imports, create_app() and the front manifest in run.py are paid once per
+deploy instead of once per worker, and the workers share those pages copy-on-write.
+"""
+
+import gc
+import os
+import time
+
+# FAST_BOOT: los workers no registran Flask-Migrate ni importan Alembic (ver config.py)
+os.environ.setdefault("FAST_BOOT", "1")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5100")
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+preload_app = True
+
+if worker_class == "gevent":
+    # Con preload_app la app se importa en el master: hay que parchear antes, como haría el worker de gevent,
+    # para que los locks y sockets creados al importar sean los de gevent
+    from gevent import monkey
+    monkey.patch_all()
+
+_started = time.perf_counter()
+
+
+def on_starting(server):
+    # /metrics suma todos los ficheros de METRICS_DIR: se borran los de los workers de un arranque anterior
+    from app.run import app
+
+    app.extensions['metrics'].clear()
+
+
+def when_ready(server):
+    server.log.info("App precargada en %.2f s", time.perf_counter() - _started)
+    # Todo lo creado al importar pasa a la generación permanente: el GC de los workers no lo recorre
+    # (ni escribe en sus cabeceras), así esas páginas siguen compartidas con el master
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Conexiones abiertas en el master (p. ej. el create_all de SQLite en run.py) no se comparten con los workers
+    from app.database import dispose_engines
+    from app.run import app
+
+    with app.app_context():
+        dispose_engines()
@@ -0,0 +1,26 @@
+"""project (created_at, id) index for keyset pagination
+
+Revision ID: 3f6b2d9e4a17
+Revises: 8c1f0a3b7d52
+Create Date: 2025-11-05 18:40:03.227519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6b2d9e4a17'
+down_revision = '8c1f0a3b7d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.create_index('ix_project_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_created_at_id')
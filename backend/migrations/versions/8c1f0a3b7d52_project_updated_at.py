@@ -0,0 +1,29 @@
+"""project updated_at
+
+Revision ID: 8c1f0a3b7d52
+Revises: df892ca192d7
+Create Date: 2025-11-03 10:12:41.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1f0a3b7d52'
+down_revision = 'df892ca192d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Los proyectos existentes se consideran modificados en su fecha de creación
+    op.execute('UPDATE project SET updated_at = created_at WHERE updated_at IS NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,31 @@
+"""project_document table
+
+Revision ID: 9a4d6e2c1b83
+Revises: 5d2c8e71f4a9
+Create Date: 2025-11-20 10:41:07.512904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d6e2c1b83'
+down_revision = '5d2c8e71f4a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Se rellena con 'flask project-documents'; mientras falte, las lecturas serializan el proyecto
+    op.create_table('project_document',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('base_url', sa.String(length=300), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+
+def downgrade():
+    op.drop_table('project_document')
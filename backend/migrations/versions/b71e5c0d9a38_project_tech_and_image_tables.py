@@ -0,0 +1,91 @@
+"""project_tech and project_image tables
+
+Revision ID: b71e5c0d9a38
+Revises: 3f6b2d9e4a17
+Create Date: 2025-11-08 12:05:37.904116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71e5c0d9a38'
+down_revision = '3f6b2d9e4a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    project_tech = op.create_table('project_tech',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('project_tech', schema=None) as batch_op:
+        batch_op.create_index('ix_project_tech_name_project_id', ['name', 'project_id'], unique=False)
+        batch_op.create_index('ix_project_tech_project_id_position', ['project_id', 'position'], unique=False)
+
+    project_image = op.create_table('project_image',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=300), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('project_image', schema=None) as batch_op:
+        batch_op.create_index('ix_project_image_project_id_position', ['project_id', 'position'], unique=False)
+
+    # Backfill desde las columnas separadas por comas, en inserts por lotes
+    connection = op.get_bind()
+    rows = connection.execute(sa.text('SELECT id, techs, images FROM project')).fetchall()
+    tech_rows = []
+    image_rows = []
+    for project_id, techs, images in rows:
+        names = [name for name in (techs or '').split(',') if name]
+        urls = [url for url in (images or '').split(',') if url]
+        tech_rows += [{'project_id': project_id, 'name': name, 'position': i} for i, name in enumerate(names)]
+        image_rows += [{'project_id': project_id, 'url': url, 'position': i} for i, url in enumerate(urls)]
+    if tech_rows:
+        op.bulk_insert(project_tech, tech_rows)
+    if image_rows:
+        op.bulk_insert(project_image, image_rows)
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('images')
+        batch_op.drop_column('techs')
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('techs', sa.VARCHAR(length=300), nullable=False, server_default=''))
+        batch_op.add_column(sa.Column('images', sa.VARCHAR(length=1000), nullable=True))
+
+    connection = op.get_bind()
+    techs = {}
+    for project_id, name in connection.execute(sa.text('SELECT project_id, name FROM project_tech ORDER BY project_id, position')):
+        techs.setdefault(project_id, []).append(name)
+    images = {}
+    for project_id, url in connection.execute(sa.text('SELECT project_id, url FROM project_image ORDER BY project_id, position')):
+        images.setdefault(project_id, []).append(url)
+    for project_id in set(techs) | set(images):
+        connection.execute(
+            sa.text('UPDATE project SET techs = :techs, images = :images WHERE id = :id'),
+            {'id': project_id, 'techs': ','.join(techs.get(project_id, [])), 'images': ','.join(images.get(project_id, [])) or None},
+        )
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.alter_column('techs', server_default=None)
+
+    with op.batch_alter_table('project_image', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_image_project_id_position')
+    op.drop_table('project_image')
+
+    with op.batch_alter_table('project_tech', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_tech_project_id_position')
+        batch_op.drop_index('ix_project_tech_name_project_id')
+    op.drop_table('project_tech')
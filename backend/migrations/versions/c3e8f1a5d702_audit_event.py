@@ -0,0 +1,62 @@
+"""audit_event table
+
+Revision ID: c3e8f1a5d702
+Revises: 9a4d6e2c1b83
+Create Date: 2025-11-24 18:12:40.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8f1a5d702'
+down_revision = '9a4d6e2c1b83'
+branch_labels = None
+depends_on = None
+
+# Solo inserción: cualquier UPDATE o DELETE sobre la tabla falla
+APPEND_ONLY = {
+    'sqlite': (
+        "CREATE TRIGGER audit_event_no_update BEFORE UPDATE ON audit_event "
+        "BEGIN SELECT RAISE(ABORT, 'audit_event is append-only'); END",
+        "CREATE TRIGGER audit_event_no_delete BEFORE DELETE ON audit_event "
+        "BEGIN SELECT RAISE(ABORT, 'audit_event is append-only'); END",
+    ),
+    'postgresql': (
+        "CREATE OR REPLACE FUNCTION audit_event_append_only() RETURNS trigger AS $$ "
+        "BEGIN RAISE EXCEPTION 'audit_event is append-only'; END; $$ LANGUAGE plpgsql",
+        "CREATE TRIGGER audit_event_append_only BEFORE UPDATE OR DELETE ON audit_event "
+        "FOR EACH ROW EXECUTE FUNCTION audit_event_append_only()",
+    ),
+}
+
+
+def upgrade():
+    op.create_table('audit_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('actor', sa.String(length=64), nullable=True),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('target', sa.String(length=300), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.Column('ip', sa.String(length=45), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('audit_event', schema=None) as batch_op:
+        batch_op.create_index('ix_audit_event_actor_created_at_id', ['actor', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_audit_event_created_at_id', ['created_at', 'id'], unique=False)
+
+    for statement in APPEND_ONLY.get(op.get_bind().dialect.name, ()):
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS audit_event_append_only ON audit_event")
+        op.execute("DROP FUNCTION IF EXISTS audit_event_append_only()")
+    with op.batch_alter_table('audit_event', schema=None) as batch_op:
+        batch_op.drop_index('ix_audit_event_created_at_id')
+        batch_op.drop_index('ix_audit_event_actor_created_at_id')
+
+    op.drop_table('audit_event')
@@ -0,0 +1,31 @@
+"""project_event table
+
+Revision ID: d5b7f9a2c418
+Revises: c3e8f1a5d702
+Create Date: 2025-11-27 10:41:03.552917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b7f9a2c418'
+down_revision = 'c3e8f1a5d702'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('project_event')
@@ -0,0 +1,56 @@
+"""project full-text search index
+
+Revision ID: e4a9c27f1b60
+Revises: b71e5c0d9a38
+Create Date: 2025-11-10 09:31:18.660472
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c27f1b60'
+down_revision = 'b71e5c0d9a38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # El índice depende del motor: tsvector + GIN en PostgreSQL, tabla FTS5 en SQLite
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            CREATE TABLE project_search (
+                project_id INTEGER PRIMARY KEY REFERENCES project (id) ON DELETE CASCADE,
+                document TSVECTOR NOT NULL
+            )
+        """)
+        op.execute("CREATE INDEX ix_project_search_document ON project_search USING GIN (document)")
+        op.execute("""
+            INSERT INTO project_search (project_id, document)
+            SELECT id,
+                setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('spanish', coalesce(description, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(title_en, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description_en, '')), 'B')
+            FROM project
+        """)
+    else:
+        op.execute("""
+            CREATE VIRTUAL TABLE project_fts USING fts5(
+                title, description, title_en, description_en,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+        op.execute("""
+            INSERT INTO project_fts (rowid, title, description, title_en, description_en)
+            SELECT id, title, description, coalesce(title_en, ''), coalesce(description_en, '')
+            FROM project
+        """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TABLE project_search")
+    else:
+        op.execute("DROP TABLE project_fts")
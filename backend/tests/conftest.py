@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import audit, create_app, db
+from app.config import TestingConfig
+
+
+@pytest.fixture
+def config():
+    # Valores de TestingConfig para un test: @pytest.mark.parametrize('config', [{'CLAVE': valor}])
+    return {}
+
+
+@pytest.fixture
+def app(config, monkeypatch):
+    # Cada test con su propia app: SQLite en memoria nuevo y extensiones reiniciadas
+    for key, value in config.items():
+        monkeypatch.setattr(TestingConfig, key, value)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    yield app
+    # Los eventos de auditoría pendientes van a esta base, no a la del test siguiente
+    audit.flush()
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers(client):
+    response = client.post('/admin/users', json={'username': 'admin', 'password': 'secret'})
+    assert response.status_code == 201, response.data
+    response = client.post('/admin/login', json={'username': 'admin', 'password': 'secret'})
+    return {'Authorization': f"Bearer {response.json['access_token']}"}
+
+
+@pytest.fixture
+def make_project(client, admin_headers):
+    def make_project(title='Portfolio', **fields):
+        payload = {'title': title, 'description': 'Proyecto de prueba', 'techs': ['python', 'react'],
+                   'images': ['/static/uploads/a.jpg'], 'repo_url': 'https://example.com/repo'}
+        payload.update(fields)
+        response = client.post('/admin/projects', json=payload, headers=admin_headers)
+        assert response.status_code == 201, response.data
+        return response.json['project']
+    return make_project
@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import DBAPIError
+
+from app import audit, db
+from app.models import AuditEvent
+
+
+@pytest.fixture
+def audited(app, make_project):
+    make_project()
+    audit.flush()
+    with app.app_context():
+        assert db.session.scalars(select(AuditEvent.action)).all() == ['user.create', 'project.create']
+
+
+def test_audit_events_cannot_be_updated(app, audited):
+    with app.app_context():
+        with pytest.raises(DBAPIError, match='append-only'):
+            db.session.execute(update(AuditEvent).values(action='project.delete'))
+        db.session.rollback()
+
+
+def test_audit_events_cannot_be_deleted(app, audited):
+    with app.app_context():
+        with pytest.raises(DBAPIError, match='append-only'):
+            db.session.execute(delete(AuditEvent))
+        db.session.rollback()
+        assert db.session.query(AuditEvent).count() == 2
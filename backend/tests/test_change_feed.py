@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from app import feed
+
+
+def open_stream(client, last_event_id=None):
+    headers = {'Last-Event-ID': str(last_event_id)} if last_event_id is not None else {}
+    response = client.get('/admin/projects/events', headers=headers, buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    return response
+
+
+def read_events(response, count):
+    # El primer mensaje es el "retry:" del stream; después, los eventos perdidos
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'retry: ')
+    events = []
+    for _ in range(count):
+        message = next(chunks).decode('utf-8')
+        fields = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+        events.append((int(fields['id']), fields['event']))
+    response.close()
+    return events
+
+
+def latest_id(app):
+    with app.app_context():
+        return feed.latest_id()
+
+
+def test_resume_replays_the_missed_events(app, client, make_project):
+    make_project('Uno')
+    first = latest_id(app)
+    make_project('Dos')
+    make_project('Tres')
+
+    events = read_events(open_stream(client, first), 2)
+    assert events == [(first + 1, 'project.created'), (first + 2, 'project.created')]
+
+
+@pytest.mark.parametrize('config', [{'FEED_REPLAY_SIZE': 2}])
+def test_resume_from_an_id_no_longer_kept_gets_a_reset(app, client, make_project):
+    make_project('Uno')
+    first = latest_id(app)
+    for title in ('Dos', 'Tres', 'Cuatro'):
+        make_project(title)
+    newest = latest_id(app)
+
+    # Solo quedan los dos últimos eventos: el cliente recarga la lista
+    assert read_events(open_stream(client, first), 1) == [(newest, 'projects.reset')]
+    assert read_events(open_stream(client, newest - 2), 2) == [(newest - 1, 'project.created'),
+                                                               (newest, 'project.created')]
+
+
+def test_subscribers_receive_new_writes(app, client, admin_headers, make_project):
+    project = make_project('Antes')
+    with app.app_context():
+        subscription, backlog = feed.subscribe()
+    assert backlog == []
+
+    client.put(f"/admin/projects/{project['id']}", json={'title': 'Después'}, headers=admin_headers)
+    event = subscription.queue.get_nowait()
+    assert event.kind == 'project.updated'
+    assert event.project_id == project['id']
+    data = json.loads(event.message.split('data: ', 1)[1])
+    assert data['project']['title'] == 'Después'
+    feed.unsubscribe(subscription)
+
+
+def test_invalid_last_event_id_is_rejected(client):
+    response = client.get('/admin/projects/events', headers={'Last-Event-ID': 'abc'})
+    assert response.status_code == 400
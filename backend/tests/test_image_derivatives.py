@@ -0,0 +1,33 @@
+from sqlalchemy import select
+
+from app import db, feed, image_derivatives
+from app.models import ProjectEvent
+
+
+def events(app):
+    with app.app_context():
+        return db.session.execute(select(ProjectEvent.kind, ProjectEvent.project_id).order_by(ProjectEvent.id)).all()
+
+
+def test_finished_image_refreshes_only_the_projects_that_use_it(app, make_project):
+    uses_it = make_project('Con la imagen', images=['/static/uploads/other.png', '/static/uploads/photo.png'])
+    make_project('Sin la imagen', images=['/static/uploads/other.png'])
+    with app.app_context():
+        version = feed.latest_id()
+
+    image_derivatives.on_complete('photo.png')
+
+    assert events(app)[-1] == ('project.updated', uses_it['id'])
+    with app.app_context():
+        assert feed.latest_id() == version + 1
+
+
+def test_image_no_project_uses_writes_nothing(app, make_project):
+    make_project(images=['/static/uploads/other.png'])
+    before = events(app)
+
+    image_derivatives.on_complete('unused.png')
+    # Los comodines de LIKE no cuentan: 'other_png' no es 'other.png'
+    image_derivatives.on_complete('other_png')
+
+    assert events(app) == before
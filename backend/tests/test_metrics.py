@@ -0,0 +1,49 @@
+import atexit
+import os
+
+from flask import Flask
+
+from app import metrics
+from app.services.metrics import Metrics
+
+
+def test_metrics_content_type_has_one_charset(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def test_metrics_need_a_token_outside_debug(app, client, monkeypatch):
+    app.testing = False
+    assert client.get('/metrics').status_code == 404
+
+    monkeypatch.setattr(metrics, 'token', 'scrape')
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer other'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape'}).status_code == 200
+
+
+def metrics_app(directory):
+    app = Flask(__name__)
+    app.config['METRICS_DIR'] = str(directory)
+    return app
+
+
+def test_exit_flush_is_registered_once(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, 'register', lambda *args, **kwargs: registered.append(args))
+    other = Metrics()
+    for _ in range(3):
+        other.init_app(metrics_app(tmp_path))
+    assert len(registered) == 1
+
+
+def test_clear_drops_the_samples_of_a_previous_run(tmp_path):
+    (tmp_path / '99999.json').write_text('{"uploaded_files_total": {"[]": 7}}')
+    (tmp_path / '.metrics-abc').write_text('{}')
+    other = Metrics(metrics_app(tmp_path))
+    assert other.collect()['uploaded_files_total'] == {'[]': 7}
+
+    other.clear()
+    assert 'uploaded_files_total' not in other.collect()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f'{os.getpid()}.json']
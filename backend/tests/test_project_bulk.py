@@ -0,0 +1,48 @@
+import json
+
+from app import db
+from app.models import Project
+
+
+def ndjson(*rows):
+    return ''.join((row if isinstance(row, str) else json.dumps(row)) + '\n' for row in rows)
+
+
+def import_body(client, headers, body):
+    return client.post('/admin/projects/bulk', data=body, content_type='application/x-ndjson', headers=headers)
+
+
+def test_partial_import_returns_207_with_the_failed_rows(app, client, admin_headers):
+    body = ndjson(
+        {'title': 'Válido', 'description': 'Se importa', 'techs': ['python']},
+        '{"title": "JSON roto"',
+        {'description': 'Sin título'},
+    )
+    response = import_body(client, admin_headers, body)
+
+    assert response.status_code == 207
+    assert response.json['created'] == 1
+    assert response.json['updated'] == 0
+    assert [error['row'] for error in response.json['errors']] == [2, 3]
+    # Las filas válidas se escriben aunque otras fallen
+    with app.app_context():
+        assert [project.title for project in db.session.query(Project)] == ['Válido']
+
+
+def test_full_import_returns_200(client, admin_headers):
+    body = ndjson({'title': 'Uno', 'description': 'A', 'techs': ['go']},
+                  {'title': 'Dos', 'description': 'B', 'techs': ['rust']})
+    response = import_body(client, admin_headers, body)
+
+    assert response.status_code == 200
+    assert response.json == {'created': 2, 'updated': 0, 'errors': []}
+
+
+def test_import_with_no_valid_row_writes_nothing(app, client, admin_headers):
+    response = import_body(client, admin_headers, ndjson('no es json', {'title': 'Sin descripción'}))
+
+    assert response.status_code == 207
+    assert response.json['created'] == 0
+    assert len(response.json['errors']) == 2
+    with app.app_context():
+        assert db.session.query(Project).count() == 0
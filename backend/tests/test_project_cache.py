@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app import db, feed, project_cache
+from app.models import Project, ProjectEvent
+from app.services.project_cache import LAST_MODIFIED_KEY, VERSION_KEY
+from app.services.project_documents import refresh_documents
+
+
+def titles(response):
+    return [project['title'] for project in response.json]
+
+
+def test_write_moves_the_version_to_the_new_event(app, client, admin_headers, make_project):
+    project = make_project('Antes')
+    first = client.get('/admin/projects')
+    with app.app_context():
+        assert first.headers['ETag'] == f'"projects-{feed.latest_id()}"'
+
+    response = client.put(f"/admin/projects/{project['id']}", json={'title': 'Después'}, headers=admin_headers)
+    assert response.status_code == 200
+    second = client.get('/admin/projects', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert titles(second) == ['Después']
+
+
+def test_write_from_another_worker_is_picked_up_by_the_poller(app, client, make_project):
+    project = make_project('Antes')
+    first = client.get('/admin/projects')
+
+    # Otro worker: escribe y registra el evento, pero el bump() ocurre en su proceso, no en este
+    with app.app_context():
+        db.session.execute(update(Project).where(Project.id == project['id']).values(title='Otro worker'))
+        refresh_documents([project['id']])
+        feed.updated([project['id']])
+        db.session.commit()
+
+    assert titles(client.get('/admin/projects')) == ['Antes']
+    with app.app_context():
+        feed.poll()
+    response = client.get('/admin/projects', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert titles(response) == ['Otro worker']
+    with app.app_context():
+        assert project_cache.version() == feed.latest_id()
+
+
+def test_every_kind_of_write_invalidates_the_list(client, admin_headers, make_project):
+    first = make_project('Primero')
+    etags = [client.get('/admin/projects').headers['ETag']]
+
+    make_project('Segundo')
+    listed = client.get('/admin/projects', headers={'If-None-Match': etags[-1]})
+    assert listed.status_code == 200
+    assert sorted(titles(listed)) == ['Primero', 'Segundo']
+    etags.append(listed.headers['ETag'])
+
+    assert client.delete(f"/admin/projects/{first['id']}", headers=admin_headers).status_code == 200
+    listed = client.get('/admin/projects', headers={'If-None-Match': etags[-1]})
+    assert listed.status_code == 200
+    assert titles(listed) == ['Segundo']
+    etags.append(listed.headers['ETag'])
+
+    body = '{"title": "Importado", "description": "Desde NDJSON", "techs": ["go"]}\n'
+    response = client.post('/admin/projects/bulk', data=body, content_type='application/x-ndjson',
+                           headers=admin_headers)
+    assert response.status_code == 200
+    listed = client.get('/admin/projects', headers={'If-None-Match': etags[-1]})
+    assert listed.status_code == 200
+    assert sorted(titles(listed)) == ['Importado', 'Segundo']
+    etags.append(listed.headers['ETag'])
+
+    assert len(set(etags)) == len(etags)
+    assert client.get('/admin/projects', headers={'If-None-Match': etags[-1]}).status_code == 304
+
+
+def test_version_keys_are_never_evicted(app, make_project):
+    make_project()
+    with app.app_context():
+        version = project_cache.version()
+        project_cache.last_modified(lambda: None)
+        for i in range(app.config['CACHE_MAX_ENTRIES'] + 10):
+            project_cache.get_or_build(f'detail:{i}', lambda: b'{}')
+        assert project_cache.store.get(VERSION_KEY) == version
+        assert project_cache.store.get(LAST_MODIFIED_KEY) is not None
+
+
+def test_searches_are_not_cached(app, client, make_project):
+    make_project()
+    with app.app_context():
+        before = len(project_cache.store._data)
+    for i in range(20):
+        assert client.get('/public/search', query_string={'q': f'zz{i}'}).status_code == 200
+    with app.app_context():
+        assert len(project_cache.store._data) == before
+
+
+def test_last_modified_fallback_moves_on_delete(app, client, admin_headers, make_project):
+    make_project('Queda')
+    gone = make_project('Borrado')
+
+    # Last-Modified tiene precisión de segundos: las escrituras anteriores se llevan al pasado
+    with app.app_context():
+        db.session.execute(update(ProjectEvent).values(created_at=datetime(2020, 1, 1)))
+        db.session.execute(update(Project).values(updated_at=datetime(2020, 1, 1)))
+        db.session.commit()
+        project_cache.store.delete(LAST_MODIFIED_KEY)
+    first = client.get('/admin/projects')
+    assert first.headers['Last-Modified'] == 'Wed, 01 Jan 2020 00:00:00 GMT'
+
+    assert client.delete(f"/admin/projects/{gone['id']}", headers=admin_headers).status_code == 200
+    with app.app_context():
+        # Store vacío (reinicio, Redis vaciado): el valor sale de la base
+        project_cache.store.delete(LAST_MODIFIED_KEY)
+
+    response = client.get('/admin/projects', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 200
+    assert titles(response) == ['Queda']
+
+
+def test_star_if_none_match_does_not_hide_a_missing_project(client, make_project):
+    project = make_project()
+    assert client.get('/admin/projects/999', headers={'If-None-Match': '*'}).status_code == 404
+    assert client.get(f"/admin/projects/{project['id']}", headers={'If-None-Match': '*'}).status_code == 200
+
+
+def test_stored_state_never_reseeds(app, monkeypatch):
+    with app.app_context():
+        project_cache.store.delete(VERSION_KEY)
+        project_cache.store.delete(LAST_MODIFIED_KEY)
+        monkeypatch.setattr(project_cache, 'version_source', lambda: pytest.fail('stored_state() queried the database'))
+        assert project_cache.stored_state() == (None, None)
+
+        # La primera versión sembrada gana: otro worker que siembre después recibe la misma
+        assert project_cache.seed_version(7) == 7
+        assert project_cache.seed_version(9) == 7
+        assert project_cache.stored_state()[0] == 7
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+
+
+@pytest.fixture
+def statements(app):
+    # Sentencias SQL ejecutadas, igual que las cuenta Metrics para METRICS_QUERY_WARNING
+    executed = []
+    with app.app_context():
+        engine = db.engine
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', count)
+
+
+def search_titles(client, q):
+    return [project['title'] for project in client.get('/public/search', query_string={'q': q}).json]
+
+
+def test_create_and_update_stay_under_the_query_warning(app, client, admin_headers, make_project, statements):
+    make_project('Calentamiento')
+    statements.clear()
+    project = make_project('Nuevo', techs=['python', 'flask', 'react'], images=['/static/uploads/a.jpg', '/static/uploads/b.jpg'])
+    assert len(statements) < app.config['METRICS_QUERY_WARNING']
+
+    statements.clear()
+    response = client.put(f"/admin/projects/{project['id']}",
+                          json={'title': 'Editado', 'techs': ['go'], 'images': ['/static/uploads/c.jpg']},
+                          headers=admin_headers)
+    assert response.status_code == 200
+    assert len(statements) < app.config['METRICS_QUERY_WARNING']
+    assert response.json['project']['techs'] == ['go']
+    assert response.json['project']['images'][0].endswith('/static/uploads/c.jpg')
+
+
+def test_update_replaces_the_index_entry_and_document(client, admin_headers, make_project):
+    project = make_project('Antiguo')
+    assert search_titles(client, 'antiguo') == ['Antiguo']
+
+    response = client.put(f"/admin/projects/{project['id']}", json={'title': 'Reciente', 'techs': ['go']},
+                          headers=admin_headers)
+    assert response.status_code == 200
+    assert search_titles(client, 'antiguo') == []
+    assert search_titles(client, 'reciente') == ['Reciente']
+    listed = client.get('/admin/projects').json
+    assert [(p['title'], p['techs']) for p in listed] == [('Reciente', ['go'])]
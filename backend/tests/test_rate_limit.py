@@ -0,0 +1,43 @@
+import pytest
+
+from app import limiter
+
+
+@pytest.fixture
+def limited(app, monkeypatch):
+    monkeypatch.setattr(limiter, 'enabled', True)
+    monkeypatch.setattr(limiter, 'limits', {'admin': {'ip': (3, 60), 'username': (2, 60)},
+                                            'user': {'ip': (3, 60), 'username': (2, 60)}})
+    return limiter
+
+
+@pytest.mark.parametrize('body', [['admin', 'secret'], 'admin', 42])
+def test_admin_login_with_non_object_body_is_a_bad_request(client, limited, body):
+    response = client.post('/admin/login', json=body)
+    assert response.status_code == 400
+
+
+def test_user_login_with_non_object_body_reaches_the_view(client, limited):
+    response = client.post('/user/login', json=['user@example.com', 'secret'])
+    assert response.status_code != 429
+    assert 'error' in response.json
+
+
+def test_non_object_bodies_count_against_the_ip_limit(client, limited):
+    statuses = [client.post('/admin/login', json=[]).status_code for _ in range(4)]
+    assert statuses == [400, 400, 400, 429]
+
+
+def test_username_limit(client, limited):
+    for _ in range(2):
+        client.post('/admin/login', json={'username': 'Admin', 'password': 'wrong'})
+    response = client.post('/admin/login', json={'username': 'admin ', 'password': 'wrong'})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_client_ip_behind_one_proxy(app, monkeypatch):
+    monkeypatch.setattr(limiter, 'proxy_count', 1)
+    with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.0.0.1'},
+                                  headers={'X-Forwarded-For': '203.0.113.7'}):
+        assert limiter.client_ip() == '203.0.113.7'
@@ -0,0 +1,33 @@
+from flask_jwt_extended import decode_token
+
+from app.blacklist import TokenBlocklist
+
+
+def test_logged_out_token_is_rejected(client, admin_headers):
+    assert client.get('/user/users', headers=admin_headers).status_code == 200
+
+    assert client.post('/user/logout', headers=admin_headers).status_code == 200
+    assert client.get('/user/users', headers=admin_headers).status_code == 401
+
+
+def test_new_login_after_logout_is_accepted(client, admin_headers):
+    assert client.post('/user/logout', headers=admin_headers).status_code == 200
+
+    response = client.post('/admin/login', json={'username': 'admin', 'password': 'secret'})
+    headers = {'Authorization': f"Bearer {response.json['access_token']}"}
+    assert client.get('/user/users', headers=headers).status_code == 200
+
+
+def test_revocation_is_seen_by_another_worker(app, client, admin_headers):
+    # Otro worker: su propio filtro Bloom, que solo conoce la revocación a través de la tabla revoked_token
+    other = TokenBlocklist()
+    other.init_app(app)
+    with app.app_context():
+        jti = decode_token(admin_headers['Authorization'].removeprefix('Bearer '))['jti']
+        assert other.is_revoked(jti) is False
+
+    assert client.post('/user/logout', headers=admin_headers).status_code == 200
+    with app.app_context():
+        # Pasado JWT_BLOCKLIST_SYNC_SECONDS
+        other._next_sync = 0
+        assert other.is_revoked(jti) is True
@@ -0,0 +1,41 @@
+from app.services.search import fts5_query
+
+
+def search_titles(client, q):
+    response = client.get('/public/search', query_string={'q': q})
+    assert response.status_code == 200, response.json
+    return [project['title'] for project in response.json]
+
+
+def test_fts5_query_quotes_every_word():
+    # Operadores, columnas y comillas del usuario quedan como palabras buscadas, no como sintaxis FTS5
+    assert fts5_query('react OR title:"vue') == '"react"* "OR"* "title"* "vue"*'
+    assert fts5_query('NEAR(a b) -c') == '"NEAR"* "a"* "b"* "c"*'
+    assert fts5_query('*"()') == ''
+
+
+def test_fts5_syntax_in_the_query_is_not_an_error(client, make_project):
+    make_project('Tienda online', description='Carrito con React')
+    assert search_titles(client, 'react OR title:"tienda') == []
+    assert search_titles(client, 'carrito AND react') == []
+    assert search_titles(client, '"()*') == []
+
+
+def test_search_matches_prefixes_and_ignores_accents(client, make_project):
+    make_project('Diseño web', description='Portfolio responsive')
+    make_project('Backend', description='API en Flask')
+
+    assert search_titles(client, 'diseno') == ['Diseño web']
+    assert search_titles(client, 'respons') == ['Diseño web']
+    assert search_titles(client, 'flask api') == ['Backend']
+
+
+def test_title_matches_rank_first(client, make_project):
+    make_project('Notas', description='Aplicación hecha con Flask')
+    make_project('Flask blog', description='Blog personal')
+
+    assert search_titles(client, 'flask') == ['Flask blog', 'Notas']
+
+
+def test_empty_query_is_rejected(client):
+    assert client.get('/public/search', query_string={'q': ' '}).status_code == 400
@@ -0,0 +1,60 @@
+import hashlib
+
+import pytest
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def uploads(app, tmp_path, monkeypatch):
+    # El StaticFiles de /static/uploads, apuntando a un directorio del test
+    uploads = app.extensions['uploads']
+    monkeypatch.setattr(uploads, 'directory', str(tmp_path))
+    uploads.scan()
+    return tmp_path
+
+
+def store(folder, content=CONTENT, ext='.bin'):
+    name = hashlib.sha256(content).hexdigest() + ext
+    (folder / name).write_bytes(content)
+    return name
+
+
+def test_range_request_gets_206(client, uploads):
+    name = store(uploads)
+    response = client.get(f'/static/uploads/{name}', headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == f'bytes 10-19/{len(CONTENT)}'
+    assert response.data == CONTENT[10:20]
+
+
+def test_unsatisfiable_range_gets_416(client, uploads):
+    name = store(uploads)
+    response = client.get(f'/static/uploads/{name}', headers={'Range': f'bytes={len(CONTENT) + 10}-'})
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+
+def test_content_addressed_uploads_are_immutable(client, uploads):
+    name = store(uploads)
+    response = client.get(f'/static/uploads/{name}')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert response.headers['ETag'] == f'"{name}"'
+    assert client.get(f'/static/uploads/{name}', headers={'If-None-Match': f'"{name}"'}).status_code == 304
+
+
+def test_other_files_revalidate(client, uploads):
+    (uploads / 'logo.bin').write_bytes(CONTENT)
+    response = client.get('/static/uploads/logo.bin')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+
+def test_hidden_temporary_files_are_not_served(client, uploads):
+    # Escritos después del scan, como una subida o unas métricas a medio escribir
+    (uploads / '.upload-1234').write_bytes(CONTENT)
+    (uploads / '.metrics').mkdir()
+    (uploads / '.metrics' / '1.json').write_bytes(b'{}')
+    assert client.get('/static/uploads/.upload-1234').status_code == 404
+    assert client.get('/static/uploads/.metrics/1.json').status_code == 404
@@ -0,0 +1,45 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from app import image_derivatives
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    app.config['UPLOAD_MAX_FILE_SIZE'] = 1024
+    monkeypatch.setattr(image_derivatives, 'enabled', False)
+    return tmp_path
+
+
+def upload(client, headers, content, name='photo.png'):
+    return client.post('/admin/upload', data={'file': (io.BytesIO(content), name)},
+                       headers=headers, content_type='multipart/form-data')
+
+
+def test_upload_is_stored_under_its_hash(client, admin_headers, upload_folder):
+    content = b'\x89PNG' + b'x' * 500
+    response = upload(client, admin_headers, content)
+    assert response.status_code == 201, response.json
+    name = hashlib.sha256(content).hexdigest() + '.png'
+    assert response.json['file_url'].endswith('/static/uploads/' + name)
+    assert sorted(os.listdir(upload_folder)) == [name]
+
+    # El mismo contenido reutiliza el archivo
+    assert upload(client, admin_headers, content, 'copy.png').status_code == 201
+    assert sorted(os.listdir(upload_folder)) == [name]
+
+
+def test_oversized_upload_is_rejected_while_streaming(client, admin_headers, upload_folder):
+    response = upload(client, admin_headers, b'x' * 4096)
+    assert response.status_code == 413
+    assert os.listdir(upload_folder) == []
+
+
+def test_rejected_extension_leaves_no_temporary_file(client, admin_headers, upload_folder):
+    response = upload(client, admin_headers, b'x' * 100, 'script.exe')
+    assert response.status_code == 400
+    assert os.listdir(upload_folder) == []
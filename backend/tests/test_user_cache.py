@@ -0,0 +1,96 @@
+import re
+
+from sqlalchemy import event, update
+
+from app import db, hasher, user_cache
+from app.config import ProductionConfig
+from app.models import User
+from app.services.user_cache import UserCache
+
+
+def login(client, password):
+    return client.post('/admin/login', json={'username': 'admin', 'password': password})
+
+
+def user_selects(app):
+    # SELECTs sobre la tabla user ejecutados desde que se llama
+    selects = []
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('SELECT') and re.search(r'FROM "?user\b', statement):
+            selects.append(statement)
+    return selects
+
+
+def test_logins_are_served_from_the_cache(app, client, admin_headers):
+    selects = user_selects(app)
+    assert 'access_token' in login(client, 'secret').json
+    assert 'access_token' in login(client, 'secret').json
+    assert selects == []
+
+
+def test_password_edit_is_written_through(client, admin_headers):
+    assert client.put('/user/edit', json={'password': 'nueva'}, headers=admin_headers).status_code == 200
+
+    assert 'access_token' not in login(client, 'secret').json
+    assert 'access_token' in login(client, 'nueva').json
+
+
+def test_password_edit_from_another_worker_is_seen_through_the_shared_store(app, client, admin_headers):
+    assert 'access_token' in login(client, 'secret').json
+
+    # Otro worker con el mismo store compartido (redis): cambia la contraseña y llama a updated()
+    other = UserCache()
+    other.init_app(app)
+    other.shared = user_cache.shared
+    with app.app_context():
+        user = other.by_username('admin')._replace(password=hasher.generate('nueva'))
+        db.session.execute(update(User).where(User.id == user.id).values(password=user.password))
+        db.session.commit()
+        other.updated(user)
+
+    assert 'access_token' not in login(client, 'secret').json
+    assert 'access_token' in login(client, 'nueva').json
+
+
+def test_without_ttl_existing_users_are_always_read(app, client, admin_headers, monkeypatch):
+    # USER_CACHE_TTL = 0, el valor por defecto con el store en memoria de cada worker
+    monkeypatch.setattr(user_cache, 'ttl', 0)
+    assert 'access_token' in login(client, 'secret').json
+
+    # Otro worker sin store compartido cambia la contraseña: este proceso no recibe ningún aviso
+    with app.app_context():
+        db.session.execute(update(User).where(User.username == 'admin').values(password=hasher.generate('nueva')))
+        db.session.commit()
+
+    assert 'access_token' not in login(client, 'secret').json
+    assert 'access_token' in login(client, 'nueva').json
+
+
+def test_memory_backend_caches_no_user_by_default():
+    if ProductionConfig.CACHE_BACKEND == 'memory':
+        assert ProductionConfig.USER_CACHE_TTL == 0
+
+
+def test_unknown_username_is_cached_until_a_user_is_created(app, client):
+    assert 'access_token' not in login(client, 'secret').json
+    with app.app_context():
+        key = f'users:{user_cache.version()}:username:admin'
+        assert user_cache.local.get(key) is False
+
+    assert client.post('/admin/users', json={'username': 'admin', 'password': 'secret'}).status_code == 201
+    assert 'access_token' in login(client, 'secret').json
+
+
+def test_user_list_follows_new_users(app, client, admin_headers):
+    assert [user['username'] for user in client.get('/admin/users', headers=admin_headers).json] == ['admin']
+    selects = user_selects(app)
+    assert [user['username'] for user in client.get('/admin/users', headers=admin_headers).json] == ['admin']
+    assert selects == []
+
+    client.post('/admin/users', json={'username': 'editor', 'password': 'secret'})
+    users = client.get('/admin/users', headers=admin_headers).json
+    assert [user['username'] for user in users] == ['admin', 'editor']
@@ -0,0 +1,51 @@
+import pytest
+
+from app.exceptions import ValidationError
+from app.services.validation import PROJECT_SCHEMA, USER_EDIT_SCHEMA
+
+
+def errors(schema, data, **kwargs):
+    with pytest.raises(ValidationError) as info:
+        schema.validate(data, **kwargs)
+    return info.value.errors
+
+
+def test_every_missing_field_is_reported_at_once():
+    assert set(errors(PROJECT_SCHEMA, {})) == {'title', 'description', 'techs'}
+
+
+def test_defaults_are_added_only_to_full_payloads():
+    payload = {'title': 'Portfolio', 'description': 'Web', 'techs': ['python']}
+    assert PROJECT_SCHEMA.validate(payload)['main_image_index'] == 0
+    assert PROJECT_SCHEMA.validate({'title': 'Editado'}, partial=True) == {'title': 'Editado'}
+
+
+def test_limits_use_the_field_messages():
+    payload = {'title': 'x' * 101, 'description': 'Web', 'techs': ['python'] * 11}
+    assert errors(PROJECT_SCHEMA, payload) == {'title': 'El título no puede superar 100 caracteres.',
+                                               'techs': 'Máximo 10 tecnologías permitidas.'}
+
+
+def test_non_objects_are_rejected():
+    assert errors(PROJECT_SCHEMA, ['title']) == {'_schema': 'Request body must be a JSON object.'}
+
+
+def test_strict_schema_rejects_unknown_fields():
+    assert errors(USER_EDIT_SCHEMA, {'password': 'nueva', 'email': 'a@b.c'}) == {
+        'email': 'You cannot edit the field email'}
+
+
+def test_routes_answer_400_with_the_errors(client, admin_headers):
+    response = client.post('/admin/projects', json={'title': 'Portfolio'}, headers=admin_headers)
+    assert response.status_code == 400
+    assert set(response.json['errors']) == {'description', 'techs'}
+
+
+def test_non_json_bodies_are_rejected(client, admin_headers, make_project):
+    project = make_project()
+    for method, url in (('post', '/admin/projects'), ('put', f"/admin/projects/{project['id']}")):
+        response = getattr(client, method)(url, data='title=Portfolio', headers=admin_headers,
+                                           content_type='application/x-www-form-urlencoded')
+        assert response.status_code == 400
+        response = getattr(client, method)(url, data='{', headers=admin_headers, content_type='application/json')
+        assert response.status_code == 400
@@ -1,6 +1,11 @@
+import { takePreloaded } from './preloadedState.js';
+
 const backendUrl = import.meta.env.VITE_BACKEND_URL;
 
-const getState = ({ getStore, setStore }) => {
+// Conexión al feed de cambios de proyectos (una por pestaña)
+let projectEvents = null;
+
+const getState = ({ getStore, getActions, setStore }) => {
 	return {
 		store: {
 			adminToken: localStorage.getItem('adminToken') || null,
@@ -102,6 +107,12 @@ const getState = ({ getStore, setStore }) => {
             },
             getProjects: async () => {
                     const store = getStore();
+                    // En la primera carga el snapshot ya trae los proyectos: no hace falta pedirlos
+                    const preloadedProjects = takePreloaded('projects');
+                    if (preloadedProjects) {
+                        setStore({ ...store, projects: preloadedProjects });
+                        return { ok: true, data: preloadedProjects };
+                    }
                     try {
                         const resp = await fetch(`${backendUrl}/admin/projects`, {
                             method: "GET",
@@ -124,10 +135,48 @@ const getState = ({ getStore, setStore }) => {
                         return { ok: false, error: error.message };
                     }
            },
+           subscribeProjects: () => {
+                if (projectEvents || typeof EventSource === 'undefined') {
+                    return;
+                }
+                // Al reconectar, EventSource manda Last-Event-ID y el backend repite los cambios perdidos
+                projectEvents = new EventSource(`${backendUrl}/admin/projects/events`);
+
+                const upsertProject = (event) => {
+                    const { project } = JSON.parse(event.data);
+                    const store = getStore();
+                    const exists = store.projects.some(p => p.id === project.id);
+                    const projects = exists
+                        ? store.projects.map(p => p.id === project.id ? project : p)
+                        : [...store.projects, project];
+                    setStore({ ...store, projects });
+                };
+                projectEvents.addEventListener('project.created', upsertProject);
+                projectEvents.addEventListener('project.updated', upsertProject);
+                projectEvents.addEventListener('project.deleted', (event) => {
+                    const { id } = JSON.parse(event.data);
+                    const store = getStore();
+                    setStore({ ...store, projects: store.projects.filter(p => p.id !== id) });
+                });
+                // Cambio demasiado grande para deltas (importación en bloque) o reconexión tras demasiados cambios
+                projectEvents.addEventListener('projects.reset', () => {
+                    getActions().getProjects();
+                });
+           },
+           unsubscribeProjects: () => {
+                if (projectEvents) {
+                    projectEvents.close();
+                    projectEvents = null;
+                }
+           },
            getProjectById: async (projectId) => {
                 if (!projectId) {
                     return { ok: false, error: 'ID del proyecto requerido' };
                 }
+                const preloadedProject = takePreloaded('project');
+                if (preloadedProject && preloadedProject.id === projectId) {
+                    return { ok: true, data: preloadedProject };
+                }
                 try {
                     const resp = await fetch(`${backendUrl}/admin/projects/${projectId}`, {
                         method: "GET",
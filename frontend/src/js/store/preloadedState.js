@@ -0,0 +1,20 @@
+// Datos que el backend incrusta en los snapshots prerenderizados (backend/app/services/prerender.py)
+let preloaded = null;
+const element = document.getElementById('preloaded-state');
+if (element) {
+    try {
+        preloaded = JSON.parse(element.textContent);
+    } catch (error) {
+        console.error("Invalid preloaded state:", error);
+    }
+}
+
+// Devuelve el dato una sola vez: las llamadas siguientes vuelven a pedirlo al backend
+export const takePreloaded = (key) => {
+    if (!preloaded || preloaded[key] === undefined) {
+        return undefined;
+    }
+    const value = preloaded[key];
+    delete preloaded[key];
+    return value;
+};
@@ -1,10 +1,19 @@
 import { StrictMode } from 'react'
-import { createRoot } from 'react-dom/client'
+import { createRoot, hydrateRoot } from 'react-dom/client'
 import './index.css'
 import Layout from './Layout.jsx'
 import './i18n'; 
-createRoot(document.getElementById('root')).render(
+
+const container = document.getElementById('root')
+const app = (
   <StrictMode>
     <Layout />
-  </StrictMode>,
+  </StrictMode>
 )
+
+// Si el HTML es un snapshot prerenderizado (los datos vienen en #preloaded-state), React hidrata ese marcado en lugar de reemplazarlo
+if (document.getElementById('preloaded-state')) {
+  hydrateRoot(container, app)
+} else {
+  createRoot(container).render(app)
+}
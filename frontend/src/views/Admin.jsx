@@ -22,6 +22,7 @@ import ProjectForm from './ProjectForm';
     if (store.adminToken) {
       const loadProjects = async () => {
         setLoading(true);
+        actions.subscribeProjects();
         try {
           const result = await actions.getProjects();
           if (!result.ok) {
@@ -33,24 +34,11 @@ import ProjectForm from './ProjectForm';
         setLoading(false);
       };
       loadProjects();
+      return () => actions.unsubscribeProjects();
     }
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [store.adminToken]); // Solo queremos que se ejecute cuando cambie el token
 
-  // Función para recargar proyectos después de operaciones
-  const refreshProjects = async () => {
-    setLoading(true);
-    try {
-      const result = await actions.getProjects();
-      if (!result.ok) {
-        console.error('Error loading projects:', result.error);
-      }
-    } catch (error) {
-      console.error('Error loading projects:', error);
-    }
-    setLoading(false);
-  };
-
   const handleDelete = async (projectId) => {
     if (window.confirm('¿Estás seguro de eliminar este proyecto?')) {
       const result = await actions.deleteProject(projectId);
@@ -173,7 +161,6 @@ import ProjectForm from './ProjectForm';
                 setShowForm(false);
                 setEditingProject(null);
               }}
-              onSave={refreshProjects}
             />
           )}
 
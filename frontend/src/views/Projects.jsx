@@ -1,11 +1,10 @@
-import React, { useEffect, useState, useContext } from 'react';
+import React, { useEffect, useState, useContext, useMemo } from 'react';
 import { useTranslation } from 'react-i18next';
 import { Context } from '../js/store/appContext';
 
 const Projects = () => {
   const { t, i18n } = useTranslation();
-  const { actions } = useContext(Context);
-  const [projects, setProjects] = useState([]);
+  const { store, actions } = useContext(Context);
   const [loading, setLoading] = useState(true);
   const [currentPage, setCurrentPage] = useState(1);
   const projectsPerPage = 6;
@@ -24,16 +23,22 @@ const Projects = () => {
     };
   };
 
+  // La lista vive en el store: el feed de cambios la mantiene al día sin volver a pedirla
+  const projects = useMemo(
+    () => [...store.projects].sort((a, b) => new Date(b.created_at) - new Date(a.created_at)),
+    [store.projects]
+  );
+
   useEffect(() => {
     let isMounted = true;
     
     const fetchProjects = async () => {
       setLoading(true);
+      // Primero el feed, para no perder los cambios que lleguen mientras se carga la lista
+      actions.subscribeProjects();
       const result = await actions.getProjects();
       
       if (isMounted && result.ok) {
-        const sorted = result.data.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-        setProjects(sorted);
         setCurrentPage(1); 
       }
       
@@ -46,6 +51,7 @@ const Projects = () => {
     
     return () => {
       isMounted = false;
+      actions.unsubscribeProjects();
     };
   
   }, []);